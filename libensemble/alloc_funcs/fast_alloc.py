@@ -1,3 +1,5 @@
+import numpy as np
+
 from libensemble.tools.alloc_support import AllocSupport, InsufficientFreeResources
 
 
@@ -14,6 +16,16 @@ def give_sim_work_first(W, H, sim_specs, gen_specs, alloc_specs, persis_info, li
     is likely to be faster if there will be many short simulation evaluations,
     given that this function contains fewer column length operations.
 
+    If ``alloc_specs["user"]["adaptive_sim_batches"]`` is set to True, then several
+    consecutive entries may be given in one sim work unit, sized from observed
+    sim times and manager turnaround (see ``AllocSupport.sim_batch_size``). Each
+    entry is still evaluated by its own sim_f call. The target duration and
+    maximum size of a batch may be set with ``alloc_specs["user"]["sim_batch_target_time"]``
+    and ``alloc_specs["user"]["max_sim_batch_size"]``.
+
+    If ``sim_specs["vectorized"]`` is set to True, the remaining entries are instead
+    shared among the idle workers, and each work unit is evaluated by one sim_f call.
+
     tags: alloc, simple, fast
 
     .. seealso::
@@ -32,18 +44,35 @@ def give_sim_work_first(W, H, sim_specs, gen_specs, alloc_specs, persis_info, li
     Work = {}
     gen_in = gen_specs.get("in", [])
 
-    for wid in support.avail_worker_ids():
+    avail_workers = support.avail_worker_ids()
+    for i, wid in enumerate(avail_workers):
         # Skip any cancelled points
         while persis_info["next_to_give"] < len(H) and H[persis_info["next_to_give"]]["cancel_requested"]:
             persis_info["next_to_give"] += 1
 
         # Give sim work if possible
         if persis_info["next_to_give"] < len(H):
-            try:
-                Work[wid] = support.sim_work(wid, H, sim_specs["in"], [persis_info["next_to_give"]], [])
-            except InsufficientFreeResources:
-                break
-            persis_info["next_to_give"] += 1
+            if user.get("adaptive_sim_batches") or sim_specs.get("vectorized"):
+                num_points = support.sim_batch_size(
+                    len(H) - persis_info["next_to_give"],
+                    len(avail_workers) - i,
+                    user.get("sim_batch_target_time"),
+                    user.get("max_sim_batch_size"),
+                    sim_specs.get("vectorized", False),
+                )
+                rows = np.arange(persis_info["next_to_give"], min(persis_info["next_to_give"] + num_points, len(H)))
+                rows = rows[~H["cancel_requested"][rows]]
+                try:
+                    Work[wid] = support.sim_work(wid, H, sim_specs["in"], rows, [], batched=True)
+                except InsufficientFreeResources:
+                    break
+                persis_info["next_to_give"] += num_points
+            else:
+                try:
+                    Work[wid] = support.sim_work(wid, H, sim_specs["in"], [persis_info["next_to_give"]], [])
+                except InsufficientFreeResources:
+                    break
+                persis_info["next_to_give"] += 1
 
         elif gen_count < user.get("num_active_gens", gen_count + 1):
             # Give gen work
@@ -6,6 +6,10 @@ def give_pregenerated_sim_work(W, H, sim_specs, gen_specs, alloc_specs, persis_i
     This allocation function gives (in order) entries in alloc_spec["x"] to
     idle workers. It is an example use case where no gen_func is used.
 
+    If ``sim_specs["vectorized"]`` is set to True, the remaining entries are shared
+    among the idle workers (up to ``alloc_specs["user"]["max_sim_batch_size"]`` per
+    work unit), and each work unit is evaluated by one sim_f call.
+
     .. seealso::
         `test_fast_alloc.py <https://github.com/Libensemble/libensemble/blob/develop/libensemble/tests/regression_tests/test_fast_alloc.py>`_ # noqa
     """
@@ -23,17 +27,31 @@ def give_pregenerated_sim_work(W, H, sim_specs, gen_specs, alloc_specs, persis_i
     if persis_info["next_to_give"] >= len(H):
         return Work, persis_info, 1
 
-    for i in support.avail_worker_ids():
+    vectorized = sim_specs.get("vectorized", False)
+    avail_workers = support.avail_worker_ids()
+    for n, i in enumerate(avail_workers):
         # Skip any cancelled points
         while persis_info["next_to_give"] < len(H) and H[persis_info["next_to_give"]]["cancel_requested"]:
             persis_info["next_to_give"] += 1
 
         # Give sim work
         try:
-            Work[i] = support.sim_work(i, H, sim_specs["in"], [persis_info["next_to_give"]], [])
+            if vectorized:
+                num_points = support.sim_batch_size(
+                    len(H) - persis_info["next_to_give"],
+                    len(avail_workers) - n,
+                    max_size=alloc_specs.get("user", {}).get("max_sim_batch_size"),
+                    vectorized=True,
+                )
+                rows = range(persis_info["next_to_give"], min(persis_info["next_to_give"] + num_points, len(H)))
+                rows = [row for row in rows if not H["cancel_requested"][row]]
+                Work[i] = support.sim_work(i, H, sim_specs["in"], rows, [], batched=True)
+            else:
+                num_points = 1
+                Work[i] = support.sim_work(i, H, sim_specs["in"], [persis_info["next_to_give"]], [])
         except InsufficientFreeResources:
             break
-        persis_info["next_to_give"] += 1
+        persis_info["next_to_give"] += num_points
 
         if persis_info["next_to_give"] >= len(H):
             break
@@ -29,6 +29,27 @@ def give_sim_work_first(
     If alloc_specs["user"]["give_all_with_same_priority"] is set to True, then
     all points with the same priority value are given as a batch to the sim.
 
+    If alloc_specs["user"]["adaptive_sim_batches"] is set to True, then several
+    points may be given in one sim work unit, sized from observed sim times and
+    manager turnaround (see ``AllocSupport.sim_batch_size``). Each point is still
+    evaluated by its own sim_f call. The target duration and maximum size of a
+    batch may be set with alloc_specs["user"]["sim_batch_target_time"] and
+    alloc_specs["user"]["max_sim_batch_size"].
+
+    If sim_specs["vectorized"] is set to True, the points available are instead
+    shared among the idle workers (up to alloc_specs["user"]["max_sim_batch_size"]
+    points per work unit), and each work unit is evaluated by one sim_f call.
+
+    If alloc_specs["user"]["backfill"] is set to True, then when the resources of the
+    highest priority point are not free, they are reserved for it, and other points
+    that will not delay it are given meanwhile (see ``AllocSupport.backfill_work``).
+    Sim runtimes are predicted by the runtime estimator (if ``libE_specs["runtime_estimator"]``
+    is set) or from observed sim times, or may be given in
+    alloc_specs["user"]["backfill_runtime"], as seconds or the name of a field of H.
+
+    Simulations running longer than alloc_specs["user"]["cancel_sims_time"] seconds, or
+    than alloc_specs["user"]["cancel_sims_factor"] times their predicted runtime, are cancelled.
+
     Workers performing sims will be assigned resources given in H["resource_sets"]
     this field exists, else defaulting to one. Workers performing gens are
     assigned resource_sets given by persis_info["gen_resources"] or zero.
@@ -43,10 +64,15 @@ def give_sim_work_first(
 
     user = alloc_specs.get("user", {})
 
-    if "cancel_sims_time" in user:
+    if "cancel_sims_time" in user or "cancel_sims_factor" in user:
         # Cancel simulations that are taking too long
-        rows = np.where(np.logical_and.reduce((H["sim_started"], ~H["sim_ended"], ~H["cancel_requested"])))[0]
-        inds = time.time() - H["sim_started_time"][rows] > user["cancel_sims_time"]
+        support = AllocSupport(W, libE_info=libE_info)
+        rows = support.running_points(H)
+        rows = rows[~H["cancel_requested"][rows]]
+        elapsed = time.time() - H["sim_started_time"][rows]
+        inds = elapsed > user.get("cancel_sims_time", np.inf)
+        if "cancel_sims_factor" in user:
+            inds |= elapsed > user["cancel_sims_factor"] * support.predicted_runtimes(H, rows)
         to_request_cancel = rows[inds]
         for row in to_request_cancel:
             H[row]["cancel_requested"] = True
@@ -56,6 +82,9 @@ def give_sim_work_first(
 
     # Initialize alloc_specs["user"] as user.
     batch_give = user.get("give_all_with_same_priority", False)
+    vectorized = sim_specs.get("vectorized", False)
+    batch_sims = (user.get("adaptive_sim_batches", False) or vectorized) and not batch_give
+    backfill = user.get("backfill", False) and libE_info["use_resource_sets"]
     gen_in = gen_specs.get("in", [])
 
     manage_resources = libE_info["use_resource_sets"]
@@ -63,15 +92,34 @@ def give_sim_work_first(
     gen_count = support.count_gens()
     Work = {}
 
-    points_to_evaluate = ~H["sim_started"] & ~H["cancel_requested"]
-    for wid in support.avail_worker_ids():
-        if np.any(points_to_evaluate):
-            sim_ids_to_send = support.points_by_priority(H, points_avail=points_to_evaluate, batch=batch_give)
+    points_to_evaluate = support.unstarted_points(H)
+    avail_workers = support.avail_worker_ids()
+    for i, wid in enumerate(avail_workers):
+        if len(points_to_evaluate):
             try:
-                Work[wid] = support.sim_work(wid, H, sim_specs["in"], sim_ids_to_send, persis_info.get(wid))
+                if backfill:
+                    Work[wid] = support.backfill_work(
+                        wid, H, sim_specs["in"], points_to_evaluate, persis_info.get(wid), user.get("backfill_runtime")
+                    )
+                    sim_ids_to_send = Work[wid]["libE_info"]["H_rows"]
+                elif batch_sims:
+                    num_points = support.sim_batch_size(
+                        len(points_to_evaluate),
+                        len(avail_workers) - i,
+                        user.get("sim_batch_target_time"),
+                        user.get("max_sim_batch_size"),
+                        vectorized,
+                    )
+                    sim_ids_to_send = support.points_by_priority(H, points_to_evaluate, num_points=num_points)
+                    Work[wid] = support.sim_work(
+                        wid, H, sim_specs["in"], sim_ids_to_send, persis_info.get(wid), batched=True
+                    )
+                else:
+                    sim_ids_to_send = support.points_by_priority(H, points_avail=points_to_evaluate, batch=batch_give)
+                    Work[wid] = support.sim_work(wid, H, sim_specs["in"], sim_ids_to_send, persis_info.get(wid))
             except InsufficientFreeResources:
                 break
-            points_to_evaluate[sim_ids_to_send] = False
+            points_to_evaluate = np.delete(points_to_evaluate, np.searchsorted(points_to_evaluate, sim_ids_to_send))
         else:
             # Allow at most num_active_gens active generator instances
             if gen_count >= user.get("num_active_gens", gen_count + 1):
@@ -39,6 +39,22 @@ def only_persistent_gens(W, H, sim_specs, gen_specs, alloc_specs, persis_info, l
         for a return from the generator before sending further returned points.
         Default: False
 
+    adaptive_sim_batches: Boolean, optional
+        Give several points per sim work unit, sized from observed sim times and
+        manager turnaround (see ``AllocSupport.sim_batch_size``). Each point is still
+        evaluated by its own sim_f call. Default: False
+
+    sim_batch_target_time: float, optional
+        Target duration (seconds) of a sim work unit when using adaptive_sim_batches.
+        Default: Based on manager turnaround.
+
+    max_sim_batch_size: int, optional
+        Maximum number of points in a sim work unit when using adaptive_sim_batches
+        (or a vectorized sim_f).
+
+    If ``sim_specs["vectorized"]`` is True, the points available are shared among the
+    idle workers, and each sim work unit is evaluated by one sim_f call.
+
     tags: alloc, batch, async, persistent, priority
 
     .. seealso::
@@ -58,6 +74,8 @@ def only_persistent_gens(W, H, sim_specs, gen_specs, alloc_specs, persis_info, l
     active_recv_gen = user.get("active_recv_gen", False)  # Persistent gen can handle irregular communications
     init_sample_size = user.get("init_sample_size", 0)  # Always batch return until this many evals complete
     batch_give = user.get("give_all_with_same_priority", False)
+    vectorized = sim_specs.get("vectorized", False)
+    batch_sims = (user.get("adaptive_sim_batches", False) or vectorized) and not batch_give
 
     support = AllocSupport(W, manage_resources, persis_info, libE_info)
     gen_count = support.count_persis_gens()
@@ -72,11 +90,9 @@ def only_persistent_gens(W, H, sim_specs, gen_specs, alloc_specs, persis_info, l
 
     # Give evaluated results back to a running persistent gen
     for wid in support.avail_worker_ids(persistent=EVAL_GEN_TAG, active_recv=active_recv_gen):
-        gen_inds = H["gen_worker"] == wid
-        returned_but_not_given = np.logical_and.reduce((H["sim_ended"], ~H["gen_informed"], gen_inds))
-        if np.any(returned_but_not_given):
-            if async_return or support.all_sim_ended(H, gen_inds):
-                point_ids = np.where(returned_but_not_given)[0]
+        point_ids = support.ended_not_informed_points(H, gen_worker=wid)
+        if len(point_ids):
+            if async_return or support.all_sim_ended_by_gen(H, wid):
                 Work[wid] = support.gen_work(
                     wid,
                     gen_specs["persis_in"],
@@ -85,26 +101,37 @@ def only_persistent_gens(W, H, sim_specs, gen_specs, alloc_specs, persis_info, l
                     persistent=True,
                     active_recv=active_recv_gen,
                 )
-                returned_but_not_given[point_ids] = False
 
     # Now the give_sim_work_first part
-    points_to_evaluate = ~H["sim_started"] & ~H["cancel_requested"]
+    points_to_evaluate = support.unstarted_points(H)
     avail_workers = support.avail_worker_ids(persistent=False, zero_resource_workers=False)
-    for wid in avail_workers:
-        if not np.any(points_to_evaluate):
+    for i, wid in enumerate(avail_workers):
+        if not len(points_to_evaluate):
             break
 
-        sim_ids_to_send = support.points_by_priority(H, points_avail=points_to_evaluate, batch=batch_give)
-
         try:
-            Work[wid] = support.sim_work(wid, H, sim_specs["in"], sim_ids_to_send, persis_info.get(wid))
+            if batch_sims:
+                num_points = support.sim_batch_size(
+                    len(points_to_evaluate),
+                    len(avail_workers) - i,
+                    user.get("sim_batch_target_time"),
+                    user.get("max_sim_batch_size"),
+                    vectorized,
+                )
+                sim_ids_to_send = support.points_by_priority(H, points_to_evaluate, num_points=num_points)
+                Work[wid] = support.sim_work(
+                    wid, H, sim_specs["in"], sim_ids_to_send, persis_info.get(wid), batched=True
+                )
+            else:
+                sim_ids_to_send = support.points_by_priority(H, points_avail=points_to_evaluate, batch=batch_give)
+                Work[wid] = support.sim_work(wid, H, sim_specs["in"], sim_ids_to_send, persis_info.get(wid))
         except InsufficientFreeResources:
             break
 
-        points_to_evaluate[sim_ids_to_send] = False
+        points_to_evaluate = np.delete(points_to_evaluate, np.searchsorted(points_to_evaluate, sim_ids_to_send))
 
     # Start persistent gens if no worker to give out. Uses zero_resource_workers if defined.
-    if not np.any(points_to_evaluate):
+    if not len(points_to_evaluate):
         avail_workers = support.avail_worker_ids(persistent=False, zero_resource_workers=True)
 
         for wid in avail_workers:
@@ -195,11 +222,9 @@ def only_persistent_workers(W, H, sim_specs, gen_specs, alloc_specs, persis_info
 
     # Give evaluated results back to a running persistent gen
     for wid in support.avail_worker_ids(persistent=EVAL_GEN_TAG, active_recv=active_recv_gen):
-        gen_inds = H["gen_worker"] == wid
-        returned_but_not_given = np.logical_and.reduce((H["sim_ended"], ~H["gen_informed"], gen_inds))
-        if np.any(returned_but_not_given):
-            if async_return or support.all_sim_ended(H, gen_inds):
-                point_ids = np.where(returned_but_not_given)[0]
+        point_ids = support.ended_not_informed_points(H, gen_worker=wid)
+        if len(point_ids):
+            if async_return or support.all_sim_ended_by_gen(H, wid):
                 Work[wid] = support.gen_work(
                     wid,
                     gen_specs["persis_in"],
@@ -208,16 +233,15 @@ def only_persistent_workers(W, H, sim_specs, gen_specs, alloc_specs, persis_info
                     persistent=True,
                     active_recv=active_recv_gen,
                 )
-                returned_but_not_given[point_ids] = False
 
     # Now the give_sim_work_first part
-    points_to_evaluate = ~H["sim_started"] & ~H["cancel_requested"]
+    points_to_evaluate = support.unstarted_points(H)
     avail_workers = list(
         set(support.avail_worker_ids(persistent=False, zero_resource_workers=False))
         | set(support.avail_worker_ids(persistent=EVAL_SIM_TAG, zero_resource_workers=False))
     )
     for wid in avail_workers:
-        if not np.any(points_to_evaluate):
+        if not len(points_to_evaluate):
             break
 
         sim_ids_to_send = support.points_by_priority(H, points_avail=points_to_evaluate, batch=batch_give)
@@ -229,10 +253,10 @@ def only_persistent_workers(W, H, sim_specs, gen_specs, alloc_specs, persis_info
         except InsufficientFreeResources:
             break
 
-        points_to_evaluate[sim_ids_to_send] = False
+        points_to_evaluate = np.delete(points_to_evaluate, np.searchsorted(points_to_evaluate, sim_ids_to_send))
 
     # Start persistent gens if no sim work to give out. Uses zero_resource_workers if defined.
-    if not np.any(points_to_evaluate):
+    if not len(points_to_evaluate):
         avail_workers = support.avail_worker_ids(persistent=False, zero_resource_workers=True)
 
         for wid in avail_workers:
@@ -28,8 +28,9 @@ from abc import ABC, abstractmethod
 
 # from multiprocessing import Process, Queue, Value, Lock
 from multiprocessing import Process, Queue
+from multiprocessing.connection import wait as mp_wait
 from threading import Thread
-from time import time
+from time import sleep, time
 from traceback import format_exc
 
 
@@ -95,6 +96,24 @@ class Comm(ABC):
     def kill_pending(self):
         """Cancel any pending sends (don't worry about those in the system)."""
 
+    @classmethod
+    def wait_any(cls, comms, timeout=None):
+        """Wait until at least one of the comms has a message ready for receipt.
+
+        Returns the indices (into comms) of all comms with messages ready, or an
+        empty list if none arrived before the timeout. This default polls each
+        comm's mail flag, backing off up to 0.1 ms between sweeps.
+        """
+        get_timeout = _timeout_fun(timeout)
+        delay = 1e-5
+        while True:
+            ready = [i for i, comm in enumerate(comms) if comm.mail_flag()]
+            remaining = get_timeout()
+            if ready or (remaining is not None and remaining <= 0):
+                return ready
+            delay = min(2 * delay, 1e-4)
+            sleep(delay if remaining is None else min(delay, remaining))
+
 
 class QComm(Comm):
     """Queue-based bidirectional communicator
@@ -269,6 +288,27 @@ class QCommProcess(Comm):
 
         self.process = Process(target=QCommProcess._qcomm_main, args=(comm, main) + args, kwargs=kwargs)
 
+    @classmethod
+    def group(cls, size, main, nworkers, *args, **kwargs):
+        """Create ``size`` comms attached to one process.
+
+        The process runs ``main`` with the list of their QComms (in place of a
+        single QComm), which should return a list of results, one per comm.
+        Starting (or terminating) any of the comms starts (or terminates) the process.
+        """
+        comms = [cls.__new__(cls) for _ in range(size)]
+        for comm in comms:
+            comm.inbox = Queue()
+            comm.outbox = Queue()
+            comm._result = None
+            comm._exception = None
+            comm._done = False
+        qcomms = [QComm(comm.inbox, comm.outbox, nworkers) for comm in comms]
+        process = Process(target=QCommProcess._qcomm_group_main, args=(qcomms, main) + args, kwargs=kwargs)
+        for comm in comms:
+            comm.process = process
+        return comms
+
     def _is_result_msg(self, msg):
         """Return true if message indicates final result (and set result/except)."""
         if len(msg) and isinstance(msg[0], CommResult):
@@ -304,9 +344,23 @@ class QCommProcess(Comm):
         """Check whether we know a message is ready for receipt."""
         return not self.outbox.empty()
 
+    @classmethod
+    def wait_any(cls, comms, timeout=None):
+        """Wait until at least one of the comms has a message ready for receipt.
+
+        Blocks on the read ends of the outbox queues, so no polling is needed.
+        Returns the indices of all comms with messages ready.
+        """
+        if not all(isinstance(comm, QCommProcess) for comm in comms):
+            return super().wait_any(comms, timeout)
+        readers = {comm.outbox._reader: i for i, comm in enumerate(comms)}
+        ready = mp_wait(list(readers), timeout)
+        return sorted(readers[reader] for reader in ready)
+
     def run(self):
         """Start the process."""
-        self.process.start()
+        if self.process.pid is None:  # Not started by another comm of a group
+            self.process.start()
 
     def result(self, timeout=None):
         """Join and return the thread main result (or re-raise an exception)."""
@@ -350,9 +404,32 @@ class QCommProcess(Comm):
             comm.send(CommResultErr(str(e), format_exc()))
             raise e
 
+    @staticmethod
+    def _qcomm_group_main(comms, main, *args, **kwargs):
+        """Main routine for a group -- sends a result (or the exception) on each comm."""
+        try:
+            _results = main(comms, *args, **kwargs)
+            for comm, _result in zip(comms, _results):
+                comm.send(CommResult(_result))
+        except Exception as e:
+            for comm in comms:
+                comm.send(CommResultErr(str(e), format_exc()))
+            raise e
+
     def __enter__(self):
         self.run()
         return self
 
     def __exit__(self, etype, value, traceback):
         self.process.join()
+
+
+def wait_any(comms, timeout=None):
+    """Wait for a message on any of the given (same type) comms.
+
+    Returns the indices of comms with messages ready for receipt, or an
+    empty list on timeout.
+    """
+    if not len(comms):
+        return []
+    return type(comms[0]).wait_any(comms, timeout)
@@ -6,13 +6,19 @@ The comms mechanism can be used to support consolidated logging at the
 manager by an appropriate choice of handlers and filters.  The default
 logging behavior is to install a CommLogHandler at each worker, which is
 used to pass messages to be handled at the manager, where they are then
-selected and emitted.  The WorkerID filter is used to add contextual
+selected and emitted.  Worker records are sent in batches, and the manager
+emits them from a background thread so handling results never waits on log
+output.  The WorkerID filter is used to add contextual
 information (in the form of a worker field) that identifies the origin of
 a given log message (manager or worker ID).
 """
 
+import copy
 import logging
+import queue
 import sys
+import time
+from logging.handlers import QueueListener
 from pathlib import Path
 
 from libensemble.utils.timer import Timer
@@ -77,15 +83,88 @@ class CommLogHandler(logging.Handler):
             self.comm.send(record)
 
 
+class BufferedCommLogHandler(CommLogHandler):
+    """Logging handler class that forwards LogRecords to a Comm in batches.
+
+    Buffered records are sent as a list when ``capacity`` records are buffered,
+    when a record of ``flush_level`` or above is logged, when a record is logged
+    ``flush_interval`` seconds or more after the oldest buffered record, and on
+    ``flush()``.
+    """
+
+    def __init__(
+        self, comm, pack=None, level=logging.NOTSET, capacity=64, flush_interval=1.0, flush_level=logging.ERROR
+    ):
+        super().__init__(comm, pack, level)
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self.buffer = []
+        self.buffer_start = 0.0
+
+    def emit(self, record):
+        """Buffer the record, sending the buffer if due."""
+        # Format arguments and exception now, as the record is sent later. Change a copy,
+        # as the record is shared with other handlers (as in QueueHandler.prepare)
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+
+        if not self.buffer:
+            self.buffer_start = time.time()
+        self.buffer.append(record)
+        if (
+            len(self.buffer) >= self.capacity
+            or record.levelno >= self.flush_level
+            or time.time() - self.buffer_start >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """Send any buffered records as one message."""
+        self.acquire()
+        try:
+            if self.buffer:
+                records, self.buffer = self.buffer, []
+                super().emit(records)
+        finally:
+            self.release()
+
+
+class ManagerLogListener(QueueListener):
+    """Emits records forwarded from workers in a background thread.
+
+    Each record is handled by the logger it was logged to (at the worker), as
+    when handled directly by the manager.
+    """
+
+    def __init__(self):
+        super().__init__(queue.SimpleQueue())
+
+    def enqueue(self, records):
+        """Queue a record, or list of records, for handling"""
+        if isinstance(records, logging.LogRecord):
+            records = [records]
+        for record in records:
+            self.queue.put_nowait(record)
+
+    def handle(self, record):
+        logging.getLogger(record.name).handle(record)
+
+
 class WorkerIDFilter(logging.Filter):
     """Logging filter to add worker ID to records."""
 
     # Give min. width adjustment (uses more space if needs more).
     margin_align = 5
 
-    def __init__(self, worker_id):
+    def __init__(self, worker_id, thread_name=None):
         super().__init__()
         self.worker_id = worker_id
+        self.thread_name = thread_name
 
         # Prefix used by stats logger
         if worker_id == 0:
@@ -95,7 +174,9 @@ class WorkerIDFilter(logging.Filter):
             self.prefix = f"Worker {worker_str}"
 
     def filter(self, record):
-        """Add worker ID to a LogRecord"""
+        """Add worker ID to a LogRecord (rejecting records from other threads, if thread_name is set)"""
+        if self.thread_name is not None and record.threadName != self.thread_name:
+            return False
         record.worker = getattr(record, "worker", self.worker_id)
         record.prefix = getattr(record, "prefix", self.prefix)
         return True
@@ -131,15 +212,20 @@ def init_worker_logger(logr, lev):
     logr.setLevel(lev)
 
 
-def worker_logging_config(comm, worker_id=None):
-    """Add a comm handler with worker ID filter to the indicated logger."""
+def worker_logging_config(comm, worker_id=None, batch_size=64, batch_interval=1.0):
+    """Add a buffered comm handler with worker ID filter to the indicated logger."""
+    worker_team_logging_config([comm], [worker_id or comm.rank], [None], batch_size, batch_interval)
+
+
+def worker_team_logging_config(comms, worker_ids, thread_names, batch_size=64, batch_interval=1.0):
+    """Add a buffered comm handler for each of the workers running as threads of this process.
+
+    Each handler takes the records logged by the thread of the given name.
+    """
     logconfig = LogConfig.config
     logger = logging.getLogger(logconfig.name)
     slogger = logging.getLogger(logconfig.stats_name)
 
-    ch = CommLogHandler(comm, pack=lambda rec: (0, rec))
-    ch.addFilter(WorkerIDFilter(worker_id or comm.rank))
-
     if logconfig.logger_set:
         remove_handlers(logger)
         remove_handlers(slogger)
@@ -148,8 +234,22 @@ def worker_logging_config(comm, worker_id=None):
         init_worker_logger(slogger, logconfig.log_level)
         logconfig.logger_set = True
 
-    logger.addHandler(ch)
-    slogger.addHandler(ch)
+    for comm, worker_id, thread_name in zip(comms, worker_ids, thread_names):
+        ch = BufferedCommLogHandler(comm, pack=lambda rec: (0, rec), capacity=batch_size, flush_interval=batch_interval)
+        ch.addFilter(WorkerIDFilter(worker_id, thread_name))
+        logger.addHandler(ch)
+        slogger.addHandler(ch)
+
+
+def flush_worker_logs():
+    """Send any log records buffered at a worker (called before sending to the manager)."""
+    logconfig = LogConfig.config
+    if logconfig is None:
+        return
+    for name in [logconfig.name, logconfig.stats_name]:
+        for hdl in logging.getLogger(name).handlers:
+            if isinstance(hdl, BufferedCommLogHandler):
+                hdl.flush()
 
 
 def manager_logging_config(specs={}):
@@ -176,17 +276,18 @@ def manager_logging_config(specs={}):
     logger.addHandler(fh)
     logconfig.logger_set = True
 
-    # Stats logging
+    # Stats logging (calc stats are instead sent as records with stats_columnar)
     # NB: Could add a specialized handler for immediate flushing
-    fhs = logging.FileHandler(logconfig.stat_filename, mode="a")
-    fhs.addFilter(wfilter)
-    fhs.setFormatter(logging.Formatter("%(prefix)s: %(message)s"))
     stat_logger = logging.getLogger(logconfig.stats_name)
     if logconfig.logger_set:
         remove_handlers(stat_logger)
     stat_logger.propagate = False
     stat_logger.setLevel(logging.DEBUG)
-    stat_logger.addHandler(fhs)
+    if not specs.get("stats_columnar"):
+        fhs = logging.FileHandler(logconfig.stat_filename, mode="a")
+        fhs.addFilter(wfilter)
+        fhs.setFormatter(logging.Formatter("%(prefix)s: %(message)s"))
+        stat_logger.addHandler(fhs)
 
     # Mirror error-logging to stderr of user-specified level
     fhe = logging.StreamHandler(stream=sys.stderr)
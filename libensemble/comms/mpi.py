@@ -6,9 +6,10 @@ MPI-based bidirectional communicator
 
 import time
 
+import numpy as np
 from mpi4py import MPI
 
-from libensemble.comms.comms import Comm, Timeout
+from libensemble.comms.comms import Comm, Timeout, _timeout_fun
 
 
 class MPIComm(Comm):
@@ -48,6 +49,37 @@ class MPIComm(Comm):
                 return True
         return False
 
+    @classmethod
+    def wait_any(cls, comms, timeout=None):
+        """Wait until at least one of the comms has a message ready for receipt.
+
+        When the comms share a communicator, each sweep is a single Iprobe on
+        ``MPI.ANY_SOURCE`` rather than a probe per remote rank. Returns the
+        indices of comms with messages ready.
+        """
+        ready = [i for i, comm in enumerate(comms) if comm.recv_buffer is not None]
+        if ready:
+            return ready
+        mpi_comm = comms[0].mpi_comm
+        if not all(isinstance(comm, MPIComm) and comm.mpi_comm is mpi_comm for comm in comms):
+            return super().wait_any(comms, timeout)
+
+        index_by_rank = {comm.remote_rank: i for i, comm in enumerate(comms)}
+        status = MPI.Status()
+        get_timeout = _timeout_fun(timeout)
+        delay = 1e-5
+        while True:
+            if mpi_comm.Iprobe(source=MPI.ANY_SOURCE, status=status):
+                source = status.Get_source()
+                if source in index_by_rank:
+                    return [index_by_rank[source]]
+                return super().wait_any(comms, 0)
+            remaining = get_timeout()
+            if remaining is not None and remaining <= 0:
+                return []
+            delay = min(2 * delay, 1e-4)
+            time.sleep(delay if remaining is None else min(delay, remaining))
+
     def kill_pending(self):
         """Make sure pending requests are cancelled if the comm is killed."""
         for req in self._outbox:
@@ -67,9 +99,17 @@ class MPIComm(Comm):
         """Send the requested message (as a pickle) via an MPI isend"""
         self.clean_outbox()
         msg, tag = self.process_outgoing(args)
+        self._isend(msg, tag)
+
+    def _isend(self, msg, tag):
+        """Post a nonblocking send of msg (pickled)"""
         req = self.mpi_comm.isend(msg, dest=self.remote_rank, tag=tag)
         self._outbox.append(req)
 
+    def _recv(self):
+        """Blocking receive of the next message (pickled)"""
+        return self.mpi_comm.recv(source=self.remote_rank, status=self.status)
+
     def recv(self, timeout=None):
         """Receive a message or raise TimeoutError."""
         if self.recv_buffer is not None:
@@ -81,7 +121,7 @@ class MPIComm(Comm):
             while not self.mail_flag():
                 if time.time() > tfinal:
                     raise Timeout()
-        result = self.mpi_comm.recv(source=self.remote_rank, status=self.status)
+        result = self._recv()
         return self.process_incoming(result, self.status)
 
     def process_outgoing(self, msg):
@@ -100,8 +140,74 @@ class MPIComm(Comm):
         return self.mpi_comm.Get_size() - 1
 
 
+class _BufferedMsg:
+    """Pickled in place of a message whose numpy arrays follow as raw buffers
+
+    The message is either a numpy array, or a dictionary of which some values
+    are numpy arrays. Array values are removed from the dictionary, and their
+    keys, dtypes and shapes recorded, in order of the buffer messages. The keys
+    are kept in the dictionary (with value None) to preserve its ordering.
+    """
+
+    def __init__(self, msg, keys, dtypes, shapes):
+        self.msg = msg
+        self.keys = keys
+        self.dtypes = dtypes
+        self.shapes = shapes
+
+
+def _as_bytes(array):
+    """Returns a flat byte view of a C-contiguous array (of any dtype)"""
+    return array.reshape(-1).view(np.uint8)
+
+
 class MainMPIComm(MPIComm):
-    """MPI communicator used by the workers and managers for the moment."""
+    """MPI communicator used by the workers and managers for the moment.
+
+    Numpy arrays in messages (sent directly, or as values of a dictionary) are
+    not pickled. A small pickled header with their dtypes and shapes is sent,
+    followed by the array data using buffer-based ``Isend``/``Recv``. Arrays
+    containing Python objects, and all other messages, are pickled as usual.
+    """
+
+    @staticmethod
+    def _bufferable(value):
+        return type(value) is np.ndarray and not value.dtype.hasobject
+
+    def _isend(self, msg, tag):
+        """Post nonblocking sends of a header and array buffers, or of a pickle"""
+        if self._bufferable(msg):
+            header, arrays = _BufferedMsg(None, [None], [msg.dtype], [msg.shape]), [msg]
+        elif isinstance(msg, dict) and any(self._bufferable(v) for v in msg.values()):
+            keys = [k for k, v in msg.items() if self._bufferable(v)]
+            arrays = [msg[k] for k in keys]
+            rest = {k: None if k in keys else v for k, v in msg.items()}
+            header = _BufferedMsg(rest, keys, [a.dtype for a in arrays], [a.shape for a in arrays])
+        else:
+            return super()._isend(msg, tag)
+
+        super()._isend(header, tag)
+        for array in arrays:
+            buf = _as_bytes(np.ascontiguousarray(array))
+            self._outbox.append(self.mpi_comm.Isend([buf, MPI.BYTE], dest=self.remote_rank, tag=tag))
+
+    def _recv(self):
+        """Blocking receive of the next message, and of any array buffers following it"""
+        msg = super()._recv()
+        if not isinstance(msg, _BufferedMsg):
+            return msg
+
+        tag = self.status.Get_tag()
+        arrays = []
+        for dtype, shape in zip(msg.dtypes, msg.shapes):
+            array = np.empty(shape, dtype=dtype)
+            self.mpi_comm.Recv([_as_bytes(array), MPI.BYTE], source=self.remote_rank, tag=tag)
+            arrays.append(array)
+
+        if msg.msg is None:
+            return arrays[0]
+        msg.msg.update(zip(msg.keys, arrays))
+        return msg.msg
 
     def process_incoming(self, msg, status):
         return status.Get_tag(), msg
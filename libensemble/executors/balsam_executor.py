@@ -169,6 +169,10 @@ class BalsamTask(Task):
 
         logger.info(f"Task {self.name} ended with state {self.state}")
 
+    def _wait_for_exit(self, timeout: float) -> None:
+        """Waits for timeout seconds (Balsam jobs are not local processes)"""
+        time.sleep(max(timeout, 0))
+
     def poll(self) -> None:
         """Polls and updates the status attributes of the supplied task. Requests
         Job information from Balsam service."""
@@ -11,10 +11,12 @@ import shutil
 import stat
 import sys
 import time
+from collections import deque
 from pathlib import Path
 from typing import Any, Optional, Union
 
 import libensemble.utils.launcher as launcher
+from libensemble.comms.logs import flush_worker_logs
 from libensemble.message_numbers import (
     MAN_KILL_SIGNALS,
     STOP_TAG,
@@ -24,6 +26,7 @@ from libensemble.message_numbers import (
     WORKER_KILL_ON_TIMEOUT,
 )
 from libensemble.resources.resources import Resources
+from libensemble.utils.thread_local import ThreadLocalAttribute
 from libensemble.utils.timer import TaskTimer
 
 logger = logging.getLogger(__name__)
@@ -239,6 +242,13 @@ class Task:
             self.state = "FINISHED" if self.success else "FAILED"
             logger.info(f"Task {self.name} finished with errcode {self.errcode} ({self.state})")
 
+    def _wait_for_exit(self, timeout: float) -> None:
+        """Waits for up to timeout seconds, returning early if the task process exits"""
+        if self.process is None:
+            time.sleep(max(timeout, 0))
+        else:
+            launcher.wait_for_exit(self.process, timeout)
+
     def poll(self) -> None:
         """Polls and updates the status attributes of the task"""
         if self.dry_run:
@@ -276,7 +286,8 @@ class Task:
         if not self._check_poll():
             return
 
-        # Wait on the task
+        # Wait on the task (sending any log records buffered at a worker first)
+        flush_worker_logs()
         rc = launcher.wait(self.process, timeout)
         if rc is None:
             raise TimeoutExpired(self.name, timeout)
@@ -370,6 +381,66 @@ class Task:
         return self.state == "USER_KILLED"
 
 
+class TaskRegistry:
+    """The tasks submitted by an executor, indexed by task ID, oldest first
+
+    Tasks are reported (e.g., for the stats of the calculation that submitted them)
+    in order of submission with ``take_unreported``. If ``retention`` is set, then
+    once more than this many tasks are held, the oldest tasks are removed, provided
+    they have been reported and have finished.
+    """
+
+    def __init__(self, retention: Optional[int] = None) -> None:
+        self.retention = retention
+        self.by_id = {}
+        self.recent = deque()  # (submission count, task), oldest first
+        self.num_submitted = 0
+        self.num_reported = 0
+
+    def append(self, task: Task) -> None:
+        """Adds a newly submitted task"""
+        self.by_id[task.id] = task
+        self.recent.append((self.num_submitted, task))
+        self.num_submitted += 1
+        self._evict()
+
+    def get(self, taskid: Union[str, int]) -> Optional[Task]:
+        """Returns the task with the given ID (or None if not held)"""
+        return self.by_id.get(taskid)
+
+    def take_unreported(self) -> list:
+        """Returns the tasks submitted since last called"""
+        num_new = self.num_submitted - self.num_reported
+        tasks = [task for _, task in itertools.islice(self.recent, len(self.recent) - num_new, None)]
+        self.num_reported = self.num_submitted
+        self._evict()
+        return tasks
+
+    def _evict(self) -> None:
+        """Removes the oldest tasks beyond retention that have been reported and finished"""
+        while self.retention is not None and len(self.recent) > self.retention:
+            count, task = self.recent[0]
+            if count >= self.num_reported:
+                break
+            task.poll()
+            if not task.finished:
+                break
+            self.recent.popleft()
+            del self.by_id[task.id]
+
+    def __len__(self) -> int:
+        return len(self.recent)
+
+    def __iter__(self):
+        return (task for _, task in self.recent)
+
+    def __contains__(self, task: Task) -> bool:
+        return self.by_id.get(getattr(task, "id", None)) is task
+
+    def __getitem__(self, index: int) -> Task:
+        return self.recent[index][1]
+
+
 class Executor:
     """The executor can create, poll and kill runnable tasks
 
@@ -381,6 +452,12 @@ class Executor:
 
     executor = None
 
+    # Held for each worker thread when workers share a process
+    workerID = ThreadLocalAttribute()
+    comm = ThreadLocalAttribute()
+    manager_signal = ThreadLocalAttribute()
+    list_of_tasks = ThreadLocalAttribute()
+
     def _wait_on_start(self, task: Task, fail_time: Optional[int] = None) -> None:
         """Called by submit when wait_on_start is True.
 
@@ -401,14 +478,21 @@ class Executor:
             if fail_time:
                 remaining = fail_time - task.timer.elapsed
                 while task.state not in END_STATES and remaining > 0:
-                    time.sleep(min(0.01, remaining))
+                    task._wait_for_exit(remaining)
                     task.poll()
                     remaining = fail_time - task.timer.elapsed
                 logger.debug(f"After {task.timer.elapsed} seconds: task {task.name} polled as {task.state}")
 
-    def __init__(self) -> None:
+    def __init__(self, task_retention: Optional[int] = None) -> None:
         """Instantiate a new Executor instance.
 
+        Parameters
+        ----------
+
+        task_retention: int, Optional
+            Number of tasks to keep (e.g., for ``get_task``). Older tasks are released once
+            they have finished and their timing has been reported. Default: Keep all tasks
+
         Returns
         -------
 
@@ -423,10 +507,9 @@ class Executor:
         self.apps = {}
 
         self.wait_time = 60
-        self.list_of_tasks = []
+        self.list_of_tasks = TaskRegistry(task_retention)
         self.workerID = None
         self.comm = None
-        self.last_task = 0
         Executor.executor = self
 
     def __enter__(self):
@@ -585,7 +668,8 @@ class Executor:
             longer than this limit are killed. Default: No timeout
 
         delay: int, Optional
-            Sleep duration between polling loop iterations. Default: 0.1 seconds
+            Maximum duration between polling loop iterations (the loop returns as soon
+            as the task ends). Default: 0.1 seconds
 
         poll_manager: bool, Optional
             Whether to also poll the manager for 'finish' or 'kill' signals.
@@ -614,7 +698,8 @@ class Executor:
                 calc_status = WORKER_KILL_ON_TIMEOUT
                 break
 
-            time.sleep(delay)
+            flush_worker_logs()
+            task._wait_for_exit(delay if timeout is None else min(delay, timeout - task.runtime))
 
         if calc_status == UNSET_TAG:
             if task.state == "FINISHED":
@@ -628,7 +713,7 @@ class Executor:
 
     def get_task(self, taskid: Union[str, int]) -> Optional[Task]:
         """Returns the task object for the supplied task ID"""
-        task = next((j for j in self.list_of_tasks if j.id == taskid), None)
+        task = self.list_of_tasks.get(taskid)
         if task is None:
             logger.warning(f"Task {taskid} not found in tasklist")
         return task
@@ -644,16 +729,26 @@ class Executor:
         """
 
         timing_msg = ""
-        if self.list_of_tasks:
-            start_task = self.last_task
-            for i, task in enumerate(self.list_of_tasks[start_task:]):
-                if datetime:
-                    timing_msg += f" Task {i}: {task.timer}"
-                else:
-                    timing_msg += f" Task {i}: {task.timer.summary()}"
-                self.last_task += 1
+        for i, task in enumerate(self.list_of_tasks.take_unreported()):
+            if datetime:
+                timing_msg += f" Task {i}: {task.timer}"
+            else:
+                timing_msg += f" Task {i}: {task.timer.summary()}"
         return timing_msg
 
+    def new_tasks_times(self) -> list:
+        """Returns the start and end times (in seconds since the epoch) of new tasks
+
+        Tasks are polled first, and the end time of a task that is still running is NaN.
+        """
+        times = []
+        for task in self.list_of_tasks.take_unreported():
+            if not task.finished and task.process is not None:
+                task.poll()
+            ended = task.finished and not task.timer.timing and task.timer.tend
+            times.append((task.timer.tstart / 1000, task.timer.tend / 1000 if ended else float("nan")))
+        return times
+
     def set_workerID(self, workerid) -> None:
         """Sets the worker ID for this executor"""
         self.workerID = workerid
@@ -769,6 +864,7 @@ class Executor:
                 task.submit_time = task.timer.tstart  # Time not date - may not need if using timer.
 
             self.list_of_tasks.append(task)
+        flush_worker_logs()  # Send the launch record now, as the calc may run for some time
         return task
 
     def poll(self, task: Task) -> None:
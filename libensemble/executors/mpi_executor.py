@@ -18,10 +18,12 @@ import time
 from typing import List, Optional, Union
 
 import libensemble.utils.launcher as launcher
+from libensemble.comms.logs import flush_worker_logs
 from libensemble.executors.executor import Executor, ExecutorException, Task
 from libensemble.executors.mpi_runner import MPIRunner
 from libensemble.resources.mpi_resources import get_MPI_variant
 from libensemble.resources.resources import Resources
+from libensemble.utils.thread_local import ThreadLocalAttribute
 
 logger = logging.getLogger(__name__)
 # To change logging level for just this module
@@ -62,6 +64,10 @@ class MPIExecutor(Executor):
                 to be correct for kills to work correctly. Use the standalone test at
                 libensemble/tests/standalone_tests/kill_test to determine correct value
                 for a system.
+            'task_retention' [int]:
+                Number of tasks to keep (e.g., for ``get_task``). Older tasks are released
+                once they have finished and their timing has been reported. Default: Keep
+                all tasks.
 
         For example::
 
@@ -74,10 +80,13 @@ class MPIExecutor(Executor):
 
     """
 
+    gen_nprocs = ThreadLocalAttribute()
+    gen_ngpus = ThreadLocalAttribute()
+
     def __init__(self, custom_info: dict = {}) -> None:
         """Instantiate a new MPIExecutor instance."""
 
-        Executor.__init__(self)
+        Executor.__init__(self, task_retention=custom_info.get("task_retention"))
 
         # MPI launch settings
         self.max_launch_attempts = 5
@@ -379,6 +388,7 @@ class MPIExecutor(Executor):
                 task.submit_time = task.timer.tstart  # Time not date - may not need if using timer.
 
         self.list_of_tasks.append(task)
+        flush_worker_logs()  # Send the launch record now, as the calc may run for some time
 
         return task
 
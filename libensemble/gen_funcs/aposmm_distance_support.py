@@ -0,0 +1,235 @@
+"""
+Spatial index over the evaluated points of an APOSMM history, used to find
+nearest better points without comparing each new point against every point.
+"""
+
+from math import sqrt
+
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy.spatial.distance import cdist
+
+__all__ = ["BetterPointIndex"]
+
+# History fields for the nearest better sample (local_pt False) and localopt (local_pt True) points
+_DIST = {False: "dist_to_better_s", True: "dist_to_better_l"}
+_IND = {False: "ind_of_better_s", True: "ind_of_better_l"}
+
+# Largest number of distances computed at once when comparing points directly
+_MAX_PAIRS = 2**20
+
+
+def _chunks(rows, num_cands, num_cands_per_row=0):
+    """Splits rows (in order) so that comparing each chunk against its candidates stays within _MAX_PAIRS
+
+    A chunk's candidates are num_cands points plus up to num_cands_per_row points for each of its rows.
+    """
+    size = max(1, _MAX_PAIRS // max(1, num_cands + num_cands_per_row))
+    if num_cands_per_row:
+        size = min(size, max(1, int(sqrt(_MAX_PAIRS / num_cands_per_row))))
+    return [rows[i : i + size] for i in range(0, len(rows), size)]
+
+
+def _closest(dists, cands, ok):
+    """For each row of dists, the closest candidate where ok, taking the lowest candidate row on ties
+
+    Returns the distances (inf where no candidate is ok) and candidate rows (-1 where none is ok).
+    """
+    dists = np.where(ok, dists, np.inf)
+    best = dists.min(axis=1, initial=np.inf)
+    found = np.isfinite(best)
+    cands = np.where(dists == best[:, None], cands, np.iinfo(int).max).min(axis=1, initial=np.iinfo(int).max)
+    return best, np.where(found, cands, -1)
+
+
+class BetterPointIndex:
+    """Incrementally maintained index of the points known to APOSMM.
+
+    Points are kept in a KD-tree over ``x_on_cube`` that is rebuilt once the
+    points added since the last build exceed a fraction of it. Points added
+    since the last build are compared against directly.
+
+    For a new point, the nearest point (of each kind) that is at least as good
+    is found from nearest-neighbor queries on the tree, or directly from the
+    few points at least as good (kept sorted by ``f``) for the best points.
+
+    For the points that a new point may now be the nearest better point of,
+    a fixed-radius query is used. Points whose current distance to a better
+    point exceeds that radius (about the square root of the number of points,
+    chosen at each build) are checked directly.
+    """
+
+    # Rebuild the tree when the points added since the last build exceed this fraction of it
+    rebuild_fraction = 0.01
+
+    # Do not build a tree for fewer points than this
+    min_tree_size = 256
+
+    # Find the better point directly when at most this many points are at least as good
+    max_direct_rank = 64
+
+    def __init__(self):
+        self.indexed = np.zeros(0, dtype=bool)
+        self.tree = None
+        self.tree_rows = np.zeros(0, dtype=int)
+        self.recent_rows = np.zeros(0, dtype=int)
+        self.sorted_f = {kind: np.zeros(0) for kind in _DIST}
+        self.sorted_rows = {kind: np.zeros(0, dtype=int) for kind in _DIST}
+        self.radius = {kind: np.inf for kind in _DIST}
+        self.outside_rows = {kind: np.zeros(0, dtype=int) for kind in _DIST}
+
+    def update(self, H, new_rows):
+        """Adds the evaluated points ``new_rows`` and updates the better point fields of H
+
+        ``new_rows`` must be in increasing order. Other points already known to
+        APOSMM, but not yet in the index, are added first (without updates).
+        """
+        if len(self.indexed) < len(H):
+            self.indexed = np.concatenate((self.indexed, np.zeros(len(H) - len(self.indexed), dtype=bool)))
+        missing = np.nonzero(H["known_to_aposmm"] & ~self.indexed[: len(H)])[0]
+        added = np.concatenate((missing, new_rows))
+        self._insert(H, added)
+
+        rebuilt = self._build_tree_if_needed(H)
+        for kind in _DIST:
+            self._update_nearest_better(H, new_rows, kind)
+
+        # Distances to better points only decrease from here, so rows within the radii stay within them
+        if rebuilt:
+            self._choose_radii(H)
+        else:
+            for kind in _DIST:
+                outside = added[H[_DIST[kind]][added] > self.radius[kind]]
+                self.outside_rows[kind] = np.concatenate((self.outside_rows[kind], outside))
+
+        for kind in _DIST:
+            self._update_others(H, new_rows[H["local_pt"][new_rows] == kind], kind)
+
+    def _insert(self, H, rows):
+        """Adds rows to the index (not yet to the tree)"""
+        self.indexed[rows] = True
+        self.recent_rows = np.concatenate((self.recent_rows, rows))
+        for kind in _DIST:
+            kind_rows = rows[H["local_pt"][rows] == kind]
+            if len(kind_rows):
+                kind_rows = kind_rows[np.argsort(H["f"][kind_rows], kind="stable")]
+                f = H["f"][kind_rows]
+                pos = np.searchsorted(self.sorted_f[kind], f, side="right")
+                self.sorted_f[kind] = np.insert(self.sorted_f[kind], pos, f)
+                self.sorted_rows[kind] = np.insert(self.sorted_rows[kind], pos, kind_rows)
+
+    def _build_tree_if_needed(self, H):
+        """Builds the tree over all indexed points if enough were added since the last build"""
+        if len(self.recent_rows) < max(self.min_tree_size, self.rebuild_fraction * len(self.tree_rows)):
+            return False
+
+        self.tree_rows = np.concatenate((self.tree_rows, self.recent_rows))
+        self.tree = cKDTree(H["x_on_cube"][self.tree_rows])
+        self.recent_rows = np.zeros(0, dtype=int)
+        return True
+
+    def _choose_radii(self, H):
+        """Chooses the query radii so that only about the square root of the points are outside them"""
+        rows = self.tree_rows
+        num_outside = max(self.max_direct_rank, int(sqrt(len(rows))))
+        for kind in _DIST:
+            dists = H[_DIST[kind]][rows]
+            if len(rows) > num_outside:
+                self.radius[kind] = np.partition(dists, len(rows) - num_outside - 1)[len(rows) - num_outside - 1]
+            else:
+                self.radius[kind] = np.inf
+            self.outside_rows[kind] = rows[dists > self.radius[kind]]
+
+    def _update_nearest_better(self, H, new_rows, kind):
+        """Sets the distance to (and index of) the nearest point of the given kind that is at least as good"""
+        X = H["x_on_cube"]
+        f = H["f"]
+        best = np.full(len(new_rows), np.inf)
+        best_rows = np.full(len(new_rows), -1)
+
+        ranks = np.searchsorted(self.sorted_f[kind], f[new_rows], side="right")
+        direct = ranks <= self.max_direct_rank if self.tree is not None else np.ones(len(new_rows), dtype=bool)
+
+        # Points with few points at least as good are compared against all of them
+        for chunk in _chunks(np.nonzero(direct)[0], np.max(ranks[direct], initial=1)):
+            rows = new_rows[chunk]
+            cands = self.sorted_rows[kind][: np.max(ranks[chunk])]
+            dists = cdist(X[rows], X[cands])
+            ok = (f[cands][None, :] <= f[rows][:, None]) & (cands[None, :] != rows[:, None])
+            best[chunk], best_rows[chunk] = _closest(dists, cands, ok)
+
+        # Other points query the tree for their nearest points (about twice as many as needed to find a better one
+        # if f is unrelated to x), widening the query for those none of which are better, or whose nearest better
+        # point is as far as the farthest returned (so that a lower row at the same distance is not missed)
+        todo = np.nonzero(~direct)[0]
+        if len(todo):
+            num = len(self.tree_rows)
+            ks = np.minimum(num, 2 ** np.ceil(np.log2(np.maximum(16, 2 * num / ranks[todo])))).astype(int)
+            while len(todo):
+                k = np.min(ks)
+                group = ks == k
+                rows = new_rows[todo[group]]
+                dists, inds = self.tree.query(X[rows], k=k)
+                dists, inds = dists.reshape(len(rows), -1), inds.reshape(len(rows), -1)
+                cands = self.tree_rows[np.minimum(inds, num - 1)]
+                ok = (
+                    (inds < num)
+                    & (H["local_pt"][cands] == kind)
+                    & (f[cands] <= f[rows][:, None])
+                    & (cands != rows[:, None])
+                )
+                best[todo[group]], best_rows[todo[group]] = _closest(dists, cands, ok)
+
+                tied = np.zeros(len(todo), dtype=bool)
+                tied[group] = best[todo[group]] >= dists[:, -1]
+                retry = group & ((best_rows[todo] == -1) | tied) & (k < num)
+                ks[retry] = np.minimum(num, 2 * k)
+                todo, ks = todo[~group | retry], ks[~group | retry]
+
+            # ... and compare against the points added since the tree was built
+            on_tree = np.nonzero(~direct)[0]
+            cands = self.recent_rows[H["local_pt"][self.recent_rows] == kind]
+            for chunk in _chunks(on_tree, len(cands)):
+                rows = new_rows[chunk]
+                dists = cdist(X[rows], X[cands])
+                ok = (f[cands][None, :] <= f[rows][:, None]) & (cands[None, :] != rows[:, None])
+                recent_best, recent_rows = _closest(dists, cands, ok)
+                closer = (recent_best < best[chunk]) | ((recent_best == best[chunk]) & (recent_rows < best_rows[chunk]))
+                closer &= recent_rows >= 0
+                best[chunk] = np.where(closer, recent_best, best[chunk])
+                best_rows[chunk] = np.where(closer, recent_rows, best_rows[chunk])
+
+        found = best_rows >= 0
+        H[_DIST[kind]][new_rows[found]] = best[found]
+        H[_IND[kind]][new_rows[found]] = best_rows[found]
+
+    def _update_others(self, H, new_rows, kind):
+        """Updates points for which a new point (of the given kind) is strictly better and closer
+
+        Points are updated as if the new points were considered one at a time
+        in increasing order.
+        """
+        if not len(new_rows):
+            return
+
+        X = H["x_on_cube"]
+        f = H["f"]
+        near = []
+        if self.tree is not None:
+            near = self.tree.query_ball_point(X[new_rows], self.radius[kind])
+
+        fixed = np.concatenate((self.outside_rows[kind], self.recent_rows))
+        max_near = max((len(inds) for inds in near), default=0)
+        for chunk in _chunks(np.arange(len(new_rows)), len(fixed), max_near):
+            rows = new_rows[chunk]
+            cands = [fixed] + [self.tree_rows[near[i]] for i in chunk if len(near)]
+            cands = np.unique(np.concatenate(cands).astype(int))
+            dists = cdist(X[rows], X[cands])
+            dists = np.where(f[cands][None, :] > f[rows][:, None], dists, np.inf)
+
+            # The first (lowest) row at the smallest distance is the one that would have updated each candidate
+            first = dists.argmin(axis=0)
+            closest = dists[first, np.arange(len(cands))]
+            closer = closest < H[_DIST[kind]][cands]
+            H[_DIST[kind]][cands[closer]] = closest[closer]
+            H[_IND[kind]][cands[closer]] = rows[first[closer]]
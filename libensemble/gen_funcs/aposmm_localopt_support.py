@@ -11,6 +11,8 @@ __all__ = [
     "run_external_localopt",
 ]
 
+import queue
+import threading
 from multiprocessing import Event, Process, Queue
 
 import numpy as np
@@ -65,6 +67,16 @@ class ErrorMsg(object):
         self.x = x
 
 
+class StopMsg(object):
+    """
+    Message communicated to stop a local optimization run in a thread.
+    """
+
+
+class LocalOptStopped(Exception):
+    """Raised in a local optimization thread's callbacks once it has been told to stop"""
+
+
 class LocalOptInterfacer(object):
     """
     This class defines the APOSMM interface to various local optimization routines.
@@ -76,6 +88,13 @@ class LocalOptInterfacer(object):
     - SciPy routines ['scipy_Nelder-Mead', 'scipy_COBYLA', 'scipy_BFGS']
     - DFOLS ['dfols']
     - External local optimizer ['external_localopt'] (which use files to pass/receive x/f values)
+
+    Each run is advanced in its own child process, or in a thread of the
+    APOSMM process if ``user_specs['localopt_backend']`` is ``'thread'``.
+    Runs only advance while APOSMM waits for their next point, so threads do
+    not contend, and the handshakes need no pickling or inter-process
+    signalling. Optimizers then share the APOSMM process's global state (for
+    example, DFO-LS seeds NumPy's global random generator).
     """
 
     def __init__(self, user_specs, x0, f0, grad0=None):
@@ -90,9 +109,18 @@ class LocalOptInterfacer(object):
             immediately after creating the class.
 
         """
-        self.parent_can_read = Event()
-        self.comm_queue = Queue()
-        self.child_can_read = Event()
+        backend = user_specs.get("localopt_backend", "process")
+        assert backend in ["process", "thread"], f"Unknown localopt_backend {backend}"
+        self.threaded = backend == "thread"
+
+        if self.threaded:
+            self.parent_can_read = threading.Event()
+            self.comm_queue = queue.Queue()
+            self.child_can_read = threading.Event()
+        else:
+            self.parent_can_read = Event()
+            self.comm_queue = Queue()
+            self.child_can_read = Event()
 
         self.x0 = x0.copy()
         self.f0 = f0.copy()
@@ -121,10 +149,11 @@ class LocalOptInterfacer(object):
             run_local_opt = run_external_localopt
 
         self.parent_can_read.clear()
-        self.process = Process(
-            target=opt_runner,
-            args=(run_local_opt, user_specs, self.comm_queue, x0, f0, self.child_can_read, self.parent_can_read),
-        )
+        args = (run_local_opt, user_specs, self.comm_queue, x0, f0, self.child_can_read, self.parent_can_read)
+        if self.threaded:
+            self.process = threading.Thread(target=opt_runner, args=args, daemon=True)
+        else:
+            self.process = Process(target=opt_runner, args=args)
 
         self.process.start()
         self.is_running = True
@@ -176,19 +205,24 @@ class LocalOptInterfacer(object):
         return x_new
 
     def destroy(self):
-        """Recursively kill any optimizer processes still running"""
+        """Recursively kill any optimizer processes still running (or stop the optimizer thread)"""
         if self.process.is_alive():
-            process = psutil.Process(self.process.pid)
-            for child in process.children(recursive=True):
-                child.kill()
-            process.kill()
+            if self.threaded:
+                self.comm_queue.put(StopMsg())
+                self.child_can_read.set()
+            else:
+                process = psutil.Process(self.process.pid)
+                for child in process.children(recursive=True):
+                    child.kill()
+                process.kill()
         self.close()
 
     def close(self):
-        """Join process and close queue"""
+        """Join process (or thread) and close queue"""
         self.process.join()
-        self.comm_queue.close()
-        self.comm_queue.join_thread()
+        if not self.threaded:
+            self.comm_queue.close()
+            self.comm_queue.join_thread()
         self.is_running = False
 
 
@@ -521,6 +555,8 @@ def run_local_tao(user_specs, comm_queue, x0, f0, child_can_read, parent_can_rea
 def opt_runner(run_local_opt, user_specs, comm_queue, x0, f0, child_can_read, parent_can_read):
     try:
         run_local_opt(user_specs, comm_queue, x0, f0, child_can_read, parent_can_read)
+    except LocalOptStopped:
+        pass
     except Exception as e:
         comm_queue.put(ErrorMsg(e))
         parent_can_read.set()
@@ -614,6 +650,10 @@ def put_set_wait_get(x, comm_queue, parent_can_read, child_can_read, user_specs)
     child_can_read.wait()
     # print('[Child]: Wohooo.. I am free folks', flush=True)
     values = comm_queue.get()
+    if isinstance(values, StopMsg):
+        # Leave the message (and event) in place in case the optimizer catches the exception and calls back again
+        comm_queue.put(values)
+        raise LocalOptStopped()
     child_can_read.clear()
 
     if user_specs.get("periodic"):
@@ -12,8 +12,9 @@ from math import log, pi, sqrt
 
 import numpy as np
 from mpmath import gamma
-from scipy.spatial.distance import cdist
+from scipy.spatial import cKDTree
 
+from libensemble.gen_funcs.aposmm_distance_support import BetterPointIndex
 from libensemble.gen_funcs.aposmm_localopt_support import ConvergedMsg, LocalOptInterfacer, simulate_recv_from_manager
 from libensemble.message_numbers import EVAL_GEN_TAG, FINISHED_PERSISTENT_GEN_TAG, PERSIS_STOP, STOP_TAG
 from libensemble.tools.persistent_support import PersistentSupport
@@ -87,6 +88,9 @@ def aposmm(H, persis_info, gen_specs, libE_info):
       points must satisfy
     - ``'rk_const' [float]``: Multiplier in front of the r_k value
     - ``'max_active_runs' [int]``: Bound on number of runs APOSMM is advancing
+    - ``'localopt_backend' [str]``: ``'process'`` (default) to advance each
+      localopt run in a child process, or ``'thread'`` to advance it in a
+      thread of the APOSMM process (much less overhead per run and point)
 
     If the rules in ``decide_where_to_start_localopt`` produces more than
     ``'max_active_runs'`` in some iteration, then existing runs are prioritized.
@@ -144,7 +148,8 @@ def aposmm(H, persis_info, gen_specs, libE_info):
     try:
         user_specs = gen_specs["user"]
         ps = PersistentSupport(libE_info, EVAL_GEN_TAG)
-        n, n_s, rk_const, ld, mu, nu, comm, local_H = initialize_APOSMM(H, user_specs, libE_info)
+        dist_index = BetterPointIndex()
+        n, n_s, rk_const, ld, mu, nu, comm, local_H = initialize_APOSMM(H, user_specs, libE_info, dist_index)
         local_opters, sim_id_to_child_inds, run_order, run_pts, total_runs, fields_to_pass = initialize_children(
             user_specs
         )
@@ -181,7 +186,9 @@ def aposmm(H, persis_info, gen_specs, libE_info):
                     # This break happens here so the manager can be informed about the last minima.
                     break
 
-                n_s, n_r = update_local_H_after_receiving(local_H, n, n_s, user_specs, Work, calc_in, fields_to_pass)
+                n_s, n_r = update_local_H_after_receiving(
+                    local_H, n, n_s, user_specs, Work, calc_in, fields_to_pass, dist_index
+                )
 
                 for row in calc_in:
                     if sim_id_to_child_inds.get(row["sim_id"]):
@@ -264,7 +271,7 @@ def aposmm(H, persis_info, gen_specs, libE_info):
             pass
 
 
-def update_local_H_after_receiving(local_H, n, n_s, user_specs, Work, calc_in, fields_to_pass):
+def update_local_H_after_receiving(local_H, n, n_s, user_specs, Work, calc_in, fields_to_pass, dist_index=None):
     for name in ["f", "x_on_cube", "grad", "fvec"]:
         if name in fields_to_pass:
             assert name in calc_in.dtype.names, (
@@ -279,7 +286,7 @@ def update_local_H_after_receiving(local_H, n, n_s, user_specs, Work, calc_in, f
     n_r = len(Work["libE_info"]["H_rows"])
 
     # dist -> distance
-    update_history_dist(local_H, n)
+    update_history_dist(local_H, n, dist_index)
 
     return n_s, n_r
 
@@ -326,70 +333,32 @@ def initialize_dists_and_inds(local_H, num_pts):
     local_H["ind_of_better_s"][-num_pts:] = -1
 
 
-def update_history_dist(H, n):
+def update_history_dist(H, n, dist_index=None):
     """
     Updates distances/indices after new points that have been evaluated.
 
+    The nearest better points are found with ``dist_index``, a
+    ``BetterPointIndex`` kept across calls. If it is not given, an index over
+    the points already known to APOSMM is built for this call.
+
     .. seealso::
         `start_persistent_local_opt_gens.py <https://github.com/Libensemble/libensemble/blob/develop/libensemble/alloc_funcs/start_persistent_local_opt_gens.py>`_
     """
 
-    new_inds = np.where(~H["known_to_aposmm"])[0]
+    if dist_index is None:
+        dist_index = BetterPointIndex()
 
     p = np.logical_and.reduce((H["sim_ended"], ~np.isnan(H["f"])))
+    new_inds = np.where(~H["known_to_aposmm"] & p)[0]
 
-    for new_ind in new_inds:
-        # Loop over new returned points and update their distances
-        if p[new_ind]:
-            H["known_to_aposmm"][new_ind] = True
-
-            # Compute distance to boundary
-            H["dist_to_unit_bounds"][new_ind] = min(
-                min(np.ones(n) - H["x_on_cube"][new_ind]), min(H["x_on_cube"][new_ind] - np.zeros(n))
-            )
-
-            dist_to_all = cdist(H["x_on_cube"][[new_ind]], H["x_on_cube"][p], "euclidean").flatten()
-            new_better_than = H["f"][new_ind] < H["f"][p]
+    if len(new_inds):
+        # Compute distance to boundary
+        X = H["x_on_cube"][new_inds]
+        H["dist_to_unit_bounds"][new_inds] = np.minimum(1 - X, X).min(axis=1)
 
-            # Update any other points if new_ind is closer and better
-            if H["local_pt"][new_ind]:
-                inds_of_p = np.logical_and(dist_to_all < H["dist_to_better_l"][p], new_better_than)
-                updates = np.where(p)[0][inds_of_p]
-                H["dist_to_better_l"][updates] = dist_to_all[inds_of_p]
-                H["ind_of_better_l"][updates] = new_ind
-            else:
-                inds_of_p = np.logical_and(dist_to_all < H["dist_to_better_s"][p], new_better_than)
-                updates = np.where(p)[0][inds_of_p]
-                H["dist_to_better_s"][updates] = dist_to_all[inds_of_p]
-                H["ind_of_better_s"][updates] = new_ind
-
-            # Since we allow equality when deciding better_than_new_l and
-            # better_than_new_s, we have to prevent new_ind from being its own
-            # better point.
-            better_than_new_l = np.logical_and.reduce((~new_better_than, H["local_pt"][p], H["sim_id"][p] != new_ind))
-            better_than_new_s = np.logical_and.reduce((~new_better_than, ~H["local_pt"][p], H["sim_id"][p] != new_ind))
-
-            # Who is closest to ind and better
-            if np.any(better_than_new_l):
-                ind = dist_to_all[better_than_new_l].argmin()
-                H["ind_of_better_l"][new_ind] = H["sim_id"][p][np.nonzero(better_than_new_l)[0][ind]]
-                H["dist_to_better_l"][new_ind] = dist_to_all[better_than_new_l][ind]
-
-            if np.any(better_than_new_s):
-                ind = dist_to_all[better_than_new_s].argmin()
-                H["ind_of_better_s"][new_ind] = H["sim_id"][p][np.nonzero(better_than_new_s)[0][ind]]
-                H["dist_to_better_s"][new_ind] = dist_to_all[better_than_new_s][ind]
-
-            # if not ignore_L8:
-            #     r_k = calc_rk(len(H['x_on_cube'][0]), n_s, rk_const, lhs_divisions)
-            #     H['worse_within_rk'][new_ind][p] = np.logical_and.reduce((H['f'][new_ind] <= H['f'][p], dist_to_all <= r_k))
-
-            #     # Add trues if new point is 'worse_within_rk'
-            #     inds_to_change = np.logical_and.reduce((H['dist_to_all'][p, new_ind] <= r_k, H['f'][new_ind] >= H['f'][p], H['sim_id'][p] != new_ind))
-            #     H['worse_within_rk'][inds_to_change, new_ind] = True
-
-            #     if not H['local_pt'][new_ind]:
-            #         H['worse_within_rk'][H['dist_to_all'] > r_k] = False
+        # Update the new points' better points and any other points they are closer and better than
+        dist_index.update(H, new_inds)
+        H["known_to_aposmm"][new_inds] = True
 
     if np.any(~H["local_pt"]) and not np.any(np.isinf(H["dist_to_better_s"][~H["local_pt"]])):
         # Our best sample point was not identified because the min was not unique.
@@ -513,27 +482,21 @@ def decide_where_to_start_localopt(H, n, n_s, rk_const, ld=0, mu=0, nu=0):
 
     r_k = calc_rk(n, n_s, rk_const, ld)
 
-    if nu > 0:
-        test_2_through_5 = np.logical_and.reduce(
-            (
-                H["sim_ended"] == 1,  # have a returned function value
-                H["dist_to_better_s"] > r_k,  # no better sample point within r_k (L2)
-                ~H["started_run"],  # have not started a run (L3)
-                H["dist_to_unit_bounds"] >= mu,  # have all components at least mu away from bounds (L4)
-                np.all(
-                    cdist(H["x_on_cube"], H["x_on_cube"][H["local_min"]]) >= nu, axis=1
-                ),  # distance nu away from known local mins (L5)
-            )
+    test_2_through_5 = np.logical_and.reduce(
+        (
+            H["sim_ended"] == 1,  # have a returned function value
+            H["dist_to_better_s"] > r_k,  # no better sample point within r_k (L2)
+            ~H["started_run"],  # have not started a run (L3)
+            H["dist_to_unit_bounds"] >= mu,  # have all components at least mu away from bounds (L4)
         )
-    else:
-        test_2_through_5 = np.logical_and.reduce(
-            (
-                H["sim_ended"] == 1,  # have a returned function value
-                H["dist_to_better_s"] > r_k,  # no better sample point within r_k (L2)
-                ~H["started_run"],  # have not started a run (L3)
-                H["dist_to_unit_bounds"] >= mu,  # have all components at least mu away from bounds (L4)
-            )
-        )  # (L5) is always true when nu = 0
+    )
+
+    if nu > 0 and np.any(H["local_min"]) and np.any(test_2_through_5):
+        # Distance nu away from known local mins (L5), only checked for points satisfying the rest.
+        # (L5) is always true when nu = 0
+        cands = np.nonzero(test_2_through_5)[0]
+        dist_to_min, _ = cKDTree(H["x_on_cube"][H["local_min"]]).query(H["x_on_cube"][cands])
+        test_2_through_5[cands[dist_to_min < nu]] = False
 
     # assert gamma_quantile == 1, "This is not supported yet. What is the best way to decide this when there are NaNs present in H['f']?"
     # if gamma_quantile < 1:
@@ -604,7 +567,7 @@ def extract_rk_c(user_specs, n):
     return user_specs.get("rk_const", ((gamma(1 + (n / 2.0)) * 5.0) ** (1.0 / n)) / sqrt(pi))
 
 
-def initialize_APOSMM(H, user_specs, libE_info):
+def initialize_APOSMM(H, user_specs, libE_info, dist_index=None):
     """
     Computes common values every time that APOSMM is reinvoked
 
@@ -677,7 +640,7 @@ def initialize_APOSMM(H, user_specs, libE_info):
         initialize_dists_and_inds(local_H, len(H))
 
         # Update after receiving initial points
-        update_history_dist(local_H, n)
+        update_history_dist(local_H, n, dist_index)
 
     n_s = np.sum(~local_H["local_pt"])
 
@@ -30,7 +30,8 @@ def persistent_uniform(_, persis_info, gen_specs, libE_info):
     ``gen_specs["initial_batch_size"]`` uniformly sampled points the first time it
     is called. Afterwards, it returns the number of points given. This can be
     used in either a batch or asynchronous mode by adjusting the allocation
-    function.
+    function. The random stream is saved as the generator's state, so a
+    restarted workflow continues the sequence of points.
 
     .. seealso::
         `test_persistent_uniform_sampling.py <https://github.com/Libensemble/libensemble/blob/develop/libensemble/tests/functionality_tests/test_persistent_uniform_sampling.py>`_
@@ -39,12 +40,16 @@ def persistent_uniform(_, persis_info, gen_specs, libE_info):
 
     b, n, lb, ub = _get_user_params(gen_specs["user"])
     ps = PersistentSupport(libE_info, EVAL_GEN_TAG)
+    state = ps.load_state()
+    if state is not None:
+        persis_info["rand_stream"] = state["rand_stream"]
 
     # Send batches until manager sends stop tag
     tag = None
     while tag not in [STOP_TAG, PERSIS_STOP]:
         H_o = np.zeros(b, dtype=gen_specs["out"])
         H_o["x"] = persis_info["rand_stream"].uniform(lb, ub, (b, n))
+        ps.save_state({"rand_stream": persis_info["rand_stream"]})
         tag, Work, calc_in = ps.send_recv(H_o)
         if hasattr(calc_in, "__len__"):
             b = len(calc_in)
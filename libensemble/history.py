@@ -1,10 +1,16 @@
+import heapq
 import logging
 import time
+from typing import Callable
 
 import numpy as np
 import numpy.typing as npt
 
+from libensemble.message_numbers import UNSET_TAG, WORKER_DONE
+from libensemble.tools.eval_cache import EvalCache
 from libensemble.tools.fields_keys import libE_fields, protected_libE_fields
+from libensemble.tools.runtime_estimator import RuntimeEstimator
+from libensemble.utils.shared_array import SharedArray
 
 logger = logging.getLogger(__name__)
 
@@ -12,8 +18,87 @@ logger = logging.getLogger(__name__)
 # logger.setLevel(logging.DEBUG)
 
 
-class History:
+class PriorityQueue:
+    """Unstarted points of a History ordered by priority (highest first, then lowest sim_id)
+
+    Rows are pushed when added, or given a new priority, by a gen. Entries for
+    rows that have since been started, cancelled or re-prioritized, or that were
+    given out earlier in the alloc call, are dropped when they reach the top.
+    So if points_avail holds the rows not yet given (e.g., the unstarted rows),
+    returning the top k points costs O(k log N). Other higher priority rows that
+    points_avail excludes are passed over (and kept) on each call. Given rows that
+    are not started are returned to the queue by update(), which the manager calls
+    before each alloc call.
+    """
+
+    def __init__(self, hist: "History") -> None:
+        self.hist = hist
+        self.heap = []
+        self.dropped = []  # Entries of given rows dropped since the last update
+
+    def push(self, rows: npt.NDArray) -> None:
+        """Adds rows (with their current priority) to the queue"""
+        entries = list(zip((-self.hist.H["priority"][rows]).tolist(), np.asarray(rows).tolist()))
+        self._push(entries)
+
+    def _push(self, entries: list) -> None:
+        if len(entries) > len(self.heap):
+            self.heap.extend(entries)
+            heapq.heapify(self.heap)
+        else:
+            for entry in entries:
+                heapq.heappush(self.heap, entry)
+
+    def update(self) -> None:
+        """Returns given rows that have not been started to the queue"""
+        H = self.hist.H
+        self._push([entry for entry in self.dropped if not H["sim_started"][entry[1]]])
+        self.dropped = []
+
+    def top(self, points_avail: npt.NDArray, num_points: int = 1, batch: bool = False, given: set = ()) -> npt.NDArray:
+        """Returns up to num_points rows in points_avail, highest priority first
+
+        points_avail is a boolean array over the rows of H, or a sorted array of
+        row indices (e.g., the unstarted rows, less those given out since).
+        If batch, returns all such rows with the highest priority instead.
+        Rows in given (those given out in this alloc call) are dropped until update().
+        """
+        H = self.hist.H
+        if points_avail.dtype == bool:
+            available = points_avail.__getitem__
+        else:
 
+            def available(row):
+                i = np.searchsorted(points_avail, row)
+                return i < len(points_avail) and points_avail[i] == row
+
+        taken, kept, seen = [], [], set()
+        while self.heap and (batch or len(taken) < num_points):
+            entry = heapq.heappop(self.heap)
+            neg_priority, row = entry
+            if (
+                row in seen
+                or H["sim_started"][row]
+                or H["cancel_requested"][row]
+                or -H["priority"][row] != neg_priority
+            ):
+                continue  # Duplicate or stale entry
+            if row in given:
+                self.dropped.append(entry)
+                continue
+            if batch and taken and neg_priority != taken[0][0]:
+                kept.append(entry)
+                break
+            seen.add(row)
+            kept.append(entry)
+            if available(row):
+                taken.append(entry)
+
+        self._push(kept)
+        return np.array([row for _, row in taken], dtype=int)
+
+
+class History:
     """The History class provides methods for managing the history array.
 
     **Object Attributes:**
@@ -36,18 +121,34 @@ class History:
     :ivar int sim_ended_count:
         Number of points evaluated  (according to H)
 
+    :ivar numpy.ndarray H_buffer:
+        Backing storage for H. H is a view of the leading rows of this array,
+        which may have spare capacity for growth.
+
+    :ivar SharedArray shared:
+        When using shared memory, the block currently backing H_buffer (else None)
+
     Note that index, sim_started_count and sim_ended_count reflect the total number of points
     in H and therefore include those prepended to H in addition to the current run.
 
     """
 
     def __init__(
-        self, alloc_specs: dict, sim_specs: dict, gen_specs: dict, exit_criteria: dict, H0: npt.NDArray
+        self,
+        alloc_specs: dict,
+        sim_specs: dict,
+        gen_specs: dict,
+        exit_criteria: dict,
+        H0: npt.NDArray,
+        use_shared_memory: bool = False,
     ) -> None:
         """
         Forms the numpy structured array that records everything from the
         libEnsemble run
 
+        If use_shared_memory is set, H is kept in a named shared memory block
+        that local workers can attach to (see checkout_shared).
+
         """
         L = exit_criteria.get("sim_max", 100)
 
@@ -55,7 +156,11 @@ class History:
         specs = [sim_specs, gen_specs, alloc_specs]
         specs_dtype_list = list(set(libE_fields + sum([k.get("out", []) for k in specs if k], [])))
 
-        if len(H0):
+        if len(H0) and History._has_spec_fields(H0.dtype, specs_dtype_list):
+            # H0 already has every field (e.g., it is a checkpoint of a previous run), so copy whole rows
+            H = np.zeros(L + len(H0), dtype=H0.dtype)
+            H[: len(H0)] = H0
+        elif len(H0):
             # a whole lot of work to parse numpy dtypes to python types and 2- or 3-tuples
             # - dtypes aren't iterable, but you can index into them
             # - must split out actual numpy type if subdtype refers to sub-array
@@ -99,14 +204,18 @@ class History:
         else:
             H = np.zeros(L + len(H0), dtype=specs_dtype_list)
 
-        H["sim_id"][-L:] = -1
-        H["sim_started_time"][-L:] = np.inf
-        H["gen_informed_time"][-L:] = np.inf
+        History._init_new_rows(H[len(H) - L :])
 
-        if "resource_sets" in H.dtype.names:
-            H["resource_sets"][-L:] = 1
+        self.shared = None
+        self._retired_shared = {}  # Replaced blocks still referenced by outstanding work
+        self._shared_checkouts = {}
+        if use_shared_memory:
+            self.shared = SharedArray(len(H), H.dtype)
+            self.shared.array[:] = H
+            H = self.shared.array
 
         self.H = H
+        self.H_buffer = H
         self.using_H0 = len(H0) > 0
         self.index = len(H0)
         self.grow_count = 0
@@ -123,6 +232,23 @@ class History:
         self.last_started = -1
         self.last_ended = -1
 
+        # Candidate rows for alloc_f inputs. Appended to on updates, filtered and compacted on read
+        H_in = H[: self.index]
+        self._unstarted = [np.nonzero(~H_in["sim_started"])[0]]
+        self._running = [np.nonzero(H_in["sim_started"] & ~H_in["sim_ended"])[0]]
+        self._ended_not_informed = [np.nonzero(H_in["sim_ended"] & ~H_in["gen_informed"])[0]]
+
+        # Rows updated since the last call to changed_rows (None until it is first called)
+        self._changed = None
+
+        self.runtime_estimator = None
+        self.eval_cache = None
+
+        self.priority_queue = None
+        if "priority" in H.dtype.names:
+            self.priority_queue = PriorityQueue(self)
+            self.priority_queue.push(self._unstarted[0])
+
     def update_history_f(self, D: dict, safe_mode: bool, kill_canceled_sims: bool = False) -> None:
         """
         Updates the history after points have been evaluated
@@ -132,6 +258,9 @@ class History:
         returned_H = D["calc_out"]
         fields = returned_H.dtype.names if returned_H is not None else []
 
+        if "H_shm" in D["libE_info"]:
+            self._update_from_shared(D["libE_info"], new_inds)
+
         for j, ind in enumerate(new_inds):
             for field in fields:
                 if safe_mode:
@@ -154,6 +283,17 @@ class History:
             self.H["sim_ended_time"][ind] = time.time()
             self.sim_ended_count += 1
 
+        self._ended_not_informed.append(np.atleast_1d(new_inds))
+        self.mark_changed(new_inds)
+        if D.get("calc_status", UNSET_TAG) in (UNSET_TAG, WORKER_DONE):
+            # Only sims that ran to completion give runtimes and results to keep
+            new_inds = np.atleast_1d(new_inds)
+            completed = new_inds[~self.H["cancel_requested"][new_inds]]
+            if self.runtime_estimator is not None:
+                self.runtime_estimator.update(self.H, completed)
+            if self.eval_cache is not None:
+                self.eval_cache.store(self.H, completed)
+
         if kill_canceled_sims:
             for j in range(self.last_ended + 1, np.max(new_inds) + 1):
                 if self.H["sim_ended"][j]:
@@ -161,6 +301,43 @@ class History:
                 else:
                     break
 
+    def set_runtime_estimator(self, estimator: RuntimeEstimator) -> None:
+        """
+        Sets an estimator of sim runtimes, updated as points are evaluated, and
+        adds the points already evaluated (e.g., in H0) as observations
+        """
+        self.runtime_estimator = estimator
+        H = self.H[: self.index]
+        rows = np.nonzero(H["sim_ended"] & ~H["cancel_requested"] & np.isfinite(H["sim_started_time"]))[0]
+        if len(rows):
+            estimator.update(self.H, rows, H["sim_ended_time"][rows] - H["sim_started_time"][rows])
+
+    def set_eval_cache(self, cache: EvalCache) -> None:
+        """
+        Sets a cache of sim evaluations, which is checked for the points returned by gens
+        and given the results of successful sims
+        """
+        self.eval_cache = cache
+
+    def _fill_from_eval_cache(self, rows: npt.NDArray, t: float) -> None:
+        """Marks new rows found in the evaluation cache as evaluated, with the cached sim outputs"""
+        rows = rows[~self.H["sim_started"][rows] & ~self.H["cancel_requested"][rows]]
+        if not len(rows):
+            return
+        hit_rows, out = self.eval_cache.lookup(self.H, rows)
+        if not len(hit_rows):
+            return
+        for field in out.dtype.names:
+            self.H[field][hit_rows] = out[field]
+        self.H["sim_started"][hit_rows] = True
+        self.H["sim_ended"][hit_rows] = True
+        self.H["sim_started_time"][hit_rows] = t
+        self.H["sim_ended_time"][hit_rows] = t
+        self.H["sim_worker"][hit_rows] = 0  # Not evaluated by a worker
+        self.sim_started_count += len(hit_rows)
+        self.sim_ended_count += len(hit_rows)
+        self._ended_not_informed.append(hit_rows)
+
     def update_history_x_out(self, q_inds: npt.NDArray, sim_worker: int, kill_canceled_sims: bool = False) -> None:
         """
         Updates the history (in place) when new points have been given out to be evaluated
@@ -181,6 +358,8 @@ class History:
         self.H["sim_worker"][q_inds] = sim_worker
 
         self.sim_started_count += len(q_inds)
+        self._running.append(q_inds)
+        self.mark_changed(q_inds)
         if kill_canceled_sims:
             self.last_started = np.max(q_inds)
 
@@ -205,6 +384,10 @@ class History:
 
             self.H["gen_informed_time"][q_inds] = t
             self.gen_informed_count += len(q_inds)
+            self.mark_changed(q_inds)
+
+            if len(self._ended_not_informed) > 1:
+                self.ended_not_informed_rows()  # Compact now rather than on the next alloc call
 
     def update_history_x_in(self, gen_worker: int, D: npt.NDArray, safe_mode: bool, gen_started_time: int) -> None:
         """
@@ -255,29 +438,156 @@ class History:
                 assert field not in protected_libE_fields, "The field '" + field + "' is protected"
             self.H[field][update_inds] = D[field]
 
+        self._unstarted.append(update_inds[update_inds >= self.index])
+        if self.priority_queue is not None:
+            self.priority_queue.push(
+                update_inds if "priority" in D.dtype.names else update_inds[update_inds >= self.index]
+            )
+
         first_gen_inds = update_inds[self.H["gen_ended_time"][update_inds] == 0]
         self.H["gen_started_time"][first_gen_inds] = gen_started_time
         self.H["gen_ended_time"][first_gen_inds] = t
         self.H["gen_worker"][first_gen_inds] = gen_worker
+        if self.eval_cache is not None:
+            self._fill_from_eval_cache(update_inds[update_inds >= self.index], t)
         self.index += num_new
+        self.mark_changed(update_inds)
+
+    def mark_changed(self, rows: npt.NDArray) -> None:
+        """Records that rows of H have been updated (if changes are being tracked)"""
+        if self._changed is not None:
+            self._changed.append(np.atleast_1d(rows))
+
+    def changed_rows(self) -> npt.NDArray:
+        """Returns sorted indices of rows updated since the last call, and starts tracking changes on the first call
+
+        Updates made through History methods (or reported with mark_changed) are tracked.
+        """
+        if not self._changed:
+            self._changed = []
+            return np.zeros(0, dtype=int)
+        rows = np.unique(np.concatenate(self._changed)).astype(int, copy=False)
+        self._changed = []
+        return rows
+
+    def checkout_shared(self) -> (str, int):
+        """Returns the name and length of the shared block backing H, for a worker to attach to
+
+        The block is kept alive (even if H is grown into a new block) until the
+        matching result is passed to update_history_f.
+        """
+        name = self.shared.name
+        self._shared_checkouts[name] = self._shared_checkouts.get(name, 0) + 1
+        return name, self.shared.length
+
+    def _update_from_shared(self, libE_info: dict, rows: npt.NDArray) -> None:
+        """Handles a result for work that was given a shared block
+
+        Fields a worker wrote in place to a block that has since been replaced
+        are copied into H. Retired blocks are removed once no work refers to them.
+        """
+        name = libE_info["H_shm"][0]
+        if name in self._retired_shared:
+            for field in libE_info.get("H_shm_fields", []):
+                self.H[field][rows] = self._retired_shared[name].array[field][rows]
+
+        self._shared_checkouts[name] -= 1
+        if not self._shared_checkouts[name]:
+            del self._shared_checkouts[name]
+            if name in self._retired_shared:
+                self._retired_shared.pop(name).unlink()
+
+    def release_shared_memory(self) -> None:
+        """Moves H into private memory and removes all shared blocks"""
+        if self.shared is None:
+            return
+        self.H_buffer = self.H_buffer.copy()
+        self.H = self.H_buffer[: len(self.H)]
+        for shared in [self.shared, *self._retired_shared.values()]:
+            shared.unlink()
+        self.shared = None
+        self._retired_shared = {}
+        self._shared_checkouts = {}
+
+    @staticmethod
+    def _compact(candidates: list, keep: Callable) -> npt.NDArray:
+        """Replaces a list of candidate row arrays with the single (sorted) array of rows to keep"""
+        if len(candidates) > 1:
+            rows = np.unique(np.concatenate(candidates)).astype(int, copy=False)
+        else:
+            rows = candidates[0]
+        rows = rows[keep(rows)]
+        candidates[:] = [rows]
+        return rows
+
+    def unstarted_rows(self) -> npt.NDArray:
+        """Returns sorted indices of rows that have not been given to a sim and are not cancelled
+
+        Cost scales with the number of rows generated but not yet started, not the length of H.
+        """
+        rows = History._compact(self._unstarted, lambda rows: ~self.H["sim_started"][rows])
+        return rows[~self.H["cancel_requested"][rows]]
+
+    def running_rows(self) -> npt.NDArray:
+        """Returns sorted indices of rows that have been given to a sim but not returned"""
+        return History._compact(self._running, lambda rows: ~self.H["sim_ended"][rows])
+
+    def ended_not_informed_rows(self) -> npt.NDArray:
+        """Returns sorted indices of rows whose sim has ended, but not yet been given back to a gen"""
+        return History._compact(self._ended_not_informed, lambda rows: ~self.H["gen_informed"][rows])
+
+    @staticmethod
+    def _has_spec_fields(dtype: np.dtype, specs_dtype_list: list) -> bool:
+        """Whether dtype has every field in specs_dtype_list, with the same type"""
+        if dtype.hasobject:
+            return False
+        return all(f[0] in dtype.names and dtype[f[0]] == np.dtype([f])[0] for f in specs_dtype_list)
+
+    @staticmethod
+    def _init_new_rows(H_new: npt.NDArray) -> None:
+        """Sets default values (in place) for rows not yet filled in by a gen"""
+        H_new["sim_id"] = -1
+        H_new["sim_started_time"] = np.inf
+        H_new["gen_informed_time"] = np.inf
+        if "resource_sets" in H_new.dtype.names:
+            H_new["resource_sets"] = 1
 
     def grow_H(self, k: int) -> None:
         """
         Adds k rows to H in response to gen_f producing more points than
         available rows in H.
 
+        H is a view of the leading rows of a larger backing buffer. The buffer
+        capacity is at least doubled whenever it is exhausted, so the existing
+        rows are only copied a logarithmic number of times over a run.
+
         Parameters
         ----------
         k: int
             Number of rows to add to H
         """
-        H_1 = np.zeros(k, dtype=self.H.dtype)
-        H_1["sim_id"] = -1
-        H_1["sim_started_time"] = np.inf
-        H_1["gen_informed_time"] = np.inf
-        if "resource_sets" in H_1.dtype.names:
-            H_1["resource_sets"] = 1
-        self.H = np.append(self.H, H_1)
+        num_rows = len(self.H) + k
+        if num_rows > len(self.H_buffer):
+            capacity = max(num_rows, 2 * len(self.H_buffer))
+            if self.shared is not None:
+                shared = SharedArray(capacity, self.H.dtype)
+                H_buffer = shared.array
+            else:
+                H_buffer = np.zeros(capacity, dtype=self.H.dtype)
+            H_buffer[: len(self.H)] = self.H
+            History._init_new_rows(H_buffer[len(self.H) :])
+            self.H_buffer = H_buffer
+            if self.shared is not None:
+                self._retire_shared()
+                self.shared = shared
+        self.H = self.H_buffer[:num_rows]
+
+    def _retire_shared(self) -> None:
+        """Removes the current shared block, or keeps it until outstanding work using it returns"""
+        if self.shared.name in self._shared_checkouts:
+            self._retired_shared[self.shared.name] = self.shared
+        else:
+            self.shared.unlink()
 
     # Could be arguments here to return different truncations eg. all done, given etc...
     def trim_H(self) -> npt.NDArray:
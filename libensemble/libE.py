@@ -130,11 +130,12 @@ from libensemble.resources.platforms import get_platform
 from libensemble.resources.resources import Resources
 from libensemble.specs import AllocSpecs, ExitCriteria, GenSpecs, LibeSpecs, SimSpecs, _EnsembleSpecs
 from libensemble.tools.alloc_support import AllocSupport
+from libensemble.tools.history_checkpoint import load_restart
 from libensemble.tools.tools import _USER_SIM_ID_WARNING
 from libensemble.utils import launcher
 from libensemble.utils.timer import Timer
 from libensemble.version import __version__
-from libensemble.worker import worker_main
+from libensemble.worker import worker_main, worker_team_main
 
 logger = logging.getLogger(__name__)
 # To change logging level for just this module
@@ -379,6 +380,8 @@ def libE_mpi_manager(mpi_comm, sim_specs, gen_specs, exit_criteria, persis_info,
     """Manager routine runs on rank 0."""
     from libensemble.comms.mpi import MainMPIComm
 
+    persis_info, H0 = _restart_inputs(libE_specs, persis_info, H0)
+
     if not libE_specs["disable_log_files"]:
         exit_logger = manager_logging_config(specs=libE_specs)
     else:
@@ -441,10 +444,28 @@ def start_proc_team(nworkers, sim_specs, gen_specs, libE_specs, log_comm=True):
         QCommLocal = QCommThread
         log_comm = False  # Prevents infinite loop of logging.
 
-    wcomms = [
-        QCommLocal(worker_main, nworkers, sim_specs, gen_specs, libE_specs, w, log_comm, resources, executor)
-        for w in range(1, nworkers + 1)
-    ]
+    team_size = libE_specs.get("workers_per_process", 1)
+    if QCommLocal is QCommProcess and team_size > 1:
+        wcomms = []
+        for first in range(1, nworkers + 1, team_size):
+            workerIDs = list(range(first, min(first + team_size, nworkers + 1)))
+            wcomms += QCommProcess.group(
+                len(workerIDs),
+                worker_team_main,
+                nworkers,
+                sim_specs,
+                gen_specs,
+                libE_specs,
+                workerIDs,
+                log_comm,
+                resources,
+                executor,
+            )
+    else:
+        wcomms = [
+            QCommLocal(worker_main, nworkers, sim_specs, gen_specs, libE_specs, w, log_comm, resources, executor)
+            for w in range(1, nworkers + 1)
+        ]
 
     for wcomm in wcomms:
         wcomm.run()
@@ -462,6 +483,7 @@ def kill_proc_team(wcomms, timeout):
 
 def libE_local(sim_specs, gen_specs, exit_criteria, persis_info, alloc_specs, libE_specs, H0):
     """Main routine for thread/process launch of libE."""
+    persis_info, H0 = _restart_inputs(libE_specs, persis_info, H0)
 
     resources = Resources.resources
     if resources is not None:
@@ -473,7 +495,7 @@ def libE_local(sim_specs, gen_specs, exit_criteria, persis_info, alloc_specs, li
         exctr.set_resources(resources)
         exctr.serial_setup()
 
-    hist = History(alloc_specs, sim_specs, gen_specs, exit_criteria, H0)
+    hist = History(alloc_specs, sim_specs, gen_specs, exit_criteria, H0, use_shared_memory=libE_specs["use_shared_H"])
 
     # Launch worker team and set up logger
     wcomms = start_proc_team(libE_specs["nworkers"], sim_specs, gen_specs, libE_specs)
@@ -491,6 +513,7 @@ def libE_local(sim_specs, gen_specs, exit_criteria, persis_info, alloc_specs, li
     def cleanup():
         """Handler to clean up comms team."""
         kill_proc_team(wcomms, timeout=libE_specs["worker_timeout"])
+        hist.release_shared_memory()
         if exit_logger is not None:
             exit_logger()
 
@@ -569,6 +592,7 @@ def libE_tcp_start_team(manager, nworkers, workers, ip, port, authkey, launchf):
 
 def libE_tcp_mgr(sim_specs, gen_specs, exit_criteria, persis_info, alloc_specs, libE_specs, H0):
     """Main routine for TCP multiprocessing launch of libE at manager."""
+    persis_info, H0 = _restart_inputs(libE_specs, persis_info, H0)
     hist = History(alloc_specs, sim_specs, gen_specs, exit_criteria, H0)
 
     # Set up a worker launcher
@@ -628,6 +652,15 @@ def libE_tcp_worker(sim_specs, gen_specs, libE_specs):
 # ==================== Additional Internal Functions ===========================
 
 
+def _restart_inputs(libE_specs, persis_info, H0):
+    """Replaces H0 and persis_info with those checkpointed when restarting"""
+    if not libE_specs.get("restart_from"):
+        return persis_info, H0
+    assert not len(H0), "H0 cannot be given when restarting from a checkpoint"
+    H0, persis_info = load_restart(libE_specs["restart_from"], persis_info)
+    return persis_info, H0
+
+
 def _dump_on_abort(hist, persis_info, save_H=True, path=Path.cwd()):
     """Dump history and persis_info on abort"""
     logger.error("Manager exception raised .. aborting ensemble:")
@@ -18,7 +18,8 @@ import numpy as np
 import numpy.typing as npt
 from numpy.lib.recfunctions import repack_fields
 
-from libensemble.comms.comms import CommFinishedException
+from libensemble.comms.comms import CommFinishedException, wait_any
+from libensemble.comms.logs import ManagerLogListener
 from libensemble.message_numbers import (
     EVAL_GEN_TAG,
     EVAL_SIM_TAG,
@@ -32,8 +33,14 @@ from libensemble.message_numbers import (
     calc_type_strings,
 )
 from libensemble.resources.resources import Resources
+from libensemble.resources.scheduler import ResourceScheduler
+from libensemble.tools.calc_stats import CalcStatsWriter
+from libensemble.tools.eval_cache import EvalCache
 from libensemble.tools.fields_keys import protected_libE_fields
+from libensemble.tools.history_checkpoint import HistoryCheckpoint, gen_state_file, load_checkpoint_offsets
+from libensemble.tools.runtime_estimator import RuntimeEstimator
 from libensemble.tools.tools import _PERSIS_RETURN_WARNING, _USER_CALC_DIR_WARNING
+from libensemble.utils.metrics import JSONLinesSink, ManagerMetrics
 from libensemble.utils.misc import extract_H_ranges
 from libensemble.utils.output_directory import EnsembleDirectory
 from libensemble.utils.timer import Timer
@@ -116,6 +123,8 @@ def manager_main(
         EVAL_SIM_TAG: repack_fields(hist.H[sim_specs["in"]]).dtype,
         EVAL_GEN_TAG: repack_fields(hist.H[gen_specs["in"]]).dtype,
     }
+    if hist.shared is not None:
+        dtypes["H"] = hist.H.dtype
 
     for wcomm in wcomms:
         wcomm.send(0, dtypes)
@@ -166,6 +175,12 @@ class Manager:
         ("zero_resource_worker", bool),
     ]
 
+    # Max seconds to wait for worker messages when there is nothing else to do
+    recv_wait_timeout = 0.1
+
+    # Weight of the newest sample in the running estimates of sim time and manager turnaround
+    timing_ema_weight = 0.2
+
     def __init__(
         self,
         hist: npt.NDArray,
@@ -192,6 +207,31 @@ class Manager:
         self.wcomms = wcomms
         self.WorkerExc = False
         self.persis_pending = []
+        self.packed_dtypes = {}
+        self.sim_time_per_point = None
+        self.manager_turnaround = None
+        self.sim_recv_times = {}
+        self.H_checkpoint = None
+        self.checkpoint_counts = {}
+        if libE_specs.get("save_H_columnar"):
+            if hist.H.dtype.hasobject:
+                logger.manager_warning("History has object fields, so checkpoints are saved as full .npy files")
+            else:
+                self.H_checkpoint = HistoryCheckpoint(self._checkpoint_path())
+        self.persistent_gens_started = 0
+        self.log_listener = ManagerLogListener()
+        self.metrics = ManagerMetrics(self._metrics_sinks(), libE_specs.get("metrics_interval", 10.0))
+        self.calc_stats = None
+        if libE_specs.get("stats_columnar"):
+            self.calc_stats = CalcStatsWriter(os.path.join(libE_specs["workflow_dir_path"], "libE_stats"))
+        if libE_specs.get("runtime_estimator") is not None:
+            self.hist.set_runtime_estimator(RuntimeEstimator(**libE_specs["runtime_estimator"]))
+        if libE_specs.get("eval_cache") is not None:
+            self.hist.set_eval_cache(EvalCache(sim_specs, **libE_specs["eval_cache"]))
+        if libE_specs.get("restart_from"):
+            # Count exit criteria from the start of the run being restarted
+            for name, offset in load_checkpoint_offsets(libE_specs["restart_from"]).items():
+                setattr(self.hist, name, offset)
 
         dyn_keys = ("resource_sets", "num_procs", "num_gpus")
         dyn_keys_in_H = any(k in self.hist.H.dtype.names for k in dyn_keys)
@@ -218,6 +258,12 @@ class Manager:
                 if wrk["worker_id"] in gresource.zero_resource_workers:
                     wrk["zero_resource_worker"] = True
 
+        # One scheduler for the run, updated with assigned and freed resource sets before each alloc call
+        self.scheduler = None
+        if self.resources is not None and self.resources.resource_manager is not None:
+            self.scheduler = ResourceScheduler(self.resources.resource_manager, self.scheduler_opts)
+            self.scheduler.update()
+
         try:
             temp_EnsembleDirectory.make_copyback()
         except AssertionError as e:  # Ensemble dir exists and isn't empty.
@@ -278,10 +324,34 @@ class Manager:
             date_start = ""
         return date_start
 
-    def _save_every_k(self, fname: str, count: int, k: int, complete: bool) -> None:
+    def _metrics_sinks(self) -> list:
+        """Sinks for manager metrics requested in libE_specs"""
+        sinks = []
+        if self.libE_specs.get("metrics_file"):
+            sinks.append(JSONLinesSink(os.path.join(self.libE_specs["workflow_dir_path"], "libE_metrics.jsonl")))
+        if self.libE_specs.get("metrics_callback"):
+            sinks.append(self.libE_specs["metrics_callback"])
+        return sinks
+
+    def _checkpoint_path(self) -> str:
+        """Directory for columnar checkpoints of History"""
+        return os.path.join(
+            self.libE_specs["workflow_dir_path"],
+            "{}_{}checkpoint".format(self.libE_specs["H_file_prefix"], self._get_date_start_str()),
+        )
+
+    def _save_every_k(self, fname: str, count: int, k: int, complete: bool, persis_info: dict) -> None:
         """Saves history every kth step"""
         if not complete:
             count = k * (count // k)
+
+        if self.H_checkpoint is not None:
+            # Append the rows changed since the last checkpoint
+            if count > 0 and self.checkpoint_counts.get(fname) != count:
+                self.checkpoint_counts[fname] = count
+                self.H_checkpoint.write(self.hist, persis_info=persis_info)
+            return
+
         date_start = self._get_date_start_str()
 
         filename = fname.format(self.libE_specs["H_file_prefix"], date_start, count)
@@ -290,30 +360,36 @@ class Manager:
                 os.remove(old_file)
             np.save(filename, self.hist.trim_H())
 
-    def _save_every_k_sims(self, complete: bool) -> None:
+    def _save_every_k_sims(self, complete: bool, persis_info: dict) -> None:
         """Saves history every kth sim step"""
         self._save_every_k(
             os.path.join(self.libE_specs["workflow_dir_path"], "{}_{}after_sim_{}.npy"),
             self.hist.sim_ended_count,
             self.libE_specs["save_every_k_sims"],
             complete,
+            persis_info,
         )
 
-    def _save_every_k_gens(self, complete: bool) -> None:
+    def _save_every_k_gens(self, complete: bool, persis_info: dict) -> None:
         """Saves history every kth gen step"""
         self._save_every_k(
             os.path.join(self.libE_specs["workflow_dir_path"], "{}_{}after_gen_{}.npy"),
             self.hist.index,
             self.libE_specs["save_every_k_gens"],
             complete,
+            persis_info,
         )
 
-    def _init_every_k_save(self, complete=False) -> None:
+    def _init_every_k_save(self, persis_info: dict, complete=False) -> None:
+        if complete and self.H_checkpoint is not None:
+            # Write all rows, to also capture any changes alloc_f made to H directly
+            self.H_checkpoint.write(self.hist, all_rows=True, persis_info=persis_info)
+            return
         force_final = complete and not self.libE_specs.get("save_every_k_gens")
         if self.libE_specs.get("save_every_k_sims") or force_final:
-            self._save_every_k_sims(complete)
+            self._save_every_k_sims(complete, persis_info)
         if self.libE_specs.get("save_every_k_gens"):
-            self._save_every_k_gens(complete)
+            self._save_every_k_gens(complete, persis_info)
 
     # --- Handle outgoing messages to workers (work orders from alloc)
 
@@ -372,20 +448,70 @@ class Manager:
         if self.resources:
             self._set_resources(Work, w)
 
+        if Work["tag"] == EVAL_GEN_TAG and Work["libE_info"].get("persistent") and not self.W[w - 1]["persis_state"]:
+            self._set_gen_state_files(Work)
+
+        work_rows = Work["libE_info"]["H_rows"]
+        use_shared_H = len(work_rows) and self._can_share_H(Work)
+        if use_shared_H:
+            Work["libE_info"]["H_shm"] = self.hist.checkout_shared()
+
         self.wcomms[w - 1].send(Work["tag"], Work)
+        self.metrics.count("msgs_sent", worker=w)
 
         if Work["tag"] == EVAL_GEN_TAG:
             self.W[w - 1]["gen_started_time"] = time.time()
+        elif w in self.sim_recv_times:
+            # Time from a sim result arriving to this worker's next sim being sent
+            turnaround = time.time() - self.sim_recv_times.pop(w)
+            self.manager_turnaround = Manager._ema(self.manager_turnaround, turnaround)
 
-        work_rows = Work["libE_info"]["H_rows"]
         work_name = calc_type_strings[Work["tag"]]
         logger.debug(f"Manager sending {work_name} work to worker {w}. Rows {extract_H_ranges(Work) or None}")
-        if len(work_rows):
-            new_dtype = [(name, self.hist.H.dtype.fields[name][0]) for name in Work["H_fields"]]
-            H_to_be_sent = np.empty(len(work_rows), dtype=new_dtype)
-            for i, row in enumerate(work_rows):
-                H_to_be_sent[i] = repack_fields(self.hist.H[Work["H_fields"]][row])
+        if len(work_rows) and not use_shared_H:
+            H_to_be_sent = self._gather_rows(Work["H_fields"], work_rows)
             self.wcomms[w - 1].send(0, H_to_be_sent)
+            self.metrics.count("msgs_sent", worker=w)
+            self.metrics.count("bytes_sent", H_to_be_sent.nbytes, worker=w)
+
+    def _set_gen_state_files(self, Work: dict) -> None:
+        """Gives a starting persistent gen the files to save its state to and restore it from"""
+        if self.H_checkpoint is not None:
+            os.makedirs(self.H_checkpoint.path, exist_ok=True)
+            Work["libE_info"]["gen_state_file"] = gen_state_file(self.H_checkpoint.path, self.persistent_gens_started)
+        if self.libE_specs.get("restart_from"):
+            restore_file = gen_state_file(self.libE_specs["restart_from"], self.persistent_gens_started)
+            Work["libE_info"]["gen_restore_file"] = restore_file
+        self.persistent_gens_started += 1
+
+    def _can_share_H(self, Work: dict) -> bool:
+        """Whether a worker may read and write the rows for this work in the shared History
+
+        Only non-persistent sims are served this way. Persistent workers and gens
+        keep receiving copies of their rows.
+        """
+        return (
+            self.hist.shared is not None
+            and Work["tag"] == EVAL_SIM_TAG
+            and not Work["libE_info"].get("persistent", False)
+        )
+
+    def _get_packed_dtype(self, H_fields: list) -> np.dtype:
+        """Returns the packed dtype of the given History fields (cached per field tuple)"""
+        key = tuple(H_fields)
+        packed_dtype = self.packed_dtypes.get(key)
+        if packed_dtype is None:
+            packed_dtype = np.dtype([(name, self.hist.H.dtype.fields[name][0]) for name in key])
+            self.packed_dtypes[key] = packed_dtype
+        return packed_dtype
+
+    def _gather_rows(self, H_fields: list, work_rows: npt.NDArray) -> npt.NDArray:
+        """Copies the given rows and fields of H into a single packed array"""
+        H = self.hist.H
+        H_to_be_sent = np.empty(len(work_rows), dtype=self._get_packed_dtype(H_fields))
+        for name in H_fields:
+            H_to_be_sent[name] = H[name][work_rows]
+        return H_to_be_sent
 
     def _update_state_on_alloc(self, Work: dict, w: int):
         """Updates a workers' active/idle status following an allocation order"""
@@ -400,9 +526,11 @@ class Manager:
 
         work_rows = Work["libE_info"]["H_rows"]
         if Work["tag"] == EVAL_SIM_TAG:
-            self.hist.update_history_x_out(work_rows, w, self.kill_canceled_sims)
+            with self.metrics.timer("update_history_x_out"):
+                self.hist.update_history_x_out(work_rows, w, self.kill_canceled_sims)
         elif Work["tag"] == EVAL_GEN_TAG:
-            self.hist.update_history_to_gen(work_rows)
+            with self.metrics.timer("update_history_to_gen"):
+                self.hist.update_history_to_gen(work_rows)
 
     # --- Handle incoming messages from workers
 
@@ -420,22 +548,22 @@ class Manager:
             calc_status, str
         ), f"Aborting: Unknown calculation status received. Received status: {calc_status}"
 
-    def _receive_from_workers(self, persis_info: dict) -> dict:
-        """Receives calculation output from workers. Loops over all
-        active workers and probes to see if worker is ready to
-        communticate. If any output is received, all other workers are
-        looped back over.
+    def _receive_from_workers(self, persis_info: dict, timeout: float = 0) -> dict:
+        """Receives calculation output from workers. Waits up to ``timeout``
+        seconds for any worker to be ready to communicate, then handles
+        messages from those workers with pending mail. If any output is
+        received, the workers are checked again until no mail remains.
         """
-        time.sleep(0.0001)  # Critical for multiprocessing performance
-        new_stuff = True
-        while new_stuff:
-            new_stuff = False
-            for w in self.W["worker_id"]:
-                if self.wcomms[w - 1].mail_flag():
-                    new_stuff = True
-                    self._handle_msg_from_worker(persis_info, w)
-
-        self._init_every_k_save()
+        with self.metrics.timer("receive_from_workers"):
+            ready = wait_any(self.wcomms, timeout)
+            while ready:
+                self.metrics.gauge("queue_depth", len(ready))
+                for i in ready:
+                    self._handle_msg_from_worker(persis_info, i + 1)
+                ready = wait_any(self.wcomms, 0)
+
+        with self.metrics.timer("save_every_k"):
+            self._init_every_k_save(persis_info)
         return persis_info
 
     def _update_state_on_worker_msg(self, persis_info: dict, D_recv: dict, w: int) -> None:
@@ -452,9 +580,11 @@ class Manager:
             final_data = D_recv.get("calc_out", None)
             if isinstance(final_data, np.ndarray):
                 if calc_status is FINISHED_PERSISTENT_GEN_TAG and self.libE_specs.get("use_persis_return_gen", False):
-                    self.hist.update_history_x_in(w, final_data, self.safe_mode, self.W[w - 1]["gen_started_time"])
+                    with self.metrics.timer("update_history_x_in"):
+                        self.hist.update_history_x_in(w, final_data, self.safe_mode, self.W[w - 1]["gen_started_time"])
                 elif calc_status is FINISHED_PERSISTENT_SIM_TAG and self.libE_specs.get("use_persis_return_sim", False):
-                    self.hist.update_history_f(D_recv, self.safe_mode, self.kill_canceled_sims)
+                    with self.metrics.timer("update_history_f"):
+                        self.hist.update_history_f(D_recv, self.safe_mode, self.kill_canceled_sims)
                 else:
                     logger.info(_PERSIS_RETURN_WARNING)
             self.W[w - 1]["persis_state"] = 0
@@ -467,9 +597,15 @@ class Manager:
             self._freeup_resources(w)
         else:
             if calc_type == EVAL_SIM_TAG:
-                self.hist.update_history_f(D_recv, self.safe_mode, self.kill_canceled_sims)
+                with self.metrics.timer("update_history_f"):
+                    self.hist.update_history_f(D_recv, self.safe_mode, self.kill_canceled_sims)
+                if "persistent" not in D_recv["libE_info"]:
+                    self._update_sim_timing(D_recv["libE_info"]["H_rows"], w)
             if calc_type == EVAL_GEN_TAG:
-                self.hist.update_history_x_in(w, D_recv["calc_out"], self.safe_mode, self.W[w - 1]["gen_started_time"])
+                with self.metrics.timer("update_history_x_in"):
+                    self.hist.update_history_x_in(
+                        w, D_recv["calc_out"], self.safe_mode, self.W[w - 1]["gen_started_time"]
+                    )
                 assert (
                     len(D_recv["calc_out"]) or np.any(self.W["active"]) or self.W[w - 1]["persis_state"]
                 ), "Gen must return work when is is the only thing active and not persistent."
@@ -482,6 +618,22 @@ class Manager:
         if D_recv.get("persis_info"):
             persis_info[w].update(D_recv["persis_info"])
 
+    @staticmethod
+    def _ema(estimate: float, sample: float) -> float:
+        """Updates a running (exponentially weighted) estimate with a new sample"""
+        if estimate is None:
+            return sample
+        return estimate + Manager.timing_ema_weight * (sample - estimate)
+
+    def _update_sim_timing(self, rows: npt.NDArray, w: int) -> None:
+        """Updates the time-per-point estimate on return of a sim work unit"""
+        if not len(rows):
+            return
+        now = time.time()
+        elapsed = now - self.hist.H["sim_started_time"][rows[0]]
+        self.sim_time_per_point = Manager._ema(self.sim_time_per_point, elapsed / len(rows))
+        self.sim_recv_times[w] = now
+
     def _handle_msg_from_worker(self, persis_info: dict, w: int) -> None:
         """Handles a message from worker w"""
         try:
@@ -490,6 +642,7 @@ class Manager:
         except CommFinishedException:
             logger.debug(f"Finalizing message from Worker {w}")
             return
+        self.metrics.count("msgs_recv", worker=w)
         if isinstance(D_recv, WorkerErrMsg):
             self.W[w - 1]["active"] = 0
             logger.debug(f"Manager received exception from worker {w}")
@@ -497,11 +650,16 @@ class Manager:
                 self.WorkerExc = True
                 self._kill_workers()
                 raise WorkerException(f"Received error message from worker {w}", D_recv.msg, D_recv.exc)
-        elif isinstance(D_recv, logging.LogRecord):
-            logger.debug(f"Manager received a log message from worker {w}")
-            logging.getLogger(D_recv.name).handle(D_recv)
+        elif isinstance(D_recv, (logging.LogRecord, list)):
+            # Log records (batched by workers) are emitted by the listener thread
+            self.metrics.count("log_records", len(D_recv) if isinstance(D_recv, list) else 1, worker=w)
+            self.log_listener.enqueue(D_recv)
         else:
             logger.debug(f"Manager received data message from worker {w}")
+            if isinstance(D_recv.get("calc_out"), np.ndarray):
+                self.metrics.count("bytes_recv", D_recv["calc_out"].nbytes, worker=w)
+            if self.calc_stats is not None and "calc_stats" in D_recv:
+                self.calc_stats.add(D_recv["calc_stats"], D_recv["task_stats"])
             self._update_state_on_worker_msg(persis_info, D_recv, w)
 
     def _kill_cancelled_sims(self) -> None:
@@ -526,6 +684,7 @@ class Manager:
                 for w in kill_on_workers:
                     self.wcomms[w - 1].send(STOP_TAG, MAN_SIGNAL_KILL)
                     self.hist.H["kill_sent"][kill_ids] = True
+                self.hist.mark_changed(kill_ids)
 
     # --- Handle termination
 
@@ -552,7 +711,8 @@ class Manager:
                     }
                     self._check_work_order(work, w, force=True)
                     self._send_work_order(work, w)
-                    self.hist.update_history_to_gen(rows_to_send)
+                    with self.metrics.timer("update_history_to_gen"):
+                        self.hist.update_history_to_gen(rows_to_send)
                 else:
                     self.wcomms[w - 1].send(PERSIS_STOP, MAN_SIGNAL_KILL)
                 if not self.W[w - 1]["active"]:
@@ -562,7 +722,7 @@ class Manager:
 
         exit_flag = 0
         while (any(self.W["active"]) or any(self.W["persis_state"])) and exit_flag == 0:
-            persis_info = self._receive_from_workers(persis_info)
+            persis_info = self._receive_from_workers(persis_info, Manager.recv_wait_timeout)
             if self.term_test(logged=False) == 2:
                 # Elapsed Wallclock has expired
                 if not any(self.W["persis_state"]):
@@ -574,16 +734,38 @@ class Manager:
             if self.WorkerExc:
                 exit_flag = 1
 
-        self._init_every_k_save(complete=self.libE_specs["save_H_on_completion"])
+        with self.metrics.timer("save_every_k"):
+            self._init_every_k_save(persis_info, complete=self.libE_specs["save_H_on_completion"])
         self._kill_workers()
+        if self.calc_stats is not None:
+            self.calc_stats.flush()
+        if self.hist.eval_cache is not None:
+            self._gauge_eval_cache()
+            cache = self.hist.eval_cache
+            logger.info(f"Evaluation cache: {cache.hits} hits, {cache.misses} misses, {cache.stored} stored")
+            cache.close()
+        self.metrics.close()
         return persis_info, exit_flag, self.elapsed()
 
+    def _gauge_eval_cache(self) -> None:
+        """Records the hits and misses of the evaluation cache (if any) in the metrics"""
+        cache = self.hist.eval_cache
+        if cache is not None:
+            self.metrics.gauge("eval_cache_hits", cache.hits)
+            self.metrics.gauge("eval_cache_misses", cache.misses)
+
     def _sim_max_given(self) -> bool:
         if "sim_max" in self.exit_criteria:
             return self.hist.sim_started_count >= self.exit_criteria["sim_max"] + self.hist.sim_started_offset
         else:
             return False
 
+    def _sim_max_remaining(self) -> int:
+        if "sim_max" in self.exit_criteria:
+            return self.exit_criteria["sim_max"] + self.hist.sim_started_offset - self.hist.sim_started_count
+        else:
+            return None
+
     def _get_alloc_libE_info(self) -> dict:
         """Selected statistics useful for alloc_f"""
 
@@ -594,12 +776,21 @@ class Manager:
             "gen_informed_count": self.hist.gen_informed_count,
             "manager_kill_canceled_sims": self.kill_canceled_sims,
             "scheduler_opts": self.scheduler_opts,
+            "scheduler": self.scheduler,
             "sim_started_count": self.hist.sim_started_count,
             "sim_ended_count": self.hist.sim_ended_count,
             "sim_max_given": self._sim_max_given(),
             "use_resource_sets": self.use_resource_sets,
             "gen_num_procs": self.gen_num_procs,
             "gen_num_gpus": self.gen_num_gpus,
+            "unstarted_rows": self.hist.unstarted_rows(),
+            "running_rows": self.hist.running_rows(),
+            "ended_not_informed_rows": self.hist.ended_not_informed_rows(),
+            "priority_queue": self.hist.priority_queue,
+            "runtime_estimator": self.hist.runtime_estimator,
+            "sim_max_remaining": self._sim_max_remaining(),
+            "sim_time_per_point": self.sim_time_per_point,
+            "manager_turnaround": self.manager_turnaround,
         }
 
     def _alloc_work(self, H: npt.NDArray, persis_info: dict) -> dict:
@@ -610,6 +801,11 @@ class Manager:
         if self.safe_mode:
             saveH = repack_fields(H[protected_libE_fields], recurse=True)
 
+        if self.scheduler is not None:
+            self.scheduler.update()
+        if self.hist.priority_queue is not None:
+            self.hist.priority_queue.update()
+
         alloc_f = self.alloc_specs["alloc_f"]
         output = alloc_f(
             self.W,
@@ -642,20 +838,32 @@ class Manager:
         logger.info(f"Manager exit_criteria: {self.exit_criteria}")
 
         # Continue receiving and giving until termination test is satisfied
+        recv_timeout = 0
+        self.log_listener.start()
         try:
             while not self.term_test():
                 self._kill_cancelled_sims()
-                persis_info = self._receive_from_workers(persis_info)
-                Work, persis_info, flag = self._alloc_work(self.hist.trim_H(), persis_info)
+                persis_info = self._receive_from_workers(persis_info, recv_timeout)
+                with self.metrics.timer("alloc_work"):
+                    Work, persis_info, flag = self._alloc_work(self.hist.trim_H(), persis_info)
                 if flag:
                     break
+                self.metrics.count("manager_loops")
+                self.metrics.count("work_units", len(Work))
+                self._gauge_eval_cache()
+                self.metrics.report()
+
+                # If no work was given, wait for a worker message (bounded for time-based tests)
+                recv_timeout = 0 if Work else Manager.recv_wait_timeout
 
                 for w in Work:
                     if self._sim_max_given():
                         break
                     self._check_work_order(Work[w], w)
-                    self._send_work_order(Work[w], w)
+                    with self.metrics.timer("send_work_order"):
+                        self._send_work_order(Work[w], w)
                     self._update_state_on_alloc(Work[w], w)
+                self.sim_recv_times.clear()  # Turnaround only counts work sent on the same iteration
                 assert self.term_test() or any(
                     self.W["active"] != 0
                 ), "alloc_f did not return any work, although all workers are idle."
@@ -667,7 +875,10 @@ class Manager:
             raise LoggedException(e.args) from None
         finally:
             # Return persis_info, exit_flag, elapsed time
-            result = self._final_receive_and_kill(persis_info)
+            try:
+                result = self._final_receive_and_kill(persis_info)
+            finally:
+                self.log_listener.stop()  # Emits any queued records
             sys.stdout.flush()
             sys.stderr.flush()
         return result
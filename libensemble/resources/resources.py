@@ -11,6 +11,7 @@ from libensemble.resources import node_resources
 from libensemble.resources.env_resources import EnvResources
 from libensemble.resources.mpi_resources import get_MPI_runner
 from libensemble.resources.worker_resources import ResourceManager, WorkerResources
+from libensemble.utils.thread_local import ThreadLocalAttribute
 
 logger = logging.getLogger(__name__)
 # To change logging level for just this module
@@ -48,6 +49,8 @@ class Resources:
 
     resources = None
 
+    worker_resources = ThreadLocalAttribute()  # Held for each worker thread when workers share a process
+
     DEFAULT_NODEFILE = "node_list"
 
     @classmethod
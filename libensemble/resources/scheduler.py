@@ -1,5 +1,3 @@
-import copy
-import itertools
 import logging
 
 import numpy as np
@@ -26,9 +24,18 @@ class ResourceScheduler:
 
     Resource sets are locally provisioned to work items by a call to the
     ``assign_resources`` function, and a cache of available resource sets is
-    maintained for the life of the object (usually corresponding to one call
-    of the allocation function). Note that work item resources are formally
-    assigned to workers only when a work item is sent to the worker.
+    maintained for the life of the object. Note that work item resources are
+    formally assigned to workers only when a work item is sent to the worker.
+
+    The manager keeps one scheduler for the run (given to allocation functions
+    as ``libE_info["scheduler"]``), calling ``update`` before each call of the
+    allocation function. Otherwise, a scheduler corresponds to one call of the
+    allocation function.
+
+    Resource sets are laid out on a grid of groups (e.g., nodes) by slots, and
+    the available resource sets are held as a boolean mask over the grid, read
+    from the ``assigned`` field of the resource sets. Searches for groups and
+    slots are array operations over the mask.
     """
 
     def __init__(self, user_resources=None, sched_opts={}):
@@ -65,7 +72,10 @@ class ResourceScheduler:
         self.gpu_rsets_free = self.resources.gpu_rsets_free
         self.nongpu_rsets_free = self.resources.nongpu_rsets_free
 
-        self.avail_rsets_by_group = None
+        self.set_rset_grid()
+        self.avail_mask = None
+        self.avail_counts = None  # Available rsets in each group (row of the grid)
+        self.provisional = []  # Teams provisioned since the last update
         self.log_msg = None
 
         # Process scheduler options
@@ -73,6 +83,45 @@ class ResourceScheduler:
         self.match_slots = sched_opts.get("match_slots", True)
         self.last_use_gpus = None
 
+    def set_rset_grid(self):
+        """Lay out the resource set IDs on a grid of groups (rows) by slots (columns)
+
+        Grid positions without a resource set hold -1.
+        """
+        rsets = self.resources.rsets
+        self.groups, self.rset_group_index = np.unique(rsets["group"], return_inverse=True)
+        num_slots = np.max(rsets["slot"]) + 1 if len(rsets) else 0
+        self.rset_grid = np.full((len(self.groups), num_slots), -1)
+        self.rset_grid[self.rset_group_index, rsets["slot"]] = np.arange(len(rsets))
+        self.rset_exists = self.rset_grid >= 0
+        self.gpu_mask = self.rset_exists & rsets["gpus"][self.rset_grid]
+
+    def update(self):
+        """Update the available resource sets from the resource manager
+
+        Reads the resource sets assigned or freed since the last update (which
+        the resource manager records once its ``changed_rsets`` has been called),
+        and restores any provisioned resource sets that were not assigned.
+        """
+        rsets = np.concatenate([self.resources.changed_rsets()] + self.provisional).astype(int)
+        self.provisional = []
+        if self.avail_mask is not None and len(rsets):
+            rows, slots = self.rset_group_index[rsets], self.resources.rsets["slot"][rsets]
+            self.avail_mask[rows, slots] = self.resources.rsets["assigned"][rsets] == 0
+            rows = np.unique(rows)
+            self.avail_counts[rows] = np.count_nonzero(self.avail_mask[rows], axis=1)
+
+        self.rsets_free = self.resources.rsets_free
+        self.gpu_rsets_free = self.resources.gpu_rsets_free
+        self.nongpu_rsets_free = self.resources.nongpu_rsets_free
+
+    @property
+    def avail_rsets_by_group(self):
+        """A dictionary of available resource set IDs for each group (or None if not yet read)"""
+        if self.avail_mask is None:
+            return None
+        return {g: self.rset_grid[i][self.avail_mask[i]].tolist() for i, g in enumerate(self.groups)}
+
     def assign_resources(self, rsets_req, use_gpus=None, user_params=[]):
         """Schedule resource sets to a work item if possible.
 
@@ -102,10 +151,10 @@ class ResourceScheduler:
             else:
                 max_grpsize = self.resources.nongpu_rsets_per_node
 
-        avail_rsets_by_group = self.get_avail_rsets_by_group()
+        avail_mask = self.get_avail_mask()
 
         # get rsets by group that are of the required type
-        valid_rsets_by_group = self.filter_for_rset_type(avail_rsets_by_group, use_gpus)
+        valid_mask = self.filter_for_rset_type(avail_mask, use_gpus)
 
         try_split = self.split2fit
 
@@ -115,15 +164,15 @@ class ResourceScheduler:
         )
 
         # Check enough slots
-        sorted_lengths = ResourceScheduler.get_sorted_lens(valid_rsets_by_group)
+        counts = self.avail_counts if use_gpus is None else np.count_nonzero(valid_mask, axis=1)
+        sorted_lengths = ResourceScheduler.get_sorted_lens(counts)
         max_even_grpsize = sorted_lengths[num_groups_req - 1]
         if max_even_grpsize < rsets_req_per_group:
             if not self.split2fit or max_even_grpsize == 0:
                 raise InsufficientFreeResources
 
         if self.match_slots:
-            slots_avail_by_group = self.get_avail_slots_by_group(valid_rsets_by_group)
-            cand_groups, cand_slots = self.get_matching_slots(slots_avail_by_group, num_groups_req, rsets_req_per_group)
+            cand_groups, cand_slots = self.get_matching_slots(valid_mask, num_groups_req, rsets_req_per_group, counts)
 
             if cand_groups is None:
                 if not self.split2fit:
@@ -141,7 +190,7 @@ class ResourceScheduler:
                     )
                     if self.match_slots:
                         cand_groups, cand_slots = self.get_matching_slots(
-                            slots_avail_by_group, num_groups_req, rsets_req_per_group
+                            valid_mask, num_groups_req, rsets_req_per_group, counts
                         )
                         if cand_groups is not None:
                             found_split = True
@@ -154,16 +203,14 @@ class ResourceScheduler:
             if cand_groups is None:
                 raise InsufficientFreeResources
             else:
-                rset_team = self.assign_team_from_slots(
-                    slots_avail_by_group, cand_groups, cand_slots, rsets_req_per_group
-                )
+                rset_team = self.assign_team_from_slots(cand_groups, cand_slots, rsets_req_per_group)
         else:
             rset_team = self.find_rsets_any_slots(
-                valid_rsets_by_group, max_grpsize, rsets_req, num_groups_req, rsets_req_per_group
+                valid_mask, max_grpsize, rsets_req, num_groups_req, rsets_req_per_group, counts
             )
 
         # Update persistent attributes
-        self.avail_rsets_by_group = self.filter_out_rset_team(avail_rsets_by_group, rset_team)
+        self.filter_out_rset_team(avail_mask, rset_team)
         self.rsets_free -= len(rset_team)
         if use_gpus is not None:
             if use_gpus:
@@ -174,59 +221,41 @@ class ResourceScheduler:
         if self.log_msg is not None:
             logger.debug(self.log_msg)
 
-        logger.debug(
-            f"rset_team found: Req: {rsets_req} rsets. Found: {rset_team} Avail sets {self.avail_rsets_by_group}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"rset_team found: Req: {rsets_req} rsets. Found: {rset_team} Avail sets {self.avail_rsets_by_group}"
+            )
 
         return rset_team
 
-    def find_rsets_any_slots(self, valid_rsets_by_group, max_grpsize, rsets_req, ngroups, rsets_per_group):
-        """Find optimal non-matching slots across groups"""
-        tmp_rsets_by_group = copy.deepcopy(valid_rsets_by_group)
-        max_upper_bound = max_grpsize + 1
+    def find_rsets_any_slots(self, valid_mask, max_grpsize, rsets_req, ngroups, rsets_per_group, counts=None):
+        """Find optimal non-matching slots across groups
 
-        # Now find slots on as many nodes as need
-        accum_team = []
-        group_list = []
+        Groups with an exact fit are used first, then those with the fewest
+        available slots (the first in group order for a tie).
+        """
+        if counts is None:
+            counts = np.count_nonzero(valid_mask, axis=1)
+        cand_groups = np.nonzero(counts >= rsets_per_group)[0]
+        cand_groups = cand_groups[np.argsort(counts[cand_groups], kind="stable")][:ngroups]
 
-        for ng in range(ngroups):
-            cand_team, cand_group = self.find_candidate(
-                tmp_rsets_by_group, group_list, rsets_per_group, max_upper_bound
-            )
+        if len(cand_groups) * rsets_per_group != rsets_req:
+            raise InsufficientFreeResources
 
-            if cand_group is not None:
-                accum_team.extend(cand_team)
-                group_list.append(cand_group)
+        # The first rsets_per_group available slots of each group
+        cand_mask = valid_mask[cand_groups]
+        cand_mask &= np.cumsum(cand_mask, axis=1) <= rsets_per_group
+        return np.sort(self.rset_grid[cand_groups][cand_mask]).tolist()
 
-                for rset in cand_team:
-                    tmp_rsets_by_group[cand_group].remove(rset)
+    def get_avail_mask(self):
+        """Return a boolean mask over the grid of resource sets that are not assigned
 
-        if len(accum_team) == rsets_req:
-            # A successful team found
-            rset_team = sorted(accum_team)
-        else:
-            raise InsufficientFreeResources
-        return rset_team
-
-    def find_candidate(self, rsets_by_group, group_list, rsets_per_group, max_upper_bound):
-        """Find a candidate slot in a group"""
-        cand_team = []
-        cand_group = None
-        upper_bound = max_upper_bound
-        for g in rsets_by_group:
-            if g in group_list:
-                continue
-            nslots = len(rsets_by_group[g])
-            if nslots == rsets_per_group:
-                # Exact fit
-                cand_team = rsets_by_group[g].copy()
-                cand_group = g
-                break
-            elif rsets_per_group < nslots < upper_bound:
-                cand_team = rsets_by_group[g][:rsets_per_group]
-                cand_group = g
-                upper_bound = nslots
-        return cand_team, cand_group
+        If groups are not set they will all be in one group (group 0)
+        """
+        if self.avail_mask is None:
+            self.avail_mask = self.rset_exists & (self.resources.rsets["assigned"][self.rset_grid] == 0)
+            self.avail_counts = np.count_nonzero(self.avail_mask, axis=1)
+        return self.avail_mask
 
     def get_avail_rsets_by_group(self):
         """Return a dictionary of resource set IDs for each group (e.g. node)
@@ -237,63 +266,26 @@ class ResourceScheduler:
         GROUP  1: [1,2,3,4]
         GROUP  2: [5,6,7,8]
         """
-
-        if self.avail_rsets_by_group is None:
-            rsets = self.resources.rsets
-            groups = np.unique(rsets["group"])
-            self.avail_rsets_by_group = {}
-            for g in groups:
-                self.avail_rsets_by_group[g] = []
-            for ind, rset in enumerate(rsets):
-                if not rset["assigned"]:
-                    g = rset["group"]
-                    self.avail_rsets_by_group[g].append(ind)
+        self.get_avail_mask()
         return self.avail_rsets_by_group
 
-    def filter_for_rset_type(self, avail_rsets_by_group, use_gpus):
-        """Return avail_rsets_by_group filtered by rset type (gpus/non-gpus/all)"""
-
-        def fltr_gpus(rset):
-            """Filter rsets to remove - hence negation"""
-            if use_gpus:
-                return ~rset["gpus"]
-            else:
-                return rset["gpus"]
-
+    def filter_for_rset_type(self, avail_mask, use_gpus):
+        """Return avail_mask filtered by rset type (gpus/non-gpus/all)"""
         if use_gpus is None:
-            return avail_rsets_by_group  # this means will be same object - dont need to update at end!
-
-        valid_rsets_by_group = {}
-        for g, rlist in avail_rsets_by_group.items():
-            valid_rsets = rlist.copy()
-            for rid in rlist:
-                if fltr_gpus(self.resources.rsets[rid]):
-                    valid_rsets.remove(rid)
-            valid_rsets_by_group[g] = valid_rsets
-
-        return valid_rsets_by_group
-
-    def filter_out_rset_team(self, avail_rsets_by_group, rset_team):
-        """Return avail_rsets_by_group filtered by rset type (gpus/non-gpus/all)"""
-        for g, rlist in avail_rsets_by_group.items():
-            valid_rsets = rlist.copy()
-            for rid in rlist:
-                if rid in rset_team:
-                    valid_rsets.remove(rid)
-            avail_rsets_by_group[g] = valid_rsets
-        return avail_rsets_by_group
-
-    @staticmethod
-    def get_slots_of_len(d, n):
-        """Filter dictionary to values >= n"""
-        return {k: v for k, v in d.items() if len(v) >= n}
-
-    def get_avail_slots_by_group(self, rsets_by_group):
-        """Return a dictionary of free slot IDS for each group (e.g. node)"""
-        slots_avail_by_group = {}
-        for k, v in rsets_by_group.items():
-            slots_avail_by_group[k] = set([self.resources.rsets[i]["slot"] for i in v])
-        return slots_avail_by_group
+            return avail_mask  # this means will be same object - dont need to update at end!
+        if use_gpus:
+            return avail_mask & self.gpu_mask
+        return avail_mask & ~self.gpu_mask
+
+    def filter_out_rset_team(self, avail_mask, rset_team):
+        """Remove the resource sets in rset_team from avail_mask (in place)"""
+        if len(rset_team):
+            rows = self.rset_group_index[rset_team]
+            avail_mask[rows, self.resources.rsets["slot"][rset_team]] = False
+            if avail_mask is self.avail_mask:
+                np.subtract.at(self.avail_counts, rows, 1)
+                self.provisional.append(np.asarray(rset_team))
+        return avail_mask
 
     def calc_req_split(self, rsets_req, max_grpsize, num_groups, extend):
         if self.resources.even_groups:  # This is total group sizes even (not available sizes)
@@ -363,56 +355,65 @@ class ResourceScheduler:
                 rsets_per_grp = sorted_lens[ngroups - 1]
         return rsets_req, ngroups, rsets_per_grp
 
-    def assign_team_from_slots(self, slots_avail_by_group, cand_groups, cand_slots, rsets_per_group):
-        """Assign resource set team from slots"""
-        rset_team = []
-        for grp in cand_groups:
-            for i, slot in enumerate(cand_slots):
-                # Ignore extra slots
-                if i >= rsets_per_group:
-                    break
-                group = self.resources.rsets["group"] == grp
-                slot = self.resources.rsets["slot"] == slot
-                rset = np.nonzero(group & slot)[0][0]
-                rset_team.append(rset)
-        return sorted(rset_team)
+    def assign_team_from_slots(self, cand_groups, cand_slots, rsets_per_group):
+        """Assign resource set team from slots (ignoring extra slots)"""
+        rset_team = self.rset_grid[np.ix_(cand_groups, cand_slots[:rsets_per_group])]
+        return np.sort(rset_team.ravel()).tolist()
 
     @staticmethod
-    def get_sorted_lens(avail_rsets):
-        """Get max length of a list value in a dictionary"""
-        return sorted([len(v) for v in avail_rsets.values()], reverse=True)
+    def get_sorted_lens(counts):
+        """Get the numbers of available slots in each group, in descending order"""
+        return np.sort(counts)[::-1]
+
+    def get_matching_slots(self, valid_mask, num_groups_req, rsets_per_group, counts=None):
+        """Get groups with at least rsets_per_group matching slots
 
-    def get_matching_slots(self, slots_avail_by_group, num_groups_req, rsets_per_group):
-        """Get first N matching slots across groups
+        Returns the indices of num_groups_req groups (rows of the grid) and
+        the (sorted) slots they have in common, or (None, None) if not found.
+
+        Candidate common slots are the distinct patterns of available slots
+        in the groups and, if more than one group is required, every
+        intersection of these with at least rsets_per_group slots (so any
+        set of groups with enough slots in common is found). Common slots
+        that exactly fit are preferred, otherwise the fewest. The groups
+        used are those with the fewest available slots that contain the
+        common slots.
 
         Assumes num_groups_req > 0.
         """
-        viable_slots_by_group = ResourceScheduler.get_slots_of_len(slots_avail_by_group, rsets_per_group)
-        if len(viable_slots_by_group) < num_groups_req:
+        if counts is None:
+            counts = np.count_nonzero(valid_mask, axis=1)
+        viable_groups = np.nonzero(counts >= rsets_per_group)[0]
+        if len(viable_groups) < num_groups_req:
             return None, None
+        viable_groups = viable_groups[np.argsort(counts[viable_groups], kind="stable")]
+        viable_mask = valid_mask[viable_groups]
 
-        combs = itertools.combinations(viable_slots_by_group, num_groups_req)
-        cand_groups = None
-        cand_slots = None
-        upper_bound = max(len(v) for v in viable_slots_by_group.values()) + 1
-        for comb in combs:
-            tmplist = []
-            for i in comb:
-                tmplist.append(viable_slots_by_group[i])
-            common_slots = set.intersection(*tmplist)
-            if len(common_slots) == rsets_per_group:
-                cand_groups = comb
-                cand_slots = common_slots
-                break
-            elif rsets_per_group < len(common_slots) < upper_bound:
-                upper_bound = len(common_slots)
-                cand_groups = comb
-                cand_slots = common_slots
-
-        if cand_groups is None:
+        patterns = np.unique(viable_mask, axis=0)
+        cand_slots = patterns
+        if num_groups_req > 1:
+            # Intersect new candidates with each pattern until no more are found
+            seen = {row.tobytes() for row in patterns}
+            new = patterns
+            while len(new):
+                meets = (new[:, np.newaxis, :] & patterns[np.newaxis, :, :]).reshape(-1, patterns.shape[1])
+                meets = np.unique(meets[np.count_nonzero(meets, axis=1) >= rsets_per_group], axis=0)
+                new = meets[[row.tobytes() not in seen for row in meets]]
+                seen.update(row.tobytes() for row in new)
+                cand_slots = np.concatenate([cand_slots, new])
+        sizes = np.count_nonzero(cand_slots, axis=1)
+
+        # Which viable groups have each candidate's slots available
+        contains = ~np.any(cand_slots[:, np.newaxis, :] & ~viable_mask[np.newaxis, :, :], axis=2)
+        feasible = (sizes >= rsets_per_group) & (np.count_nonzero(contains, axis=1) >= num_groups_req)
+        if not np.any(feasible):
             return None, None
 
-        return cand_groups, cand_slots
+        exact = feasible & (sizes == rsets_per_group)
+        best = exact if np.any(exact) else feasible & (sizes == np.min(sizes[feasible]))
+        cands = [np.sort(viable_groups[contains[c]][:num_groups_req]) for c in np.nonzero(best)[0]]
+        c = min(range(len(cands)), key=lambda i: cands[i].tolist())
+        return cands[c], np.nonzero(cand_slots[np.nonzero(best)[0][c]])[0]
 
     def check_total_rsets(self, rsets_req, use_gpus):
         """Raise exceptions if rsets requested is more than total that exist or available"""
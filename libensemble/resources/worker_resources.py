@@ -65,6 +65,18 @@ class ResourceManager(RSetResources):
         self.ngroups_by_size = Counter(counts)
         self.even_groups = True if len(self.ngroups_by_size) == 1 else False
 
+        # Resource sets assigned or freed since the last call to changed_rsets (None until it is first called)
+        self._changed = None
+
+    def changed_rsets(self):
+        """Returns indices of rsets assigned or freed since the last call, and starts tracking on the first call"""
+        if not self._changed:
+            self._changed = []
+            return np.zeros(0, dtype=int)
+        rsets = np.unique(np.concatenate(self._changed))
+        self._changed = []
+        return rsets
+
     def assign_rsets(self, rset_team, worker_id):
         """Mark the resource sets given by rset_team as assigned to worker_id"""
         if rset_team:
@@ -81,6 +93,8 @@ class ResourceManager(RSetResources):
                     ResourceManagerException(
                         f"Error: Attempting to assign rsets {rset_team}" f" already assigned to workers: {rteam}"
                     )
+            if self._changed is not None:
+                self._changed.append(np.asarray(rset_team, dtype=int))
 
     def free_rsets(self, worker=None):
         """Free up assigned resource sets"""
@@ -89,12 +103,15 @@ class ResourceManager(RSetResources):
             self.rsets_free = self.total_num_rsets
             self.gpu_rsets_free = self.total_num_gpu_rsets
             self.nongpu_rsets_free = self.total_num_nongpu_rsets
+            rsets_to_free = np.arange(self.total_num_rsets)
         else:
             rsets_to_free = np.where(self.rsets["assigned"] == worker)[0]
             self.rsets["assigned"][rsets_to_free] = 0
             self.rsets_free += len(rsets_to_free)
             self.gpu_rsets_free += np.count_nonzero(self.rsets["gpus"][rsets_to_free])
             self.nongpu_rsets_free += np.count_nonzero(~self.rsets["gpus"][rsets_to_free])
+        if self._changed is not None:
+            self._changed.append(rsets_to_free)
 
     @staticmethod
     def get_index_list(
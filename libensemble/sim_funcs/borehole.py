@@ -50,7 +50,8 @@ def borehole_func(x: npt.NDArray):
     -------
 
     f: numpy.ndarray
-        vector of dimension (n, 1): flow rate through the Borehole (m^3/year)
+        vector of dimension (n,): flow rate through the Borehole (m^3/year)
+        (a float for a single input point x of dimension (8,))
 
     """
 
@@ -60,13 +61,14 @@ def borehole_func(x: npt.NDArray):
     if x.ndim == 1:
         axis = 0
 
-    (Tu, Tl, Hu, Hl, r, rw, Kw, L) = np.split(x, 8, axis)
+    Tu, Tl, Hu, Hl, r, rw, Kw, L = np.split(x, 8, axis)
 
     numer = 2 * np.pi * Tu * (Hu - Hl)
     denom1 = 2 * L * Tu / (np.log(r / rw) * rw**2 * Kw)
     denom2 = Tu / Tl
 
-    return ((numer / (np.log(r / rw) * (1 + denom1 + denom2))).reshape(-1))[0]
+    f = (numer / (np.log(r / rw) * (1 + denom1 + denom2))).reshape(-1)
+    return f if x.ndim > 1 else f[0]
 
 
 def gen_borehole_input(n):
@@ -15,6 +15,8 @@ from libensemble.utils.specs_checkers import (
     _check_exit_criteria,
     _check_H0,
     _check_output_fields,
+    _check_use_shared_H,
+    _check_workers_per_process,
 )
 
 _UNRECOGNIZED_ERR = "Unrecognized field. Check closely for typos, or libEnsemble's docs"
@@ -74,6 +76,13 @@ class SimSpecs(BaseModel):
     calling them locally.
     """
 
+    vectorized: Optional[bool] = False
+    """
+    The simulation function evaluates all the points (rows) it is given in one call, returning an
+    output row for each. Allocation functions that support this (e.g., the default) then give
+    many points in each sim work unit, sharing the available points among the idle workers.
+    """
+
     user: Optional[dict] = {}
     """
     A user-data dictionary to place bounds, constants, settings, or other parameters for customizing
@@ -244,6 +253,21 @@ class LibeSpecs(BaseModel):
     H_file_prefix: Optional[str] = "libE_history"
     """ Prefix for ``H`` filename."""
 
+    save_H_columnar: Optional[bool] = False
+    """
+    Save ``H`` (for ``save_every_k_sims``, ``save_every_k_gens`` and ``save_H_on_completion``) to an
+    append-only directory with a file per field, named ``<H_file_prefix>_checkpoint``. Each save appends
+    only the rows changed since the previous one. Load with ``libensemble.tools.load_H_checkpoint``.
+    """
+
+    restart_from: Optional[Union[str, Path]] = None
+    """
+    Resume a workflow from the latest checkpoint in this directory (written with ``save_H_columnar``).
+    The checkpointed ``H`` is used in place of ``H0`` and the per-worker entries of ``persis_info`` are
+    restored. Sims that were in progress are given out again, and exit criteria count from the start of
+    the original run. Persistent generators can restore state saved with ``PersistentSupport.save_state``.
+    """
+
     worker_timeout: Optional[int] = 1
     """ On libEnsemble shutdown, number of seconds after which workers considered timed out, then terminated. """
 
@@ -394,15 +418,85 @@ class LibeSpecs(BaseModel):
     profile: Optional[bool] = False
     """ Profile manager and worker logic using ``cProfile``. """
 
+    metrics_file: Optional[bool] = False
+    """
+    Periodically append counters and timings of the manager loop (time in receiving, allocating,
+    sending work and updating and saving ``H``, and messages and bytes per worker) to
+    ``libE_metrics.jsonl`` in the workflow directory, one JSON object per line.
+    """
+
+    metrics_callback: Optional[Callable] = None
+    """ Function called on the manager with each report of the manager loop metrics (a dictionary). """
+
+    metrics_interval: Optional[float] = 10.0
+    """ Seconds between reports of the manager loop metrics. A final report is made at the end of the run. """
+
     disable_log_files: Optional[bool] = False
     """ Disable ``ensemble.log`` and ``libE_stats.txt`` log files. """
 
+    worker_log_batch_size: Optional[int] = 64
+    """
+    Maximum number of log records a worker buffers before sending them to the manager in one message.
+    Buffered records are also sent with each message to the manager, and on any record of level ``ERROR``
+    or above. Set to 1 to send each record as it is logged.
+    """
+
+    worker_log_batch_interval: Optional[float] = 1.0
+    """
+    Seconds after which a worker's buffered log records are sent, when the next record is logged.
+    Buffered records are also sent when the executor submits a task, and before it waits on a task.
+    """
+
+    use_spawn_server: Optional[bool] = False
+    """
+    Each worker starts a small helper process, which launches the applications submitted through the
+    executor (with ``posix_spawn``). This avoids the cost of forking a worker that has a large memory
+    footprint (e.g., from imported packages) for each launch. See ``libensemble.utils.spawn_server``.
+    """
+
+    workers_per_process: Optional[int] = 1
+    """
+    Local comms only: Run this many workers as threads of each worker process. Each worker has its
+    own worker ID and resource sets, so one process can run several calculations at once (e.g., one
+    for each application on a node, for sims that submit an application and wait on it). The executor
+    and resources hold their worker-specific state for each thread, while the working directory is
+    shared, so calculation directories are not supported. Nor is ``profile``, as Python allows only
+    one active profiler per process.
+    """
+
     safe_mode: Optional[bool] = False
     """ Prevents user functions from overwriting protected History fields, but requires moderate overhead. """
 
     stats_fmt: Optional[dict] = {}
     """ Options for formatting ``'libE_stats.txt'``. See 'Formatting libE_stats.txt'. """
 
+    stats_columnar: Optional[bool] = False
+    """
+    Instead of ``'libE_stats.txt'``, record the timing and status of each calculation (and of the tasks it
+    submitted) as binary records in the ``libE_stats`` directory, with a file per field. Load with
+    ``libensemble.tools.calc_stats.load_calc_stats``, or write the text file on request with
+    ``libensemble.tools.calc_stats.write_stats_text``.
+    """
+
+    runtime_estimator: Optional[dict] = None
+    """
+    Options for an online estimator of sim runtimes, updated as sims return, whose predictions are
+    available to allocation functions (``libE_info["runtime_estimator"]``). Use ``{}`` for the defaults.
+    Options are ``"method"`` (``"knn"`` or ``"linear"``), ``"fields"`` (fields of H used as features;
+    default ``"x"`` and any resource fields), ``"k"`` and ``"max_observations"``. See
+    ``libensemble.tools.runtime_estimator``.
+    """
+
+    eval_cache: Optional[dict] = None
+    """
+    Options for a persistent cache of sim evaluations, kept by the manager. Points returned by gens
+    whose ``sim_specs["in"]`` values are in the cache are given their ``sim_specs["out"]`` values
+    without running a sim (and count towards ``sim_max``). Use ``{}`` for the defaults. Options are
+    ``"path"`` (default ``"libE_eval_cache.db"``), ``"tolerance"`` (inputs are rounded to multiples
+    of this before matching; default exact), ``"max_entries"`` (least recently used entries are
+    removed beyond this) and ``"namespace"``. See ``libensemble.tools.eval_cache``.
+    """
+
     workers: Optional[List[str]]
     """ TCP Only: A list of worker hostnames. """
 
@@ -425,6 +519,13 @@ class LibeSpecs(BaseModel):
     ``manager_port``, ``authkey``, and ``workerID``. ``nworkers`` is specified normally.
     """
 
+    use_shared_H: Optional[bool] = False
+    """
+    Local comms only: Keep the History array in shared memory. Non-persistent sim workers then
+    read their input rows and write their output fields in place, instead of the rows being
+    copied through the comms in each direction. The input rows given to the sim_f are read-only.
+    """
+
     use_persis_return_gen: Optional[bool] = False
     """ Adds persistent generator output fields to the History array on return. """
 
@@ -529,6 +630,14 @@ class LibeSpecs(BaseModel):
     def check_any_workers_and_disable_rm_if_tcp(cls, values):
         return _check_any_workers_and_disable_rm_if_tcp(values)
 
+    @root_validator
+    def check_workers_per_process(cls, values):
+        return _check_workers_per_process(values)
+
+    @root_validator
+    def check_use_shared_H(cls, values):
+        return _check_use_shared_H(values)
+
     @root_validator(pre=True)
     def enable_save_H_when_every_K(cls, values):
         if "save_H_on_completion" not in values and (
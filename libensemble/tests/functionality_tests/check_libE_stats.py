@@ -1,4 +1,4 @@
-""" Script to check format of libE_stats.txt
+"""Script to check format of libE_stats.txt
 
 Checks matching start and end times existing for calculation and tasks if
 required. Checks that dates/times are in a valid format.
@@ -34,7 +34,7 @@ def check_datetime(t1, t2):
     assert is_date(dt), f"Expected a datetime, found {dt}"
 
 
-def check_start_end_times(start="Start:", end="End:", everyline=True):
+def check_start_end_times(start="Start:", end="End:", everyline=True, infile=infile):
     """Iterate over rows in infile and check delimiters and datetime formats"""
     with open(infile) as f:
         total_cnt = 0
@@ -63,11 +63,11 @@ def check_start_end_times(start="Start:", end="End:", everyline=True):
         assert total_cnt > 0, f"No timings found starting {start}"
 
 
-def check_libE_stats(task_datetime=False):
+def check_libE_stats(task_datetime=False, infile=infile):
     """Determine and run checks"""
-    check_start_end_times()
+    check_start_end_times(infile=infile)
     if task_datetime:
-        check_start_end_times(start="Tstart:", end="Tend:", everyline=False)
+        check_start_end_times(start="Tstart:", end="Tend:", everyline=False, infile=infile)
 
 
 if __name__ == "__main__":
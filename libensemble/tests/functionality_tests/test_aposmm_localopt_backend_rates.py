@@ -0,0 +1,82 @@
+"""
+Compares how many APOSMM local optimization runs per second can be advanced
+with each run in a child process (the default) or in a thread.
+
+Execute via the following command:
+   python test_aposmm_localopt_backend_rates.py
+
+Many concurrent SciPy Nelder-Mead runs on a cheap quadratic are started and
+advanced in turn (as APOSMM does) until all have converged. The points
+requested by the runs must be the same with either backend.
+"""
+
+# Do not change these lines - they are parsed by run-tests.sh
+# TESTSUITE_COMMS: local
+# TESTSUITE_NPROCS: 2
+
+import multiprocessing
+import time
+
+import numpy as np
+
+import libensemble.gen_funcs
+
+libensemble.gen_funcs.rc.aposmm_optimizers = "scipy"
+
+from libensemble.gen_funcs.aposmm_localopt_support import ConvergedMsg, LocalOptInterfacer  # noqa: E402
+
+
+def objective(x):
+    return np.sum((x - 0.3) ** 2)
+
+
+def advance_runs(user_specs, starts):
+    """Advances a run from each starting point until all converge, returning the points they requested"""
+    data = np.zeros(1, dtype=[("x_on_cube", float, starts.shape[1]), ("f", float)])
+    runs = {}
+    requested = {}
+    for i, x0 in enumerate(starts):
+        runs[i] = LocalOptInterfacer(user_specs, x0, np.array(objective(x0)))
+        requested[i] = [x0]
+
+    while runs:
+        for i in list(runs):
+            data["x_on_cube"] = requested[i][-1]
+            data["f"] = objective(requested[i][-1])
+            x_new = runs[i].iterate(data[0])
+            if isinstance(x_new, ConvergedMsg):
+                runs.pop(i)
+            else:
+                requested[i].append(x_new[0])
+    return requested
+
+
+# Main block is necessary only when using local comms with spawn start method (default on macOS and Windows).
+if __name__ == "__main__":
+    multiprocessing.set_start_method("fork", force=True)
+
+    n = 2
+    num_runs = 50
+    starts = np.random.default_rng(1).uniform(0.1, 0.9, (num_runs, n))
+    user_specs = {
+        "lb": np.zeros(n),
+        "ub": np.ones(n),
+        "localopt_method": "scipy_Nelder-Mead",
+        "opt_return_codes": [0],
+        "scipy_kwargs": {"options": {"xatol": 1e-6, "fatol": 1e-8}},
+    }
+
+    requested = {}
+    for backend in ["process", "thread"]:
+        start = time.time()
+        requested[backend] = advance_runs(dict(user_specs, localopt_backend=backend), starts)
+        elapsed = time.time() - start
+        num_points = sum(len(pts) for pts in requested[backend].values())
+        print(
+            f"{backend:>7}: {num_runs / elapsed:8.1f} runs/s, {num_points / elapsed:10.1f} points/s"
+            f" ({num_points} points)",
+            flush=True,
+        )
+
+    for i in range(num_runs):
+        assert np.array_equal(requested["process"][i], requested["thread"][i]), "Backends requested different points"
@@ -0,0 +1,64 @@
+"""
+Runs the same ensemble twice with an evaluation cache, so the second run gets
+every point from the cache instead of evaluating it.
+
+Execute via one of the following commands (e.g. 3 workers):
+   mpiexec -np 4 python test_eval_cache.py
+   python test_eval_cache.py --nworkers 3 --comms local
+"""
+
+# Do not change these lines - they are parsed by run-tests.sh
+# TESTSUITE_COMMS: mpi local
+# TESTSUITE_NPROCS: 2 4
+
+import os
+
+import numpy as np
+
+from libensemble.gen_funcs.sampling import uniform_random_sample as gen_f
+from libensemble.libE import libE
+from libensemble.sim_funcs.six_hump_camel import six_hump_camel as sim_f
+from libensemble.tools import parse_args
+
+# Main block is necessary only when using local comms with spawn start method (default on macOS and Windows).
+if __name__ == "__main__":
+    nworkers, is_manager, libE_specs, _ = parse_args()
+    cache_file = "test_eval_cache.db"
+    if is_manager and os.path.isfile(cache_file):
+        os.remove(cache_file)
+    libE_specs["eval_cache"] = {"path": cache_file, "tolerance": 1e-12}
+
+    sim_specs = {
+        "sim_f": sim_f,
+        "in": ["x"],
+        "out": [("f", float)],
+    }
+
+    gen_specs = {
+        "gen_f": gen_f,
+        "out": [("x", float, (2,))],
+        "user": {
+            "gen_batch_size": 200,  # All points from the first gen call
+            "lb": np.array([-3, -2]),
+            "ub": np.array([3, 2]),
+        },
+    }
+
+    exit_criteria = {"sim_max": 200}
+
+    results = []
+    for run in range(2):
+        # Whichever worker runs the gen, the same points are generated
+        persis_info = {i: {"rand_stream": np.random.default_rng(1234)} for i in range(nworkers + 1)}
+        H, persis_info, flag = libE(sim_specs, gen_specs, exit_criteria, persis_info, libE_specs=libE_specs)
+        results.append(H)
+
+    if is_manager:
+        first, second = results
+        assert flag == 0
+        assert np.all(first["sim_worker"][:200] > 0), "The first run should evaluate every point"
+        assert len(second) == 200 and np.all(second["sim_ended"]), "The second run should not call the gen again"
+        assert np.all(second["sim_worker"] == 0), "Points should come from the cache"
+        assert np.array_equal(first["f"][:200], second["f"])
+        print("\nlibEnsemble with an evaluation cache: Completed")
+        os.remove(cache_file)
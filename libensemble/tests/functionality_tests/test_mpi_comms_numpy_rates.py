@@ -0,0 +1,85 @@
+"""
+Compares MainMPIComm message rates for work units with numpy payloads, sending
+the arrays as raw buffers (the default) or pickled, for various sizes of x.
+
+Execute via the following command:
+   mpiexec -np 2 python test_mpi_comms_numpy_rates.py
+
+Each round trip mimics a sim work unit: a Work dictionary and the H rows go to
+the worker, and a dictionary holding calc_out comes back.
+"""
+
+import time
+
+import numpy as np
+from mpi4py import MPI
+
+from libensemble.comms.mpi import MainMPIComm, MPIComm
+from libensemble.message_numbers import EVAL_SIM_TAG, STOP_TAG
+from libensemble.tools import parse_args
+
+# Do not change these lines - they are parsed by run-tests.sh
+# TESTSUITE_COMMS: mpi
+# TESTSUITE_NPROCS: 2
+
+
+class PickledMainMPIComm(MainMPIComm):
+    """MainMPIComm that pickles all messages (as before buffer support)"""
+
+    _isend = MPIComm._isend
+    _recv = MPIComm._recv
+
+
+# Main block is necessary only when using local comms with spawn start method (default on macOS and Windows).
+if __name__ == "__main__":
+    nworkers, is_manager, libE_specs, _ = parse_args()
+
+    assert libE_specs["comms"] == "mpi", "This test can only be run with mpi comms -- aborting..."
+
+    mpi_comm = MPI.COMM_WORLD
+    x_dims = [1, 100, 10000, 100000]
+    batch = 4  # Rows per work unit
+    rounds = 50
+
+    def worker_main(comm):
+        while True:
+            tag, Work = comm.recv()
+            if tag == STOP_TAG:
+                break
+            _, calc_in = comm.recv()
+            calc_out = np.zeros(len(calc_in), dtype=[("f", float), ("x_out", float, calc_in["x"].shape[1:])])
+            calc_out["f"] = np.sum(calc_in["x"], axis=1)
+            calc_out["x_out"] = calc_in["x"]
+            comm.send(0, {"calc_out": calc_out, "libE_info": Work["libE_info"], "calc_type": EVAL_SIM_TAG})
+
+    def manager_main(comm, x_dim):
+        H = np.zeros(batch * rounds, dtype=[("sim_id", int), ("x", float, (x_dim,))])
+        H["sim_id"] = range(len(H))
+        H["x"] = np.random.uniform(size=H["x"].shape)
+        start = time.time()
+        for i in range(rounds):
+            rows = np.arange(i * batch, (i + 1) * batch)
+            comm.send(EVAL_SIM_TAG, {"H_fields": ["x"], "tag": EVAL_SIM_TAG, "libE_info": {"H_rows": rows}})
+            comm.send(0, H[["x"]][rows])
+            _, D = comm.recv()
+            assert np.array_equal(D["calc_out"]["x_out"], H["x"][rows])
+            assert np.allclose(D["calc_out"]["f"], np.sum(H["x"][rows], axis=1))
+        return rounds / (time.time() - start)
+
+    for x_dim in x_dims:
+        rates = {}
+        for label, comm_type in [("pickled", PickledMainMPIComm), ("buffers", MainMPIComm)]:
+            if mpi_comm.Get_rank() == 0:
+                comm = comm_type(mpi_comm, 1)
+                rates[label] = manager_main(comm, x_dim)
+                comm.send(STOP_TAG, None)
+            elif mpi_comm.Get_rank() == 1:
+                worker_main(comm_type(mpi_comm, 0))
+            mpi_comm.Barrier()
+
+        if mpi_comm.Get_rank() == 0:
+            print(
+                f"x dim {x_dim:>7}: pickled {rates['pickled']:10.1f} round trips/s,"
+                f" buffers {rates['buffers']:10.1f} round trips/s",
+                flush=True,
+            )
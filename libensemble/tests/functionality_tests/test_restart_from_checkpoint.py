@@ -0,0 +1,87 @@
+"""
+Tests restarting libEnsemble from the columnar history checkpoints of a
+previous run, continuing with a persistent uniform sampling generator.
+
+Execute via one of the following commands (e.g. 3 workers):
+   mpiexec -np 4 python test_restart_from_checkpoint.py
+   python test_restart_from_checkpoint.py --nworkers 3 --comms local
+
+The first run stops after half of the sims. The second resumes from its
+checkpoint and stops once the sims of both runs reach sim_max.
+"""
+
+# Do not change these lines - they are parsed by run-tests.sh
+# TESTSUITE_COMMS: mpi local
+# TESTSUITE_NPROCS: 3 4
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from libensemble.alloc_funcs.start_only_persistent import only_persistent_gens as alloc_f
+from libensemble.gen_funcs.persistent_sampling import persistent_uniform as gen_f
+
+# Import libEnsemble items for this test
+from libensemble.libE import libE
+from libensemble.sim_funcs.six_hump_camel import six_hump_camel as sim_f
+from libensemble.tools import add_unique_random_streams, load_H_checkpoint, parse_args
+
+# Main block is necessary only when using local comms with spawn start method (default on macOS and Windows).
+if __name__ == "__main__":
+    nworkers, is_manager, libE_specs, _ = parse_args()
+
+    if nworkers < 2:
+        sys.exit("Cannot run with a persistent worker if only one worker -- aborting...")
+
+    # Checkpoints (and logs) go in a temporary workflow directory, which the manager passes to the workers
+    tmpdir = tempfile.TemporaryDirectory()
+    libE_specs["workflow_dir_path"] = tmpdir.name
+    checkpoint = os.path.join(tmpdir.name, "libE_history_checkpoint")
+
+    sim_specs = {
+        "sim_f": sim_f,
+        "in": ["x"],
+        "out": [("f", float)],
+    }
+
+    gen_specs = {
+        "gen_f": gen_f,
+        "in": ["sim_id", "x", "f"],  # On restart, the generator is started with the points so far
+        "persis_in": ["f", "sim_id"],
+        "out": [("x", float, (2,))],
+        "user": {
+            "initial_batch_size": 10,
+            "lb": np.array([-3, -2]),
+            "ub": np.array([3, 2]),
+        },
+    }
+
+    alloc_specs = {"alloc_f": alloc_f}
+
+    libE_specs["save_H_columnar"] = True
+    libE_specs["save_every_k_sims"] = 10
+
+    sim_max = 60
+    persis_info = add_unique_random_streams({}, nworkers + 1)
+    H1, _, flag = libE(sim_specs, gen_specs, {"sim_max": sim_max // 2}, persis_info, alloc_specs, libE_specs)
+
+    if is_manager:
+        assert flag == 0
+        H_loaded = load_H_checkpoint(checkpoint)
+        for field in H1.dtype.names:
+            assert np.array_equal(H_loaded[field], H1[field]), f"Checkpointed {field} differs from H"
+
+    libE_specs["restart_from"] = checkpoint
+    persis_info = add_unique_random_streams({}, nworkers + 1)
+    H2, _, flag = libE(sim_specs, gen_specs, {"sim_max": sim_max}, persis_info, alloc_specs, libE_specs)
+
+    if is_manager:
+        assert flag == 0
+        assert np.array_equal(H2["x"][: len(H1)], H1["x"]), "Restarted history should begin with the first run's"
+        assert sim_max <= np.sum(H2["sim_ended"]) < sim_max + nworkers * 10, "Exit criteria count from the first run"
+        assert len(np.unique(H2["x"], axis=0)) == len(H2), "The generator should continue its random stream"
+        print("\nlibEnsemble restarted from the checkpoint of the first run")
+
+    tmpdir.cleanup()
@@ -26,9 +26,11 @@ from libensemble.gen_funcs.sampling import uniform_random_sample_with_variable_r
 
 # Import libEnsemble items for this test
 from libensemble.libE import libE
+from libensemble.message_numbers import EVAL_SIM_TAG
 from libensemble.sim_funcs import helloworld, six_hump_camel
 from libensemble.sim_funcs.var_resources import multi_points_with_variable_resources as sim_f
 from libensemble.tools import add_unique_random_streams, parse_args
+from libensemble.tools.calc_stats import load_calc_stats, write_stats_text
 
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 from check_libE_stats import check_libE_stats
@@ -93,7 +95,7 @@ if __name__ == "__main__":
 
     exit_criteria = {"sim_max": 40, "wallclock_max": 300}
 
-    iterations = 2
+    iterations = 3
 
     # Note that libE_stats.txt output will be appended across libE calls.
     for prob_id in range(iterations):
@@ -112,6 +114,12 @@ if __name__ == "__main__":
             libE_specs["stats_fmt"] = {"task_datetime": True, "show_resource_sets": True}
             check_task_datetime = True
 
+        if prob_id == 2:
+            # stats_columnar: Record calc and task timings in libE_stats/ instead of libE_stats.txt
+            libE_specs["stats_fmt"] = {}
+            libE_specs["stats_columnar"] = True
+            check_task_datetime = True
+
         persis_info = add_unique_random_streams({}, nworkers + 1)
 
         # Perform the run
@@ -121,6 +129,14 @@ if __name__ == "__main__":
 
         if is_manager:
             assert flag == 0
+            if libE_specs.get("stats_columnar"):
+                calcs, tasks = load_calc_stats("libE_stats")
+                sims = calcs[calcs["calc_type"] == EVAL_SIM_TAG]
+                assert np.sum(sims["num_sims"]) == np.sum(H["sim_ended"]), "Expected a record for each sim"
+                assert np.all(sims["end"] >= sims["start"])
+                assert len(tasks) >= len(sims), "Expected a task record for each sim"
+                write_stats_text("libE_stats", "libE_stats_columnar.txt", task_datetime=True)
+                check_libE_stats(task_datetime=True, infile="libE_stats_columnar.txt")
             check_libE_stats(task_datetime=check_task_datetime)
 
             # save_libE_output(H, persis_info, __file__, nworkers)
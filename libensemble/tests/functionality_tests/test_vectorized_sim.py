@@ -0,0 +1,48 @@
+"""
+Tests evaluating an existing sample with a vectorized sim_f, which is given
+many points in each call.
+
+Execute via one of the following commands (e.g. 3 workers):
+   mpiexec -np 4 python test_vectorized_sim.py
+   python test_vectorized_sim.py --nworkers 3 --comms local
+"""
+
+# Do not change these lines - they are parsed by run-tests.sh
+# TESTSUITE_COMMS: mpi local
+# TESTSUITE_NPROCS: 2 4
+
+import numpy as np
+
+# Import libEnsemble items for this test
+from libensemble import Ensemble
+from libensemble.alloc_funcs.give_pregenerated_work import give_pregenerated_sim_work as alloc_f
+from libensemble.sim_funcs.borehole import borehole as sim_f
+from libensemble.sim_funcs.borehole import borehole_func, gen_borehole_input
+from libensemble.specs import AllocSpecs, ExitCriteria, SimSpecs
+
+# Main block is necessary only when using local comms with spawn start method (default on macOS and Windows).
+if __name__ == "__main__":
+    n_samp = 1000
+    H0 = np.zeros(n_samp, dtype=[("x", float, 8), ("sim_id", int), ("sim_started", bool)])
+    np.random.seed(0)
+    H0["x"] = gen_borehole_input(n_samp)
+    H0["sim_id"] = range(n_samp)
+    H0["sim_started"] = False
+
+    sampling = Ensemble(parse_args=True)
+    sampling.H0 = H0
+    sampling.sim_specs = SimSpecs(sim_f=sim_f, inputs=["x"], out=[("f", float)], vectorized=True)
+    sampling.alloc_specs = AllocSpecs(alloc_f=alloc_f, user={"max_sim_batch_size": 200})
+    sampling.exit_criteria = ExitCriteria(sim_max=len(H0))
+    sampling.run()
+
+    if sampling.is_manager:
+        H = sampling.H
+        assert np.all(H["sim_ended"])
+        assert np.allclose(H["f"], borehole_func(H0["x"])), "Each point should get its own value"
+
+        # Points were given in work units of up to max_sim_batch_size
+        num_calls = len(np.unique(H["sim_started_time"]))
+        assert n_samp / 200 <= num_calls < n_samp / 10, f"Unexpected number of sim calls {num_calls}"
+        print(f"\nlibEnsemble evaluated {n_samp} points in {num_calls} vectorized sim calls")
+        sampling.save_output(__file__)
@@ -0,0 +1,80 @@
+"""
+Runs libEnsemble with several workers as threads of each worker process.
+
+Each sim submits an application and waits on it, so the workers of a process
+run their applications concurrently.
+
+Execute via one of the following commands (e.g. 4 workers):
+   python test_workers_per_process.py --nworkers 4 --comms local
+"""
+
+# Do not change these lines - they are parsed by run-tests.sh
+# TESTSUITE_COMMS: local
+# TESTSUITE_NPROCS: 5
+
+import os
+
+import numpy as np
+
+import libensemble.sim_funcs.six_hump_camel as six_hump_camel
+from libensemble.executors.mpi_executor import MPIExecutor
+from libensemble.gen_funcs.sampling import uniform_random_sample as gen_f
+from libensemble.libE import libE
+from libensemble.message_numbers import WORKER_DONE
+from libensemble.sim_funcs.six_hump_camel import six_hump_camel_func
+from libensemble.tools import add_unique_random_streams, parse_args
+
+
+def sim_f(H, persis_info, sim_specs, libE_info):
+    """Runs the six_hump_camel app on one point, recording the worker process"""
+    H_o = np.zeros(1, dtype=sim_specs["out"])
+    exctr = libE_info["executor"]
+    task = exctr.submit(app_name="six_hump_camel", num_procs=1, app_args=" ".join(map(str, H["x"][0])))
+    task.wait()
+    assert task.workerID == libE_info["workerID"], "Task submitted with the ID of another worker"
+    assert exctr.list_of_tasks.get(task.id) is task
+    H_o["f"] = float(task.read_stdout().strip())  # Each task writes its own stdout file
+    H_o["pid"] = os.getpid()
+    return H_o, persis_info, WORKER_DONE
+
+
+# Main block is necessary only when using local comms with spawn start method (default on macOS and Windows).
+if __name__ == "__main__":
+    nworkers, is_manager, libE_specs, _ = parse_args()
+    libE_specs["workers_per_process"] = 2
+
+    exctr = MPIExecutor()
+    exctr.register_app(full_path=six_hump_camel.__file__, app_name="six_hump_camel")
+
+    sim_specs = {
+        "sim_f": sim_f,
+        "in": ["x"],
+        "out": [("f", float), ("pid", int)],
+    }
+
+    gen_specs = {
+        "gen_f": gen_f,
+        "in": ["sim_id"],
+        "out": [("x", float, (2,))],
+        "user": {
+            "lb": np.array([-3, -2]),
+            "ub": np.array([3, 2]),
+            "gen_batch_size": nworkers,
+        },
+    }
+
+    persis_info = add_unique_random_streams({}, nworkers + 1)
+    exit_criteria = {"sim_max": nworkers * 4}
+
+    H, persis_info, flag = libE(sim_specs, gen_specs, exit_criteria, persis_info, libE_specs=libE_specs)
+
+    if is_manager:
+        assert flag == 0
+        assert np.allclose(H["f"], [six_hump_camel_func(x) for x in H["x"]])
+
+        # Workers of the same process share a pid
+        teams = (H["sim_worker"] - 1) // libE_specs["workers_per_process"]
+        for team in np.unique(teams):
+            assert len(np.unique(H["pid"][teams == team])) == 1, "Workers of a process have different pids"
+        assert len(np.unique(H["pid"])) == len(np.unique(teams))
+        print("\nlibEnsemble with workers as threads of each worker process: Completed")
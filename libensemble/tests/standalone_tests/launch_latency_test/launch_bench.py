@@ -0,0 +1,52 @@
+"""Standalone benchmark of application launch latency against worker memory size
+
+Times launching (and waiting on) a short application from a process holding
+a given amount of memory, launching directly (subprocess.Popen, as by default)
+and from a spawn server (as with libE_specs["use_spawn_server"])
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import libensemble.utils.launcher as launcher
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--rss_mb", type=int, nargs="+", default=[0, 256, 1024, 4096], help="Memory to hold (MB)")
+parser.add_argument("--launches", type=int, default=200)
+parser.add_argument("--app", default="true", help="Application to launch")
+args = parser.parse_args()
+
+
+def launch_time(num_launches, **kwargs):
+    """Returns the mean time (seconds) to launch and wait on the app"""
+    start = time.perf_counter()
+    for _ in range(num_launches):
+        launcher.wait(launcher.launch([args.app], **kwargs))
+    return (time.perf_counter() - start) / num_launches
+
+
+def no_op():
+    pass
+
+
+# The spawn server is started while the process is small, as by a worker at startup
+launcher.start_spawn_server()
+server = launcher.spawn_server
+held = []
+
+print(f"{'RSS (MB)':>10} {'Popen (ms)':>12} {'Popen+fork (ms)':>16} {'Spawn server (ms)':>18}")
+for rss_mb in sorted(args.rss_mb):
+    held.append(np.ones((rss_mb - sum(len(h) for h in held) // 2**20) * 2**20, dtype=np.uint8))
+
+    launcher.spawn_server = None
+    popen = launch_time(args.launches)
+    # A preexec_fn makes subprocess fork (rather than vfork/posix_spawn), as with some libraries
+    popen_fork = launch_time(args.launches, preexec_fn=no_op)
+    launcher.spawn_server = server
+    spawned = launch_time(args.launches)
+
+    print(f"{rss_mb:>10} {popen * 1000:>12.3f} {popen_fork * 1000:>16.3f} {spawned * 1000:>18.3f}")
+
+launcher.stop_spawn_server()
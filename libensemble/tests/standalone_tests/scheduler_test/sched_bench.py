@@ -0,0 +1,78 @@
+"""Standalone benchmark of the resource scheduler on synthetic node counts
+
+Times filling the resource sets of a synthetic allocation with work units of
+random sizes, with a new ResourceScheduler per alloc call (as in AllocSupport)
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from libensemble.resources.scheduler import InsufficientFreeResources, ResourceScheduler
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--nodes", type=int, nargs="+", default=[16, 128, 1024, 4096])
+parser.add_argument("--rsets_per_node", type=int, default=8)
+parser.add_argument("--gpus_per_node", type=int, default=4)
+parser.add_argument("--max_nodes_per_unit", type=int, default=4, help="Largest work unit, in nodes")
+parser.add_argument("--units_per_call", type=int, default=16, help="Work units assigned per alloc call")
+parser.add_argument("--match_slots", action="store_true")
+args = parser.parse_args()
+
+
+class SyntheticResources:
+    """The resource set layout and counts read by the scheduler (as in a ResourceManager)"""
+
+    rset_dtype = [("assigned", int), ("group", int), ("slot", int), ("gpus", bool)]
+
+    def __init__(self, num_nodes, rsets_per_node, gpus_per_node):
+        self.total_num_rsets = num_nodes * rsets_per_node
+        self.num_groups = num_nodes
+        self.rsets_per_node = rsets_per_node
+        self.gpu_rsets_per_node = min(gpus_per_node, rsets_per_node)
+        self.nongpu_rsets_per_node = rsets_per_node - self.gpu_rsets_per_node
+        self.even_groups = True
+        self.rsets = np.zeros(self.total_num_rsets, dtype=SyntheticResources.rset_dtype)
+        self.rsets["group"] = np.arange(self.total_num_rsets) // rsets_per_node + 1
+        self.rsets["slot"] = np.arange(self.total_num_rsets) % rsets_per_node
+        self.rsets["gpus"] = self.rsets["slot"] < gpus_per_node
+        self.total_num_gpu_rsets = np.count_nonzero(self.rsets["gpus"])
+        self.total_num_nongpu_rsets = np.count_nonzero(~self.rsets["gpus"])
+        self.update_free()
+
+    def update_free(self):
+        free = self.rsets["assigned"] == 0
+        self.rsets_free = np.count_nonzero(free)
+        self.gpu_rsets_free = np.count_nonzero(free & self.rsets["gpus"])
+        self.nongpu_rsets_free = np.count_nonzero(free & ~self.rsets["gpus"])
+
+
+print(f"{'nodes':>6} {'rsets':>7} {'units':>6} {'calls':>6} {'per unit (s)':>13} {'per call (s)':>13}")
+rng = np.random.default_rng(0)
+for num_nodes in args.nodes:
+    resources = SyntheticResources(num_nodes, args.rsets_per_node, args.gpus_per_node)
+    sizes = rng.integers(1, args.max_nodes_per_unit * args.rsets_per_node + 1, size=10 * resources.total_num_rsets)
+    units = calls = 0
+    elapsed = 0.0
+    worker = 1
+    full = False
+    while not full:
+        start = time.perf_counter()
+        sched = ResourceScheduler(user_resources=resources, sched_opts={"match_slots": args.match_slots})
+        for _ in range(args.units_per_call):
+            try:
+                team = sched.assign_resources(rsets_req=int(sizes[units % len(sizes)]))
+            except InsufficientFreeResources:
+                full = True
+                break
+            resources.rsets["assigned"][team] = worker
+            worker += 1
+            units += 1
+        elapsed += time.perf_counter() - start
+        resources.update_free()
+        calls += 1
+    print(
+        f"{num_nodes:>6} {resources.total_num_rsets:>7} {units:>6} {calls:>6}"
+        f" {elapsed / max(units, 1):>13.3e} {elapsed / calls:>13.3e}"
+    )
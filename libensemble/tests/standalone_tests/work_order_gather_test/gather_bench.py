@@ -0,0 +1,60 @@
+"""Standalone benchmark of the manager's work order row gather
+
+Compares the previous per-row repack loop with Manager._gather_rows
+"""
+import argparse
+import time
+
+import numpy as np
+from numpy.lib.recfunctions import repack_fields
+
+from libensemble.history import History
+from libensemble.manager import Manager
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--rows", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+parser.add_argument("--widths", type=int, nargs="+", default=[1, 10, 100])
+parser.add_argument("--extra_fields", type=int, default=4, help="Number of scalar fields sent alongside x")
+parser.add_argument("--reps", type=int, default=10)
+args = parser.parse_args()
+
+
+def loop_gather(H, H_fields, work_rows):
+    """The row-by-row gather previously used in Manager._send_work_order"""
+    new_dtype = [(name, H.dtype.fields[name][0]) for name in H_fields]
+    H_to_be_sent = np.empty(len(work_rows), dtype=new_dtype)
+    for i, row in enumerate(work_rows):
+        H_to_be_sent[i] = repack_fields(H[H_fields][row])
+    return H_to_be_sent
+
+
+def time_it(func, *fargs):
+    start = time.perf_counter()
+    for _ in range(args.reps):
+        out = func(*fargs)
+    return (time.perf_counter() - start) / args.reps, out
+
+
+print(f"{'rows':>8} {'width':>6} {'loop (s)':>12} {'bulk (s)':>12} {'speedup':>9}")
+for width in args.widths:
+    extra = [(f"p{i}", float) for i in range(args.extra_fields)]
+    n = max(args.rows)
+    sim_specs = {"in": ["x"] + [name for name, _ in extra], "out": [("f", float)]}
+    gen_specs = {"out": [("x", float, (width,))] + extra}
+    hist = History({}, sim_specs, gen_specs, {"sim_max": n}, [])
+    hist.H["x"] = np.random.uniform(size=(n, width))
+    for name, _ in extra:
+        hist.H[name] = np.random.uniform(size=n)
+
+    mgr = Manager.__new__(Manager)  # Only the history and dtype cache are required
+    mgr.hist = hist
+    mgr.packed_dtypes = {}
+
+    for nrows in args.rows:
+        work_rows = np.sort(np.random.choice(n, nrows, replace=False))
+        t_loop, out_loop = time_it(loop_gather, hist.H, sim_specs["in"], work_rows)
+        t_bulk, out_bulk = time_it(mgr._gather_rows, sim_specs["in"], work_rows)
+        assert out_loop.dtype == out_bulk.dtype, "Packed dtypes do not match"
+        for name in sim_specs["in"]:
+            assert np.array_equal(out_loop[name], out_bulk[name]), f"Gathered values differ for {name}"
+        print(f"{nrows:>8} {width:>6} {t_loop:>12.3e} {t_bulk:>12.3e} {t_loop / t_bulk:>8.1f}x")
@@ -1,3 +1,5 @@
+import time
+
 import numpy as np
 import pytest
 
@@ -414,6 +416,36 @@ def test_als_all_gen_informed():
     ), "all_gen_informed() should've returned False with given cancelled and adjusted lower bound."
 
 
+def test_als_tracked_points():
+    H_some = H.copy()
+    H_some["gen_worker"] = [1, 1, 2, 2, 1]
+    H_some["sim_started"] = [True, True, True, False, False]
+    H_some["sim_ended"] = [True, False, True, False, False]
+    H_some["gen_informed"] = [True, False, False, False, False]
+    H_some["cancel_requested"] = [False, False, False, False, True]
+
+    # Without tracked rows in libE_info, support falls back on full H masks
+    als = AllocSupport(W, True)
+    assert np.array_equal(als.unstarted_points(H_some), [3])
+    assert np.array_equal(als.running_points(H_some), [1])
+    assert np.array_equal(als.ended_not_informed_points(H_some), [2])
+    assert np.array_equal(als.ended_not_informed_points(H_some, gen_worker=1), [])
+
+    libE_info = {
+        "unstarted_rows": np.array([3]),
+        "running_rows": np.array([1]),
+        "ended_not_informed_rows": np.array([2]),
+    }
+    als_tracked = AllocSupport(W, True, libE_info=libE_info)
+    assert np.array_equal(als_tracked.ended_not_informed_points(H_some, gen_worker=2), [2])
+
+    for support in [als, als_tracked]:
+        for wid in [1, 2]:
+            assert support.all_sim_ended_by_gen(H_some, wid) == support.all_sim_ended(
+                H_some, H_some["gen_worker"] == wid
+            ), "all_sim_ended_by_gen() should match all_sim_ended() with a gen_worker filter."
+
+
 def test_als_points_by_priority():
     H_prio = H.copy()
     H_prio["priority"] = np.array([1, 2, 1, 2, 1])
@@ -429,12 +461,145 @@ def test_als_points_by_priority():
         als.points_by_priority(H_prio, eval_pts) == 1
     ), "points_by_priority() should've returned a higher-priority index."
 
+    assert (
+        als.points_by_priority(H_prio, np.nonzero(eval_pts)[0]) == 1
+    ), "points_by_priority() should accept indices of available points."
+
     als = AllocSupport(W, H_no_prio)
 
     assert (
         als.points_by_priority(H_no_prio, eval_pts) == 0
     ), "points_by_priority() should've simply returned the next point to evaluate."
 
+    assert np.array_equal(
+        AllocSupport(W, True).points_by_priority(H_prio, eval_pts, num_points=3), [1, 3, 0]
+    ), "points_by_priority() should've returned the highest priority points first."
+
+    assert np.array_equal(
+        als.points_by_priority(H_no_prio, eval_pts, num_points=2), [0, 1]
+    ), "points_by_priority() should've returned the next points to evaluate."
+
+    # With a History priority queue (as given by the manager)
+    hist = History({}, {"out": [("f", float)]}, {"out": [("priority", float)]}, {"sim_max": 5}, [])
+    hist.update_history_x_in(1, H_prio[["priority"]], safe_mode=False, gen_started_time=0)
+    als = AllocSupport(W, True, libE_info={"priority_queue": hist.priority_queue})
+    H_trim = hist.trim_H()
+    assert als.points_by_priority(H_trim, eval_pts) == 1, "Priority queue should give the same index."
+    assert np.array_equal(als.points_by_priority(H_trim, eval_pts, batch=True), [1, 3])
+    assert np.array_equal(als.points_by_priority(H_trim, eval_pts, num_points=3), [1, 3, 0])
+    assert np.array_equal(als.points_by_priority(H_trim, np.array([0, 2, 3]), num_points=2), [3, 0])
+
+
+def test_give_sim_work_first_priority_queue():
+    sim_specs, gen_specs, exit_criteria = setup.make_criteria_and_specs_0(simx=10)
+    hist = History(al, sim_specs, gen_specs, exit_criteria, H0)
+    gen_out = np.zeros(6, dtype=gen_specs["out"])
+    gen_out["priority"] = [1, 3, 2, 3, 1, 2]
+    hist.update_history_x_in(1, gen_out, safe_mode=False, gen_started_time=0)
+    hist.update_history_x_out(np.array([3]), 4)
+
+    # The points are found from the queue, given only the unstarted rows
+    queue = hist.priority_queue
+    top_args = []
+    top = queue.top
+    queue.top = lambda points_avail, *args: top_args.append(points_avail.copy()) or top(points_avail, *args)
+    libE_info = {
+        "sim_max_given": False,
+        "any_idle_workers": True,
+        "use_resource_sets": False,
+        "priority_queue": queue,
+        "unstarted_rows": hist.unstarted_rows(),
+    }
+
+    W_idle = W.copy()
+    W_idle["active"][3] = EVAL_SIM_TAG
+    Work, _ = give_sim_work_first(W_idle, hist.trim_H(), sim_specs, gen_specs, al, {}, libE_info)
+    assert [Work[wid]["libE_info"]["H_rows"].tolist() for wid in [1, 2, 3]] == [[1], [2], [5]]
+    assert np.array_equal(top_args[0], [0, 1, 2, 4, 5]) and np.array_equal(top_args[-1], [0, 4, 5])
+
+    # Rows given to earlier workers are dropped from the queue until the next alloc call
+    assert sorted(row for _, row in queue.dropped) == [1, 2] and len(queue.heap) == 3
+    queue.update()
+
+    # Including batches of points with the same priority
+    alloc_specs = {**al, "user": {"give_all_with_same_priority": True}}
+    Work, _ = give_sim_work_first(W_idle, hist.trim_H(), sim_specs, gen_specs, alloc_specs, {}, libE_info)
+    assert [Work[wid]["libE_info"]["H_rows"].tolist() for wid in [1, 2, 3]] == [[1], [2, 5], [0, 4]]
+    assert len(top_args) == 6
+
+
+def test_als_sim_batch_size():
+    als = AllocSupport(W, True, libE_info={})
+    assert als.sim_batch_size(100, 2) == 1, "Should give one point until sim times are observed"
+
+    libE_info = {"sim_time_per_point": 0.001, "manager_turnaround": 0.002, "sim_max_remaining": None}
+    als = AllocSupport(W, True, libE_info=libE_info)
+    assert als.sim_batch_size(100, 2) == 20, "Default target is turnaround / sim_batch_overhead"
+    assert als.sim_batch_size(100, 2, target_time=0.005) == 5
+    assert als.sim_batch_size(100, 2, max_size=8) == 8
+    assert als.sim_batch_size(10, 2) == 5, "Should share available points among workers"
+    assert als.sim_batch_size(100, 3, vectorized=True) == 34, "Vectorized sims should share all points"
+    assert als.sim_batch_size(100, 3, max_size=10, vectorized=True) == 10
+
+    als = AllocSupport(W, True, libE_info=dict(libE_info, sim_max_remaining=12))
+    als.sim_work(1, H, ["x"], np.arange(10), {}, batched=True)
+    assert als.sim_batch_size(100, 1) == 2, "Should not give more than sim_max"
+
+
+def test_als_backfill_work():
+    initialize_resources()
+    Resources.resources.resource_manager.assign_rsets([0, 1], 1)
+
+    # Row 0 is running on worker 1 (ending in about 1 second); row 1 needs all resource sets
+    H_bf = np.zeros(5, dtype=libE_fields + [("priority", float), ("resource_sets", int), ("runtime", float)])
+    H_bf["sim_id"] = range(5)
+    H_bf["priority"] = [0, 4, 3, 2, 1]
+    H_bf["resource_sets"] = [2, 4, 2, 1, 1]
+    H_bf["runtime"] = [2, 10, 5, 0.5, 5]
+    H_bf[["sim_started", "sim_worker"]][0] = (True, 1)
+    H_bf["sim_started_time"] = [time.time() - 1] + [np.inf] * 4
+    W_bf = W.copy()
+    W_bf["active"][0] = EVAL_SIM_TAG
+
+    alloc_specs = {"user": {}}
+    libE_info = {"sim_max_given": False, "any_idle_workers": True, "use_resource_sets": True}
+    Work, _ = give_sim_work_first(W_bf, H_bf, {"in": ["x"]}, {}, alloc_specs, {}, libE_info)
+    assert not len(Work), "Without backfill, no point should be given while the first is blocked"
+
+    alloc_specs["user"] = {"backfill": True, "backfill_runtime": "runtime"}
+    Work, _ = give_sim_work_first(W_bf, H_bf, {"in": ["x"]}, {}, alloc_specs, {}, libE_info)
+    assert list(Work) == [2], "Only one point should end before the reservation"
+    assert Work[2]["libE_info"]["H_rows"] == [3], "The short point should backfill"
+
+    # A point fitting the resource sets spare at the reservation may start anyway
+    H_bf["resource_sets"][1] = 3
+    Work, _ = give_sim_work_first(W_bf, H_bf, {"in": ["x"]}, {}, alloc_specs, {}, libE_info)
+    assert [Work[w]["libE_info"]["H_rows"][0] for w in Work] == [3, 4]
+
+    # Runtimes are predicted once for each point in an alloc call
+    predicted = []
+
+    class Estimator:
+        def predict(self, H, H_rows):
+            predicted.extend(H_rows.tolist())
+            return H["runtime"][H_rows]
+
+    alloc_specs["user"] = {"backfill": True}
+    Work, _ = give_sim_work_first(
+        W_bf, H_bf, {"in": ["x"]}, {}, alloc_specs, {}, dict(libE_info, runtime_estimator=Estimator())
+    )
+    assert [Work[w]["libE_info"]["H_rows"][0] for w in Work] == [3, 4]
+    assert sorted(predicted) == [0, 2, 3, 4], f"Unexpected predictions for rows {predicted}"
+
+    # Without runtime estimates, no reservation can be made
+    als = AllocSupport(W_bf, True, libE_info={})
+    assert not als.reserve_resources(H_bf, 1), "Should not reserve without runtime estimates"
+    als = AllocSupport(W_bf, True, libE_info={"sim_time_per_point": 2.0})
+    assert als.reserve_resources(H_bf, 1)
+    assert als.reservation["spare"] == 1 and als.reservation["time"] - time.time() < 1.5
+
+    clear_resources()
+
 
 def test_convert_to_rsets():
     user_params = []
@@ -516,7 +681,11 @@ if __name__ == "__main__":
     test_als_all_sim_started()
     test_als_all_sim_ended()
     test_als_all_gen_informed()
+    test_als_tracked_points()
     test_als_points_by_priority()
+    test_give_sim_work_first_priority_queue()
+    test_als_sim_batch_size()
+    test_als_backfill_work()
     test_convert_to_rsets()
     test_check_H_rows()
     test_check_H_fields()
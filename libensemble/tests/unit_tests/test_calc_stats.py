@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+
+"""
+Unit test of structured calc stats records for libensemble.
+"""
+
+import os
+
+import numpy as np
+
+from libensemble.message_numbers import EVAL_GEN_TAG, EVAL_SIM_TAG
+from libensemble.tools.calc_stats import (
+    CALC_STATS_DTYPE,
+    TASK_STATS_DTYPE,
+    CalcStatsWriter,
+    load_calc_stats,
+    write_stats_text,
+)
+
+
+def _calc_records(worker, calc_type, start):
+    calcs = np.zeros(2, dtype=CALC_STATS_DTYPE)
+    calcs["worker"] = worker
+    calcs["calc_num"] = [1, 2]
+    calcs["calc_type"] = calc_type
+    calcs["gen_num"] = [1, 2] if calc_type == EVAL_GEN_TAG else 0
+    calcs["sim_id_min"] = [0, 5]
+    calcs["sim_id_max"] = [0, 9]
+    calcs["num_sims"] = [1, 5] if calc_type == EVAL_SIM_TAG else 0
+    calcs["start"] = [start, start + 2]
+    calcs["end"] = [start + 1, start + 3]
+    calcs["status"] = b"Completed"
+    return calcs
+
+
+def test_calc_stats_round_trip(tmp_path):
+    "Test records added to a CalcStatsWriter are written in batches and loaded back."
+
+    path = str(tmp_path / "libE_stats")
+    writer = CalcStatsWriter(path, flush_size=3)
+    sims = _calc_records(1, EVAL_SIM_TAG, 1.0e9)
+    tasks = np.array([(1, 1, 1.0e9, 1.0e9 + 0.5), (1, 1, 1.0e9 + 0.5, 1.0e9 + 1)], dtype=TASK_STATS_DTYPE)
+    writer.add(sims, tasks)
+    assert not os.path.isdir(path), "Records should wait for flush_size"
+
+    gens = _calc_records(2, EVAL_GEN_TAG, 1.0e9)
+    writer.add(gens)
+    calcs, loaded_tasks = load_calc_stats(path)
+    assert np.array_equal(calcs, np.concatenate([sims, gens]))
+    assert np.array_equal(loaded_tasks, tasks)
+
+    # A record partially written (e.g., on abort) is not loaded
+    with open(os.path.join(path, "calcs", "worker.dat"), "ab") as f:
+        f.write(np.int32(3).tobytes())
+    assert len(load_calc_stats(path)[0]) == 4
+
+    # A new writer clears records from a previous run
+    CalcStatsWriter(path).flush()
+    calcs, loaded_tasks = load_calc_stats(path)
+    assert len(calcs) == 0 and len(loaded_tasks) == 0
+
+
+def test_write_stats_text(tmp_path):
+    "Test records are written in the format of libE_stats.txt."
+
+    path = str(tmp_path / "libE_stats")
+    writer = CalcStatsWriter(path)
+    tasks = np.array([(1, 2, 1.0e9 + 2.5, 1.0e9 + 2.75), (1, 2, 1.0e9 + 2.6, np.nan)], dtype=TASK_STATS_DTYPE)
+    writer.add(_calc_records(1, EVAL_SIM_TAG, 1.0e9), tasks)
+    writer.add(_calc_records(2, EVAL_GEN_TAG, 1.0e9 + 0.5))
+    writer.flush()
+
+    filename = str(tmp_path / "libE_stats.txt")
+    write_stats_text(path, filename, task_datetime=True)
+    with open(filename) as f:
+        lines = f.readlines()
+
+    assert len(lines) == 4
+    assert lines[0].startswith("Worker     1: sim_id     0: sim Time: 1.000 Start: ")
+    assert lines[1].startswith("Worker     2: Gen no     1: gen Time: 1.000 Start: ")
+    assert lines[2].startswith("Worker     1: sim_id   5-9: sim Time: 1.000 Start: ")
+    assert " Task 0: 0.250 Tstart: " in lines[2] and "Task" not in lines[0]
+    assert " Task 1: running Tstart: " in lines[2], "A task running when its calc returned has no end time"
+    assert all(line.endswith(" Status: Completed\n") for line in lines)
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_calc_stats_round_trip(Path(tmpdir))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_write_stats_text(Path(tmpdir))
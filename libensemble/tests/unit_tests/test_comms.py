@@ -136,6 +136,122 @@ def test_comm_logging():
         assert isinstance(msg[0], logging.LogRecord)
 
 
+def test_buffered_comm_logging():
+    "Test worker log records are sent in batches and emitted by the manager listener."
+
+    inq = tqueue.Queue()
+    outq = tqueue.Queue()
+    comm = comms.QComm(inq, outq)
+    ch = commlogs.BufferedCommLogHandler(comm, pack=lambda rec: (0, rec), capacity=3, flush_interval=60)
+    logger = logging.getLogger("libensemble_test_buffered")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(ch)
+
+    logger.info("Message %d", 1)
+    logger.info("Message %d", 2)
+    assert outq.empty(), "Records should be buffered"
+    logger.info("Message %d", 3)
+    _, records = outq.get()
+    assert [r.getMessage() for r in records] == ["Message 1", "Message 2", "Message 3"]
+
+    logger.info("Before error")
+    logger.error("Error")
+    assert len(outq.get()[1]) == 2, "An error should send the buffered records"
+    logger.info("Flushed")
+    ch.flush()
+    assert outq.get()[1][0].getMessage() == "Flushed"
+    ch.flush()
+    assert outq.empty(), "Nothing to send"
+
+    # Other handlers of the logger get the record unchanged
+    seen = []
+    other = logging.Handler()
+    other.emit = seen.append
+    logger.addHandler(other)
+    try:
+        raise ValueError("Bad value")
+    except ValueError:
+        logger.exception("Failed %s", "sim")
+    logger.removeHandler(other)
+    assert seen[0].msg == "Failed %s" and seen[0].args == ("sim",) and seen[0].exc_info is not None
+    sent = outq.get()[1][0]
+    assert sent.msg == "Failed sim" and sent.args is None and sent.exc_info is None
+    assert "Bad value" in sent.exc_text
+
+    # Manager side: records are handled by the named logger in the listener thread
+    logger.removeHandler(ch)
+    received = []
+    lh = logging.Handler()
+    lh.emit = received.append
+    logger.addHandler(lh)
+    listener = commlogs.ManagerLogListener()
+    listener.start()
+    listener.enqueue(records)
+    listener.enqueue(records[0])
+    listener.stop()
+    assert received == records + records[:1]
+    logger.removeHandler(lh)
+
+
+def worker_send_after_pause(comm, pause):
+    time.sleep(pause)
+    comm.send("ready", pause)
+    comm.recv()
+
+
+def test_wait_any():
+    "Test waiting on several comms returns only those with pending messages."
+
+    inqs = [tqueue.Queue() for _ in range(3)]
+    qcomms = [comms.QComm(inq, tqueue.Queue()) for inq in inqs]
+    assert comms.wait_any(qcomms, timeout=0.05) == [], "Check wait_any times out with no messages"
+    inqs[1].put(("a",))
+    assert comms.wait_any(qcomms, timeout=0.05) == [1], "Check wait_any finds pending message"
+    assert comms.wait_any([]) == []
+
+    pcomms = [comms.QCommProcess(worker_send_after_pause, 2, pause) for pause in [10, 0.2]]
+    for pcomm in pcomms:
+        pcomm.run()
+    try:
+        assert comms.wait_any(pcomms, timeout=0) == []
+        start = time.time()
+        assert comms.wait_any(pcomms, timeout=5) == [1], "Check wait_any wakes for process comm"
+        assert time.time() - start < 5
+        assert pcomms[1].recv() == ("ready", 0.2)
+    finally:
+        for pcomm in pcomms:
+            pcomm.terminate(timeout=1)
+
+
+def worker_team_echo(team_comms, scale):
+    for i, comm in enumerate(team_comms):
+        comm.send("echo", comm.recv()[0] * scale, i)
+    return [i * scale for i in range(len(team_comms))]
+
+
+def test_qcomm_process_group():
+    "Test several comms attached to one process."
+
+    group = comms.QCommProcess.group(3, worker_team_echo, 3, 10)
+    assert len({id(pcomm.process) for pcomm in group}) == 1, "Comms should share a process"
+    for pcomm in group:
+        pcomm.run()
+    for i, pcomm in enumerate(group):
+        pcomm.send(i + 1)
+    try:
+        for i, pcomm in enumerate(group):
+            assert pcomm.recv(timeout=30) == ("echo", (i + 1) * 10, i)
+        assert [pcomm.result(timeout=30) for pcomm in group] == [0, 10, 20]
+        assert not any(pcomm.running for pcomm in group)
+    finally:
+        for pcomm in group:
+            pcomm.terminate(timeout=1)
+
+
 if __name__ == "__main__":
     test_qcomm()
     test_comm_logging()
+    test_buffered_comm_logging()
+    test_wait_any()
+    test_qcomm_process_group()
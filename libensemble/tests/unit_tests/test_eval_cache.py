@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+"""
+Unit test of the persistent evaluation cache for libensemble.
+"""
+
+import numpy as np
+import pytest
+
+import libensemble.tests.unit_tests.setup as setup
+from libensemble.history import History
+from libensemble.message_numbers import TASK_FAILED, WORKER_DONE
+from libensemble.resources.resources import Resources
+from libensemble.tools.eval_cache import EvalCache
+
+sim_specs = {"sim_f": np.linalg.norm, "in": ["x"], "out": [("f", float), ("g", float, 2)]}
+
+
+def _evaluated_H(x):
+    H = np.zeros(len(x), dtype=[("x", float, 2), ("f", float), ("g", float, 2)])
+    H["x"] = x
+    H["f"] = np.sum(x, axis=1)
+    H["g"] = 2 * x
+    return H
+
+
+def test_eval_cache_lookup(tmp_path):
+    "Test entries are found, with a tolerance, across instances, and removed least recently used first."
+
+    path = tmp_path / "cache.db"
+    H = _evaluated_H(np.arange(20.0).reshape(10, 2))
+    cache = EvalCache(sim_specs, path=path)
+    cache.store(H, np.arange(5))
+    assert cache.stored == 5
+
+    rows, out = cache.lookup(H, np.arange(10))
+    assert np.array_equal(rows, np.arange(5))
+    assert np.array_equal(out["f"], H["f"][:5]) and np.array_equal(out["g"], H["g"][:5])
+    assert cache.hits == 5 and cache.misses == 5
+    cache.close()
+
+    # Entries persist, and inputs must match exactly without a tolerance
+    cache = EvalCache(sim_specs, path=path)
+    H_near = H.copy()
+    H_near["x"] += 1e-9
+    assert len(cache.lookup(H, [0])[0]) == 1
+    assert len(cache.lookup(H_near, [0])[0]) == 0
+    cache.close()
+
+    # Keys include the tolerance, the namespace and the sim function
+    cache = EvalCache(sim_specs, path=path, tolerance=1e-6)
+    assert len(cache.lookup(H, [0])[0]) == 0
+    cache.store(H, np.arange(5))
+    assert np.array_equal(cache.lookup(H_near, np.arange(10))[0], np.arange(5))
+    assert len(EvalCache(sim_specs, path=path, tolerance=1e-6, namespace="b").lookup(H, [0])[0]) == 0
+    assert len(EvalCache({**sim_specs, "sim_f": np.sum}, path=path).lookup(H, [0])[0]) == 0
+
+    # The least recently used entries are removed beyond max_entries
+    cache = EvalCache(sim_specs, path=tmp_path / "lru.db", max_entries=3)
+    for row in range(3):
+        cache.store(H, [row])
+    cache.lookup(H, [0])
+    cache.store(H, [3])
+    assert np.array_equal(cache.lookup(H, np.arange(4))[0], [0, 2, 3])
+    cache.store(H, [0, 3])
+    assert cache.num_entries == 3, "Entries stored again should not be counted twice"
+    cache.close()
+    assert EvalCache(sim_specs, path=tmp_path / "lru.db", max_entries=3).num_entries == 3
+
+    with pytest.raises(ValueError):
+        EvalCache(sim_specs, path=path, tolerance=0)
+
+
+def test_eval_cache_in_history(tmp_path):
+    "Test points found in the cache are marked evaluated when a gen returns them, and results are stored."
+
+    Resources.resources = None
+    specs, gen_specs, exit_criteria = setup.make_criteria_and_specs_1(simx=10)
+    hist = History({}, specs, gen_specs, exit_criteria, [])
+    hist.set_eval_cache(EvalCache(specs, path=tmp_path / "cache.db"))
+
+    D = np.zeros(4, dtype=gen_specs["out"])
+    D["x"] = [0.0, 1.0, 2.0, 3.0]
+    hist.update_history_x_in(1, D, safe_mode=False, gen_started_time=0)
+    assert hist.eval_cache.misses == 4 and hist.sim_ended_count == 0
+
+    # Successful sims are stored, but failed ones are not
+    hist.update_history_x_out(np.arange(4), 2)
+    hist.H["g"][:4] = [10.0, 11.0, 12.0, 13.0]
+    for rows, status in [([0, 1], WORKER_DONE), ([2], TASK_FAILED), ([3], None)]:
+        D_recv = {"libE_info": {"H_rows": np.array(rows)}, "calc_out": None}
+        if status is not None:
+            D_recv["calc_status"] = status
+        hist.update_history_f(D_recv, safe_mode=False)
+    assert hist.eval_cache.stored == 3
+
+    hist.update_history_x_in(1, D, safe_mode=False, gen_started_time=0)
+    H = hist.trim_H()
+    assert np.array_equal(H["sim_ended"][4:], [True, True, False, True])
+    assert np.array_equal(H["g"][4:], [10.0, 11.0, 0.0, 13.0])
+    assert np.all(H["sim_worker"][4:] == 0)
+    assert hist.sim_started_count == 7 and hist.sim_ended_count == 7
+    assert np.array_equal(hist.unstarted_rows(), [6])
+    assert np.array_equal(hist.ended_not_informed_rows(), [0, 1, 2, 3, 4, 5, 7])
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_eval_cache_lookup(Path(tmpdir))
+        test_eval_cache_in_history(Path(tmpdir))
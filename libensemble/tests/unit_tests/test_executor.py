@@ -1,17 +1,27 @@
 # !/usr/bin/env python
 # Integration test of executor module for libensemble
 # Test does not require running full libensemble
+import logging
+import math
 import os
 import platform
+import queue
 import re
 import socket
 import sys
+import threading
 import time
 
+import numpy as np
 import pytest
 
-from libensemble.executors.executor import NOT_STARTED_STATES, Executor, ExecutorException, TimeoutExpired
+from libensemble.comms.comms import QComm
+from libensemble.comms.logs import BufferedCommLogHandler, LogConfig
+from libensemble.executors.executor import NOT_STARTED_STATES, Executor, ExecutorException, TaskRegistry, TimeoutExpired
+from libensemble.message_numbers import EVAL_SIM_TAG
 from libensemble.resources.mpi_resources import MPIResourcesException
+from libensemble.utils.thread_local import use_thread_local
+from libensemble.worker import Worker
 
 NCORES = 1
 build_sims = ["my_simtask.c", "my_serialtask.c", "c_startup.c"]
@@ -724,6 +734,135 @@ def test_serial_exes():
     assert task.state == "FINISHED", "task.state should be FINISHED. Returned " + str(task.state)
 
 
+def test_task_retention():
+    setup_serial_executor()
+    exctr = Executor.executor
+    exctr.list_of_tasks.retention = 2
+    tasks = [exctr.submit(calc_type="sim", app_args="sleep 0") for _ in range(4)]
+    for task in tasks:
+        task.wait()
+    assert len(exctr.list_of_tasks) == 4, "Tasks should be kept until their timing is reported"
+    assert exctr.get_task(tasks[0].id) is tasks[0]
+
+    assert len(exctr.new_tasks_times()) == 4
+    assert len(exctr.new_tasks_times()) == 0, "Tasks should only be reported once"
+    assert exctr.get_task(tasks[0].id) is None, "Reported, finished tasks beyond retention should be released"
+    assert list(exctr.list_of_tasks) == tasks[2:] and tasks[3] in exctr.list_of_tasks
+
+    # Running tasks are kept
+    long_task = exctr.submit(calc_type="sim", app_args="sleep 5")
+    exctr.new_tasks_times()
+    for _ in range(2):
+        exctr.submit(calc_type="sim", app_args="sleep 0").wait()
+    assert exctr.list_of_tasks[0] is long_task and len(exctr.list_of_tasks) == 3
+    long_task.kill()
+
+
+def test_new_tasks_times_running():
+    setup_serial_executor()
+    exctr = Executor.executor
+    exctr.new_tasks_times()
+    long_task = exctr.submit(calc_type="sim", app_args="sleep 5")
+    short_task = exctr.submit(calc_type="sim", app_args="sleep 0")
+    time.sleep(0.5)  # The short task ends, but is not polled
+    (long_start, long_end), (short_start, short_end) = exctr.new_tasks_times()
+    assert math.isnan(long_end), "A task still running should have no end time"
+    assert short_task.finished and short_start <= short_end <= time.time()
+    assert long_start <= short_start
+    long_task.kill()
+
+
+def test_executor_sends_buffered_logs():
+    setup_serial_executor()
+    exctr = Executor.executor
+    outq = queue.Queue()
+    handler = BufferedCommLogHandler(QComm(queue.Queue(), outq), pack=lambda rec: (0, rec), flush_interval=60)
+    logger = logging.getLogger(LogConfig.config.name)
+    level = logger.level
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    try:
+        task = exctr.submit(calc_type="sim", app_args="sleep 0.2")
+        records = outq.get_nowait()[1]
+        assert records[-1].getMessage().startswith("Launching task"), "Submit should send the launch record"
+        logger.info("Before wait")
+        task.wait()
+        assert outq.get_nowait()[1][0].getMessage() == "Before wait", "Records should be sent before waiting"
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+
+
+def test_vectorized_sim_task_stats():
+    setup_serial_executor()
+    exctr = Executor.executor
+
+    def sim_f(H, persis_info, sim_specs, libE_info):
+        for _ in range(2):
+            exctr.submit(calc_type="sim", app_args="sleep 0").wait()
+        return np.zeros(len(H), dtype=sim_specs["out"]), persis_info
+
+    sim_specs = {"sim_f": sim_f, "in": ["x"], "out": [("f", float)], "vectorized": True}
+    worker = Worker(QComm(queue.Queue(), queue.Queue()), {}, 1, sim_specs, {}, {"stats_fmt": {"task_timing": True}})
+    Work = {"tag": EVAL_SIM_TAG, "persis_info": {}, "libE_info": {"H_rows": np.array([4, 5, 6])}}
+
+    lines = []
+    handler = logging.Handler()
+    handler.emit = lambda record: lines.append(record.getMessage())
+    logger = logging.getLogger(LogConfig.config.stats_name)
+    level = logger.level
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    try:
+        out, _, _ = worker._handle_batched_calc(Work, np.zeros(3, dtype=[("x", float)]))
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+
+    assert len(out) == 3 and len(lines) == 3, "Expected a stats line for each row"
+    for row, line in zip([4, 5, 6], lines):
+        assert line.startswith(f"sim_id {row:5d}: sim Time:"), f"Unexpected stats line {line}"
+        assert "Task 0:" in line and "Task 1:" in line, "Each row's line should list the tasks of the sim"
+
+
+def test_polling_loop_wakes_on_exit():
+    setup_serial_executor()
+    exctr = Executor.executor
+    task = exctr.submit(calc_type="sim", app_args="sleep 0.2")
+    start = time.time()
+    exctr.polling_loop(task, delay=5)
+    assert task.state == "FINISHED", "task.state should be FINISHED. Returned " + str(task.state)
+    assert time.time() - start < 2, "Polling loop should return when the task ends, not after delay"
+
+
+def test_thread_local_worker_info():
+    setup_serial_executor()
+    exctr = Executor.executor
+    exctr.set_worker_info(None, 1)
+    retention = exctr.list_of_tasks.retention
+    use_thread_local(exctr, list_of_tasks=lambda: TaskRegistry(retention))
+    assert exctr.workerID == 1, "Current values should be kept for the current thread"
+
+    tasks = {}
+
+    def run_worker(workerID):
+        exctr.set_worker_info(None, workerID)
+        task = exctr.submit(calc_type="sim", app_args="sleep 0")
+        task.wait()
+        tasks[workerID] = (task, list(exctr.list_of_tasks), exctr.workerID)
+
+    threads = [threading.Thread(target=run_worker, args=(w,)) for w in [2, 3]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(tasks) == 2, "Each thread should have run a task"
+    for workerID, (task, task_list, thread_workerID) in tasks.items():
+        assert thread_workerID == workerID and task.workerID == workerID
+        assert task_list == [task], "Each thread should hold its own tasks"
+    assert exctr.workerID == 1 and not len(exctr.list_of_tasks)
+
+
 def test_serial_startup_times():
     setup_executor_startups()
     exctr = Executor.executor
@@ -849,6 +988,12 @@ if __name__ == "__main__":
     test_retries_run_fail()
     test_register_apps()
     test_serial_exes()
+    test_task_retention()
+    test_new_tasks_times_running()
+    test_executor_sends_buffered_logs()
+    test_vectorized_sim_task_stats()
+    test_polling_loop_wakes_on_exit()
+    test_thread_local_worker_info()
     test_serial_startup_times()
     test_futures_interface()
     test_futures_interface_cancel()
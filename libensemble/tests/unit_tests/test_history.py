@@ -1,9 +1,18 @@
 import numpy as np
+import pytest
 from numpy import inf
 
 import libensemble.tests.unit_tests.setup as setup
+from libensemble.history import History
 from libensemble.message_numbers import WORKER_DONE
 from libensemble.tools.fields_keys import libE_fields
+from libensemble.tools.history_checkpoint import (
+    HistoryCheckpoint,
+    load_checkpoint_offsets,
+    load_H_checkpoint,
+    load_restart,
+)
+from libensemble.utils.shared_array import SharedArray
 
 if tuple(np.__version__.split(".")) >= ("1", "15"):
     from numpy.lib.recfunctions import repack_fields
@@ -132,6 +141,59 @@ def test_grow_H():
     assert hist.gen_informed_count == 0
 
 
+def test_grow_H_amortized():
+    hist, _, _, _, _ = setup.hist_setup1(3)
+    hist.H["f"] = [1.0, 2.0, 3.0]
+    buffers = set()
+    for _ in range(100):
+        hist.grow_H(k=1)
+        buffers.add(id(hist.H_buffer))
+
+    assert len(hist.H) == 103
+    assert len(hist.H_buffer) >= len(hist.H)
+    assert len(buffers) <= 7, "Backing buffer should only be reallocated a logarithmic number of times"
+    assert np.shares_memory(hist.H, hist.H_buffer)
+    assert np.array_equal(hist.H["f"][:3], [1.0, 2.0, 3.0])
+    assert np.all(hist.H["sim_id"] == -1)
+    assert np.all(hist.H["sim_started_time"] == inf)
+    assert np.all(hist.H["gen_informed_time"] == inf)
+
+
+def test_shared_H():
+    sim_specs, gen_specs, exit_criteria = setup.make_criteria_and_specs_0(simx=4)
+    hist = History({}, sim_specs, gen_specs, exit_criteria, [], use_shared_memory=True)
+    assert np.shares_memory(hist.H, hist.shared.array)
+
+    # A worker attaches by name and writes output in place
+    name, length = hist.checkout_shared()
+    worker_H = SharedArray(length, hist.H.dtype, name=name)
+    worker_H.array["f"][[0, 1]] = [1.0, 2.0]
+    assert np.array_equal(hist.H["f"][:2], [1.0, 2.0])
+
+    # Growing H moves it to a new block, but keeps the checked out one
+    hist.grow_H(k=10)
+    assert hist.shared.name != name
+    worker_H.array["f"][2] = 3.0
+    worker_H.close()
+
+    D_recv = {
+        "calc_out": None,
+        "libE_info": {"H_rows": np.array([0, 1, 2]), "H_shm": (name, length), "H_shm_fields": ["f"]},
+    }
+    hist.update_history_f(D_recv, safe_mode)
+    assert np.array_equal(hist.H["f"][:3], [1.0, 2.0, 3.0])
+    assert np.all(hist.H["sim_ended"][:3])
+    assert not hist._retired_shared, "Retired block should be removed once no work refers to it"
+
+    current = hist.shared.name
+    hist.release_shared_memory()
+    assert hist.shared is None
+    assert np.array_equal(hist.H["f"][:3], [1.0, 2.0, 3.0])
+    for block in [name, current]:
+        with pytest.raises(FileNotFoundError):
+            SharedArray(length, hist.H.dtype, name=block)
+
+
 def test_trim_H():
     hist, _, _, _, _ = setup.hist_setup1(13)
     hist.index = 10
@@ -231,6 +293,121 @@ def test_update_history_x_in():
         assert 0, "Didn't fail like it should have"
 
 
+def test_tracked_rows():
+    hist, _, gen_specs, _, _ = setup.hist_setup2(7)
+    H_o = np.zeros(5, dtype=gen_specs["out"])
+    hist.update_history_x_in(2, H_o, safe_mode, np.inf)
+    assert np.array_equal(hist.unstarted_rows(), range(5))
+
+    hist.update_history_x_out(np.array([3, 1]), 4)
+    hist.H["cancel_requested"][4] = True
+    assert np.array_equal(hist.unstarted_rows(), [0, 2])
+    assert np.array_equal(hist.running_rows(), [1, 3])
+
+    calc_out = np.zeros(1, dtype=[("g", float)])
+    hist.update_history_f({"libE_info": {"H_rows": np.array([3])}, "calc_out": calc_out}, safe_mode)
+    assert np.array_equal(hist.running_rows(), [1])
+    assert np.array_equal(hist.ended_not_informed_rows(), [3])
+
+    hist.update_history_to_gen(np.array([3]))
+    assert len(hist.ended_not_informed_rows()) == 0
+
+    # Tracked rows must match the full-history masks
+    H = hist.trim_H()
+    assert np.array_equal(hist.unstarted_rows(), np.nonzero(~H["sim_started"] & ~H["cancel_requested"])[0])
+    assert np.array_equal(hist.running_rows(), np.nonzero(H["sim_started"] & ~H["sim_ended"])[0])
+
+
+def test_priority_queue():
+    sim_specs, gen_specs, exit_criteria = setup.make_criteria_and_specs_0(simx=10)
+    hist = History({}, sim_specs, gen_specs, exit_criteria, [])
+
+    gen_out = np.zeros(6, dtype=gen_specs["out"])
+    gen_out["priority"] = [1, 3, 2, 3, 1, 2]
+    hist.update_history_x_in(1, gen_out, safe_mode=False, gen_started_time=0)
+    queue = hist.priority_queue
+    avail = np.ones(hist.index, dtype=bool)
+
+    assert np.array_equal(queue.top(avail, num_points=4), [1, 3, 2, 5])
+    assert np.array_equal(queue.top(avail, batch=True), [1, 3])
+    avail[3] = False
+    assert np.array_equal(queue.top(avail, num_points=2), [1, 2]), "Unavailable points should be skipped"
+    assert np.array_equal(queue.top(np.array([0, 2, 4, 5]), batch=True), [2, 5]), "Indices may be given instead"
+
+    # Given rows are dropped until the next update, unless started by then
+    assert np.array_equal(queue.top(np.array([0, 2, 4, 5]), num_points=2, given={1, 3}), [2, 5])
+    assert len(queue.heap) == 4 and sorted(row for _, row in queue.dropped) == [1, 3]
+    hist.update_history_x_out(np.array([1]), 2)
+    queue.update()
+    assert len(queue.heap) == 5 and not queue.dropped
+    assert np.array_equal(queue.top(avail, num_points=2), [2, 5])
+
+    # Started and cancelled points are dropped, and updated priorities are used
+    hist.H["cancel_requested"][2] = True
+    updates = np.zeros(1, dtype=[("sim_id", int), ("priority", float)])
+    updates["sim_id"] = 4
+    updates["priority"] = 5
+    hist.update_history_x_in(1, updates, safe_mode=False, gen_started_time=0)
+    assert np.array_equal(queue.top(np.ones(hist.index, dtype=bool), num_points=6), [4, 3, 5, 0])
+    assert len(queue.heap) == 4, "Stale entries should have been removed"
+
+
+def test_H_checkpoint(tmp_path):
+    hist, _, gen_specs, _, _ = setup.hist_setup2(7)
+    checkpoint = HistoryCheckpoint(str(tmp_path / "checkpoint"))
+    hist.update_history_x_in(2, np.zeros(4, dtype=gen_specs["out"]), safe_mode, np.inf)
+    checkpoint.write(hist)  # The first checkpoint writes all rows
+    assert len(hist.changed_rows()) == 0
+
+    # Only rows updated since are appended
+    hist.update_history_x_out(np.array([1, 2]), 3)
+    calc_out = np.zeros(1, dtype=[("g", float)])
+    calc_out["g"] = 5.0
+    hist.update_history_f({"libE_info": {"H_rows": np.array([2])}, "calc_out": calc_out}, safe_mode)
+    hist.update_history_x_in(2, np.zeros(3, dtype=gen_specs["out"]), safe_mode, np.inf)
+    assert np.array_equal(hist.changed_rows(), [1, 2, 4, 5, 6])
+    hist.mark_changed([1, 2, 4, 5, 6])
+    checkpoint.write(hist)
+
+    with open(tmp_path / "checkpoint" / "sim_id.dat", "rb") as f:
+        assert len(f.read()) == (4 + 5) * hist.H.dtype["sim_id"].itemsize
+    H = load_H_checkpoint(str(tmp_path / "checkpoint"))
+    assert H.dtype == hist.H.dtype
+    compare_hists(H, hist.trim_H())
+
+    # A checkpoint that did not finish writing its journal entry is ignored
+    hist.update_history_x_out(np.array([5]), 1)
+    checkpoint.write(hist)
+    with open(tmp_path / "checkpoint" / "journal.dat", "r+b") as f:
+        f.truncate(len(f.read()) - 1)
+    H = load_H_checkpoint(str(tmp_path / "checkpoint"))
+    assert not H["sim_started"][5] and H["sim_started"][2]
+
+
+def test_load_restart(tmp_path):
+    hist, _, gen_specs, _, _ = setup.hist_setup2(7)
+    hist.update_history_x_in(2, np.zeros(4, dtype=gen_specs["out"]), safe_mode, np.inf)
+    hist.update_history_x_out(np.array([0, 1, 2]), 3)
+    calc_out = np.zeros(1, dtype=[("g", float)])
+    hist.update_history_f({"libE_info": {"H_rows": np.array([0])}, "calc_out": calc_out}, safe_mode)
+    hist.H["cancel_requested"][2] = True
+    hist.sim_ended_offset = 5
+    persis_info = {"next_to_give": 3, 1: {"seed": 1}}
+    HistoryCheckpoint(str(tmp_path)).write(hist, persis_info=persis_info)
+
+    # The in-progress sim is given out again, but not the cancelled one
+    H0, restored = load_restart(str(tmp_path), {"next_to_give": 0, 2: {"seed": 2}})
+    assert np.array_equal(H0["sim_started"], [True, False, True, False])
+    assert H0["sim_started_time"][1] == np.inf and H0["sim_worker"][1] == 0
+    assert restored == {"next_to_give": 0, 1: {"seed": 1}, 2: {"seed": 2}}
+    assert load_checkpoint_offsets(str(tmp_path))["sim_ended_offset"] == 5
+
+    # A full H0 is copied whole
+    restarted = History({}, {}, gen_specs, {}, H0)
+    assert restarted.H.dtype == H0.dtype
+    compare_hists(restarted.H[:4], H0)
+
+
 def test_update_history_x_in_sim_ids():
     hist, _, gen_specs, _, _ = setup.hist_setup2A_genout_sim_ids(7)
 
@@ -524,13 +701,24 @@ def test_H0_str_fields_conversion():
 
 
 if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
     test_hist_init_1()
     test_hist_init_1A_H0()
     test_hist_init_2()
     test_grow_H()
+    test_grow_H_amortized()
+    test_shared_H()
     test_trim_H()
     test_update_history_x_in_Oempty()
     test_update_history_x_in()
+    test_tracked_rows()
+    test_priority_queue()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_H_checkpoint(Path(tmpdir))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_load_restart(Path(tmpdir))
     test_update_history_x_in_sim_ids()
     test_update_history_x_out()
     test_update_history_f()
@@ -5,6 +5,9 @@ Unit test of launcher helpers for libensemble.
 """
 
 import sys
+import time
+
+import pytest
 
 import libensemble.utils.launcher as launcher
 
@@ -62,3 +65,43 @@ def xtest_submit():
 
 def test_launch():
     xtest_submit()
+
+
+def test_wait_for_exit():
+    "Test waiting returns when a process exits, with pidfds and with a waiting thread."
+
+    py_exe = sys.executable or "python"
+    for use_thread in [False, True]:
+        process = launcher.launch([py_exe, "-c", "import time; time.sleep(0.3)"])
+        if use_thread:
+            launcher._exit_event(process)
+        assert not launcher.wait_for_exit(process, 0.05), "Process stopped early."
+        start = time.time()
+        assert launcher.wait_for_exit(process, 10), "Process should have stopped."
+        assert time.time() - start < 5, "Wait should return when the process exits."
+        assert process.returncode == 0
+        assert launcher.wait(process, 0) == 0, "Wait on an ended process should return its returncode."
+
+
+def test_spawn_server(tmp_path):
+    "Test launching, waiting on and killing processes from a spawn server."
+
+    py_exe = sys.executable or "python"
+    launcher.start_spawn_server()
+    try:
+        with open(tmp_path / "out.txt", "w") as out:
+            process = launcher.launch(
+                [py_exe, "-c", "import os, sys; print(os.getcwd()); sys.exit(3)"], cwd=str(tmp_path), stdout=out
+            )
+        assert launcher.wait(process, 10) == 3, "Exit code should be that of the process."
+        assert (tmp_path / "out.txt").read_text().strip() == str(tmp_path), "Output should be in the file."
+
+        process = launcher.launch([py_exe, "launch_busy.py"], start_new_session=True)
+        assert not launcher.process_is_stopped(process, 0.2), "Process stopped early."
+        assert launcher.cancel(process, 0.5) != 0, "Process should have been killed."
+
+        with pytest.raises(FileNotFoundError):
+            launcher.launch(["no_such_app_for_the_spawn_server"])
+    finally:
+        launcher.stop_spawn_server()
+    assert launcher.spawn_server is None
@@ -52,7 +52,30 @@ def test_term_test_3():
     assert mgr.term_test()
 
 
+def test_gather_rows():
+    # Bulk gather should match a row-by-row repack of the requested fields
+    hist, sim_specs, gen_specs, exit_criteria, al = setup.hist_setup1(n=3)
+    mgr = man.Manager(hist, libE_specs, al, sim_specs, gen_specs, exit_criteria)
+    hist.H["x_on_cube"] = np.random.uniform(size=(len(hist.H), 3))
+    hist.H["priority"] = np.arange(len(hist.H))
+
+    H_fields = ["x_on_cube", "priority"]
+    work_rows = np.array([7, 2, 5])
+    H_sent = mgr._gather_rows(H_fields, work_rows)
+
+    assert H_sent.dtype.names == tuple(H_fields)
+    for i, row in enumerate(work_rows):
+        expected = numpy.lib.recfunctions.repack_fields(hist.H[H_fields][row])
+        assert np.array_equal(H_sent[i]["x_on_cube"], expected["x_on_cube"])
+        assert H_sent[i]["priority"] == expected["priority"]
+
+    # Packed dtype is cached per field tuple
+    assert mgr._get_packed_dtype(H_fields) is mgr._get_packed_dtype(H_fields)
+    assert len(mgr.packed_dtypes) == 1
+
+
 if __name__ == "__main__":
     test_term_test_1()
     test_term_test_2()
     test_term_test_3()
+    test_gather_rows()
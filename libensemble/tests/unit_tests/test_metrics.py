@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+"""
+Unit test of manager loop metrics for libensemble.
+"""
+
+import json
+import time
+
+import libensemble.manager as man
+import libensemble.tests.unit_tests.setup as setup
+from libensemble.utils.metrics import JSONLinesSink, ManagerMetrics
+
+
+def test_metrics_report(tmp_path):
+    "Test counters, timers and gauges are reported to the sinks."
+
+    reports = []
+    sink = JSONLinesSink(str(tmp_path / "metrics.jsonl"))
+    metrics = ManagerMetrics([sink, reports.append], interval=60)
+
+    for _ in range(3):
+        with metrics.timer("alloc_work"):
+            time.sleep(0.01)
+    metrics.count("manager_loops")
+    metrics.count("bytes_sent", 80, worker=2)
+    metrics.count("bytes_sent", 40, worker=2)
+    metrics.gauge("queue_depth", 3)
+    metrics.gauge("queue_depth", 1)
+
+    metrics.report()
+    assert not reports, "Reports should wait for the interval"
+    metrics.close()
+
+    report = reports[0]
+    assert report["timers"]["alloc_work"]["count"] == 3
+    assert 0.03 <= report["timers"]["alloc_work"]["total"] < 1
+    assert report["counters"] == {"manager_loops": 1}
+    assert report["workers"] == {"2": {"bytes_sent": 120}}
+    assert report["gauges"]["queue_depth"] == {"last": 1, "max": 3}
+
+    with open(tmp_path / "metrics.jsonl") as f:
+        assert [json.loads(line) for line in f] == reports
+
+
+def test_manager_metrics_sinks(tmp_path):
+    "Test the manager sets up sinks from libE_specs."
+
+    reports = []
+    libE_specs = {"comms": "local", "metrics_file": True, "metrics_callback": reports.append}
+    libE_specs["workflow_dir_path"] = str(tmp_path)
+    hist, sim_specs, gen_specs, exit_criteria, al = setup.hist_setup1()
+    mgr = man.Manager(hist, libE_specs, al, sim_specs, gen_specs, exit_criteria)
+    mgr.metrics.count("manager_loops")
+    mgr.metrics.close()
+
+    assert reports[0]["counters"] == {"manager_loops": 1}
+    assert (tmp_path / "libE_metrics.jsonl").exists()
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_metrics_report(Path(tmpdir))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_manager_metrics_sinks(Path(tmpdir))
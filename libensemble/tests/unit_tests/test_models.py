@@ -114,6 +114,21 @@ def test_libe_specs_invalid():
         flag = 1
     assert flag, "LibeSpecs didn't raise ValidationError on invalid specs"
 
+    bad_specs = {"comms": "local", "nworkers": 4, "workers_per_process": 2, "profile": True}
+    try:
+        LibeSpecs.parse_obj(bad_specs)
+        flag = 0
+    except ValidationError:
+        flag = 1
+    assert flag, "LibeSpecs didn't raise ValidationError for profile with workers_per_process"
+
+    try:
+        LibeSpecs.parse_obj({"comms": "tcp", "nworkers": 4, "use_shared_H": True})
+        flag = 0
+    except ValidationError:
+        flag = 1
+    assert flag, "LibeSpecs didn't raise ValidationError for use_shared_H with TCP comms"
+
 
 def test_ensemble_specs():
     sim_specs, gen_specs, exit_criteria = setup.make_criteria_and_specs_0()
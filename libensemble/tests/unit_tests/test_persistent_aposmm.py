@@ -60,6 +60,127 @@ def test_update_history_optimal():
     assert opt_ind == 9, "Wrong point declared minimum"
 
 
+@pytest.mark.extra
+def test_update_history_dist_index():
+    from libensemble.gen_funcs.aposmm_distance_support import BetterPointIndex
+    from libensemble.gen_funcs.persistent_aposmm import initialize_dists_and_inds, update_history_dist
+
+    n = 3
+    rng = np.random.default_rng(2)
+    H = np.zeros(3000, dtype=[("x_on_cube", float, n), ("f", float), ("local_pt", bool), ("known_to_aposmm", bool),
+                              ("sim_ended", bool), ("sim_id", int), ("dist_to_unit_bounds", float),
+                              ("dist_to_better_l", float), ("dist_to_better_s", float),
+                              ("ind_of_better_l", int), ("ind_of_better_s", int)])  # fmt: skip
+    H["x_on_cube"] = rng.uniform(size=(len(H), n))
+    H["f"] = rng.uniform(size=len(H))
+    H["local_pt"] = rng.uniform(size=len(H)) < 0.3
+    H["sim_id"] = range(len(H))
+    initialize_dists_and_inds(H, len(H))
+
+    # Points return in batches of varying size (some are evaluated later), with the first known from the start
+    H["sim_ended"][:500] = True
+    H["known_to_aposmm"][:200] = True
+    dist_index = BetterPointIndex()
+    update_history_dist(H, n, dist_index)
+    while not np.all(H["sim_ended"]):
+        waiting = np.nonzero(~H["sim_ended"])[0]
+        H["sim_ended"][rng.choice(waiting, min(len(waiting), rng.integers(1, 40)), replace=False)] = True
+        update_history_dist(H, n, dist_index)
+
+    assert np.all(H["known_to_aposmm"])
+    X = H["x_on_cube"][200:]
+    assert np.allclose(H["dist_to_unit_bounds"][200:], np.minimum(1 - X, X).min(axis=1))
+
+    # Compare to the nearest better points of each kind over all points (except the ones initially known)
+    dists = np.linalg.norm(H["x_on_cube"][:, None, :] - H["x_on_cube"][None, :, :], axis=2)
+    for kind, dist_field, ind_field in [(False, "dist_to_better_s", "ind_of_better_s"),
+                                        (True, "dist_to_better_l", "ind_of_better_l")]:  # fmt: skip
+        better = (H["f"][None, :] < H["f"][:, None]) & (H["local_pt"] == kind)[None, :]
+        kind_dists = np.where(better, dists, np.inf)
+        assert np.allclose(H[dist_field][200:], kind_dists.min(axis=1)[200:])
+        has_better = np.isfinite(H[dist_field][200:])
+        assert np.array_equal(H[ind_field][200:][has_better], kind_dists.argmin(axis=1)[200:][has_better])
+        assert np.all(H[ind_field][200:][~has_better] == -1)
+
+
+def _update_history_dist_loop(H):
+    """The nearest better point updates of update_history_dist, one new point at a time (for comparison)"""
+    p = H["sim_ended"] & ~np.isnan(H["f"])
+    for new_ind in np.nonzero(~H["known_to_aposmm"] & p)[0]:
+        H["known_to_aposmm"][new_ind] = True
+        dist_to_all = np.linalg.norm(H["x_on_cube"][p] - H["x_on_cube"][new_ind], axis=1)
+        new_better_than = H["f"][new_ind] < H["f"][p]
+        for kind, dist_field, ind_field in [(False, "dist_to_better_s", "ind_of_better_s"),
+                                            (True, "dist_to_better_l", "ind_of_better_l")]:  # fmt: skip
+            if H["local_pt"][new_ind] == kind:
+                inds_of_p = (dist_to_all < H[dist_field][p]) & new_better_than
+                H[dist_field][np.nonzero(p)[0][inds_of_p]] = dist_to_all[inds_of_p]
+                H[ind_field][np.nonzero(p)[0][inds_of_p]] = new_ind
+            better_than_new = ~new_better_than & (H["local_pt"][p] == kind) & (H["sim_id"][p] != new_ind)
+            if np.any(better_than_new):
+                ind = dist_to_all[better_than_new].argmin()  # The lowest row on ties
+                H[ind_field][new_ind] = H["sim_id"][p][np.nonzero(better_than_new)[0][ind]]
+                H[dist_field][new_ind] = dist_to_all[better_than_new][ind]
+
+
+@pytest.mark.extra
+def test_update_history_dist_ties():
+    from libensemble.gen_funcs.aposmm_distance_support import BetterPointIndex
+    from libensemble.gen_funcs.persistent_aposmm import initialize_dists_and_inds, update_history_dist
+
+    # Points on a coarse lattice, so many are at exactly the same distance (or at the same point)
+    n = 2
+    rng = np.random.default_rng(20)
+    H = np.zeros(1500, dtype=[("x_on_cube", float, n), ("f", float), ("local_pt", bool), ("known_to_aposmm", bool),
+                              ("sim_ended", bool), ("sim_id", int), ("dist_to_unit_bounds", float),
+                              ("dist_to_better_l", float), ("dist_to_better_s", float),
+                              ("ind_of_better_l", int), ("ind_of_better_s", int)])  # fmt: skip
+    H["x_on_cube"] = np.round(8 * rng.uniform(size=(len(H), n))) / 8
+    H["f"] = rng.uniform(size=len(H))
+    H["local_pt"] = rng.uniform(size=len(H)) < 0.3
+    H["sim_id"] = range(len(H))
+    initialize_dists_and_inds(H, len(H))
+
+    H_loop = H.copy()
+    dist_index = BetterPointIndex()
+    while not np.all(H["sim_ended"]):
+        waiting = np.nonzero(~H["sim_ended"])[0]
+        ended = rng.choice(waiting, min(len(waiting), rng.integers(1, 40)), replace=False)
+        H["sim_ended"][ended] = H_loop["sim_ended"][ended] = True
+        update_history_dist(H, n, dist_index)
+        _update_history_dist_loop(H_loop)
+
+    assert dist_index.tree is not None
+    for field in ["dist_to_better_l", "dist_to_better_s", "ind_of_better_l", "ind_of_better_s"]:
+        assert np.array_equal(H[field], H_loop[field]), f"{field} differs from one point at a time updates"
+
+
+@pytest.mark.extra
+def test_localopt_thread_backend():
+    from libensemble.gen_funcs.aposmm_localopt_support import LocalOptInterfacer
+
+    user_specs = {
+        "lb": np.zeros(2),
+        "ub": np.ones(2),
+        "localopt_method": "scipy_Nelder-Mead",
+        "opt_return_codes": [0],
+        "localopt_backend": "thread",
+    }
+    data = np.zeros(1, dtype=[("x_on_cube", float, 2), ("f", float)])
+    data["x_on_cube"] = [0.2, 0.4]
+    data["f"] = 1.0
+    opter = LocalOptInterfacer(user_specs, data["x_on_cube"][0], data["f"][0])
+
+    for _ in range(3):
+        x_new = opter.iterate(data[0])
+        data["x_on_cube"] = x_new
+        data["f"] = np.sum(x_new**2)
+
+    assert opter.process.is_alive(), "Run should be waiting for its next function value"
+    opter.destroy()
+    assert not opter.process.is_alive() and not opter.is_running, "Run thread should have stopped"
+
+
 def combined_func(x):
     return six_hump_camel_func(x), six_hump_camel_grad(x)
 
@@ -171,5 +292,8 @@ def test_standalone_persistent_aposmm_combined_func():
 if __name__ == "__main__":
     test_persis_aposmm_localopt_test()
     test_update_history_optimal()
+    test_update_history_dist_index()
+    test_update_history_dist_ties()
+    test_localopt_thread_backend()
     test_standalone_persistent_aposmm()
     test_standalone_persistent_aposmm_combined_func()
@@ -38,6 +38,12 @@ class MyResources:
 
         self.gpu_rsets_free = self.total_num_gpu_rsets
         self.nongpu_rsets_free = self.total_num_nongpu_rsets
+        self.changed = []
+
+    def changed_rsets(self):
+        """Return resource sets assigned or freed since last called"""
+        changed, self.changed = self.changed, []
+        return np.array(changed, dtype=int)
 
     def free_rsets(self, worker=None):
         """Free up assigned resource sets"""
@@ -49,12 +55,14 @@ class MyResources:
                 if wid == worker:
                     self.rsets["assigned"][rset] = 0
                     self.rsets_free += 1
+                    self.changed.append(rset)
 
     def assign_rsets(self, rset_team, worker_id):
         """Mark the resource sets given by rset_team as assigned to worker_id"""
         if rset_team:
             self.rsets["assigned"][rset_team] = worker_id
             self.rsets_free -= len(rset_team)  # quick count
+            self.changed.extend(rset_team)
 
     # Special function for testing from a given starting point
     def fixed_assignment(self, assignment):
@@ -661,6 +669,63 @@ def test_schedule_find_gaps_2nodes_withgpus():
     del resources
 
 
+def test_match_slots_common_to_groups():
+    """Tests matching slots that are fewer than those available in any one group"""
+    print(f"\nTest: {sys._getframe().f_code.co_name}\n")
+
+    resources = MyResources(8, 2)
+    resources.fixed_assignment([0, 0, 0, 1, 2, 0, 0, 0])  # Free slots [0, 1, 2] and [1, 2, 3]
+    sched = ResourceScheduler(user_resources=resources)
+    rset_team = sched.assign_resources(rsets_req=4)  # Split to 2 slots on 2 groups
+    assert rset_team == [1, 2, 5, 6], f"rsets found {rset_team}"
+    assert sched.avail_rsets_by_group == {0: [0], 1: [7]}
+    assert sched.avail_mask.tolist() == [[True, False, False, False], [False, False, False, True]]
+    _fail_to_resource(sched, 2)
+
+
+def test_match_slots_common_to_many_groups():
+    """Tests matching slots that are only common to three or more groups"""
+    print(f"\nTest: {sys._getframe().f_code.co_name}\n")
+
+    resources = MyResources(30, 6)
+    free_slots = [[0, 1, 3, 4], [0, 1, 2, 4], [2, 3, 4], [0, 1, 3, 4], [3], [0, 1, 2, 4]]
+    assignment = np.ones(30, dtype=int)
+    for group, slots in enumerate(free_slots):
+        assignment[[5 * group + slot for slot in slots]] = 0
+    resources.fixed_assignment(assignment)
+    sched = ResourceScheduler(user_resources=resources, sched_opts={"match_slots": True})
+    rset_team = sched.assign_resources(rsets_req=5)  # Slot 4 on five groups
+    assert rset_team == [4, 9, 14, 19, 29], f"rsets found {rset_team}"
+
+
+def test_scheduler_update():
+    """Tests a scheduler kept across alloc calls is updated with assigned and freed resource sets"""
+    print(f"\nTest: {sys._getframe().f_code.co_name}\n")
+
+    resources = MyResources(8, 2)
+    sched = ResourceScheduler(user_resources=resources)
+    sched.update()
+
+    rset_team = sched.assign_resources(rsets_req=4)
+    assert rset_team == [0, 1, 2, 3], f"rsets found {rset_team}"
+    resources.assign_rsets(rset_team, 1)
+    rset_team = sched.assign_resources(rsets_req=2)
+    assert rset_team == [4, 5], f"rsets found {rset_team}"
+    assert sched.avail_rsets_by_group == {0: [], 1: [6, 7]}
+
+    # The second team was not assigned (e.g., not sent) so is available again on update
+    sched.update()
+    assert sched.avail_rsets_by_group == {0: [], 1: [4, 5, 6, 7]}
+    assert sched.rsets_free == 4
+    assert sched.avail_counts.tolist() == [0, 4]
+
+    resources.free_rsets(1)
+    sched.update()
+    assert sched.avail_rsets_by_group == {0: [0, 1, 2, 3], 1: [4, 5, 6, 7]}
+    assert sched.rsets_free == 8
+    assert sched.avail_counts.tolist() == [4, 4]
+
+
 if __name__ == "__main__":
     test_request_zero_rsets()
     test_too_many_rsets()
@@ -680,3 +745,6 @@ if __name__ == "__main__":
     test_try1node_findon_2_or_4nodes()
     test_large_match_slots()
     test_schedule_find_gaps_2nodes_withgpus()
+    test_match_slots_common_to_groups()
+    test_match_slots_common_to_many_groups()
+    test_scheduler_update()
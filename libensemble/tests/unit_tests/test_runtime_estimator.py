@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+"""
+Unit test of the online sim runtime estimator for libensemble.
+"""
+
+import numpy as np
+import pytest
+
+import libensemble.tests.unit_tests.setup as setup
+from libensemble.alloc_funcs.give_sim_work_first import give_sim_work_first
+from libensemble.history import History
+from libensemble.message_numbers import TASK_FAILED, WORKER_DONE
+from libensemble.resources.resources import Resources
+from libensemble.tools.alloc_support import AllocSupport
+from libensemble.tools.fields_keys import libE_fields
+from libensemble.tools.runtime_estimator import RuntimeEstimator
+
+
+def _evaluated_H(n, runtime_of_x):
+    H = np.zeros(n, dtype=libE_fields + [("x", float, 2), ("resource_sets", int)])
+    H["x"] = np.random.default_rng(1).uniform(0, 1, (n, 2))
+    H["resource_sets"] = np.arange(n) % 2 + 1
+    H["sim_started_time"] = 1000.0
+    H["sim_ended_time"] = 1000.0 + runtime_of_x(H["x"], H["resource_sets"])
+    return H
+
+
+def test_runtime_estimator_methods():
+    "Test predictions of each method, from observations added one at a time."
+
+    H = _evaluated_H(400, lambda x, rsets: 10 * x[:, 0] + 2 * rsets)
+    estimator = RuntimeEstimator()
+    assert np.all(np.isnan(estimator.predict(H, [0, 1]))), "Predictions should be unknown without observations"
+
+    for method in ["knn", "linear"]:
+        estimator = RuntimeEstimator(method=method, k=3)
+        for row in range(300):
+            estimator.update(H, row)
+        assert estimator.fields == ["x", "resource_sets"]
+        predictions = estimator.predict(H, np.arange(300, 400))
+        actual = H["sim_ended_time"][300:] - H["sim_started_time"][300:]
+        assert np.mean(np.abs(predictions - actual)) < 0.5, f"Predictions of {method} are inaccurate"
+
+    # A work unit of several points shares its runtime
+    estimator = RuntimeEstimator(fields=[])
+    estimator.update(H, [0, 1, 2, 3])
+    assert np.allclose(estimator.predict(H, [5]), np.max(H["sim_ended_time"][:4] - 1000.0) / 4)
+
+    # Only recent observations are kept for knn
+    estimator = RuntimeEstimator(k=1, max_observations=10)
+    estimator.update(H, np.arange(25), np.arange(25.0))
+    assert estimator.predict(H, [0]) >= 15, "Old observations should have been replaced"
+
+    with pytest.raises(ValueError):
+        RuntimeEstimator(method="forest")
+
+
+def test_runtime_estimator_in_history():
+    "Test the History updates the estimator, and alloc funcs can use its predictions."
+
+    Resources.resources = None
+    sim_specs, gen_specs, exit_criteria = setup.make_criteria_and_specs_0(simx=10)
+    hist = History({}, sim_specs, gen_specs, exit_criteria, [])
+    hist.update_history_x_in(1, np.zeros(4, dtype=gen_specs["out"]), safe_mode=False, gen_started_time=0)
+    hist.set_runtime_estimator(RuntimeEstimator(fields=[]))
+    assert hist.runtime_estimator.num_observations == 0
+
+    hist.update_history_x_out(np.array([0, 1]), 1)
+    hist.H["sim_started_time"][[0, 1]] -= 4.0
+    D = {"libE_info": {"H_rows": np.array([0, 1])}, "calc_out": None}
+    hist.update_history_f(D, safe_mode=False)
+    assert hist.runtime_estimator.num_observations == 2
+    assert np.allclose(hist.runtime_estimator.predict(hist.H, [2]), 2.0, atol=0.1)
+
+    # Evaluated points are observed when the estimator is set (e.g., from H0)
+    estimator = RuntimeEstimator(fields=[])
+    hist.set_runtime_estimator(estimator)
+    assert estimator.num_observations == 2 and np.allclose(estimator.predict(hist.H, [2]), 4.0, atol=0.1)
+
+    # Cancel running sims that take much longer than predicted
+    hist.update_history_x_out(np.array([2]), 1)
+    hist.update_history_x_out(np.array([3]), 2)
+    hist.H["sim_started_time"][2] -= 20.0
+    W = np.zeros(2, dtype=[("worker_id", int), ("active", int), ("persis_state", int), ("active_recv", int)])
+    W["worker_id"] = [1, 2]
+    libE_info = {"sim_max_given": True, "runtime_estimator": estimator}
+    H = hist.trim_H()
+    assert np.allclose(AllocSupport(W, libE_info=libE_info).predicted_runtimes(H, [2, 3]), 4.0, atol=0.1)
+    give_sim_work_first(W, H, sim_specs, gen_specs, {"user": {"cancel_sims_factor": 3}}, {}, libE_info)
+    assert np.array_equal(H["cancel_requested"][:4], [False, False, True, False])
+
+    # Cancelled or failed sims are not observed
+    for row, status in [(2, WORKER_DONE), (3, TASK_FAILED)]:
+        D = {"libE_info": {"H_rows": np.array([row])}, "calc_out": None, "calc_status": status}
+        hist.update_history_f(D, safe_mode=False)
+    assert estimator.num_observations == 2
+
+
+if __name__ == "__main__":
+    test_runtime_estimator_methods()
+    test_runtime_estimator_in_history()
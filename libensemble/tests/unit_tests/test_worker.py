@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+"""
+Unit test of running sim work on a libensemble worker.
+"""
+
+import queue
+
+import numpy as np
+
+from libensemble.comms.comms import QComm
+from libensemble.message_numbers import EVAL_SIM_TAG, MAN_SIGNAL_FINISH, STOP_TAG
+from libensemble.utils.shared_array import SharedArray
+from libensemble.worker import Worker
+
+
+def _make_worker(sim_f, dtypes={}):
+    sim_specs = {"sim_f": sim_f, "in": ["x"], "out": [("f", float)]}
+    return Worker(QComm(queue.Queue(), queue.Queue()), dtypes, 1, sim_specs, {}, {})
+
+
+def test_batched_calc_missing_output():
+    "Test the outputs of a batch are kept when the sim of one of its points returns none."
+
+    def sim_f(H, persis_info, sim_specs, libE_info):
+        if H["x"][0] == 1:
+            return None, persis_info
+        return np.array([10 + H["x"][0]], dtype=sim_specs["out"]), persis_info
+
+    worker = _make_worker(sim_f)
+    Work = {"tag": EVAL_SIM_TAG, "persis_info": {}, "libE_info": {"H_rows": np.array([4, 5, 6])}}
+    calc_in = np.array([(0,), (1,), (2,)], dtype=[("x", float)])
+    out, _, _ = worker._handle_batched_calc(Work, calc_in)
+    assert np.array_equal(out["f"], [10, 0, 12]), f"Unexpected outputs {out['f']}"
+    assert worker.calc_iter[EVAL_SIM_TAG] == 3
+
+
+def test_batched_calc_finish():
+    "Test points of a batch after a finish signal are not evaluated, and keep their rows in the output."
+
+    def sim_f(H, persis_info, sim_specs, libE_info):
+        if H["x"][0] == 1:
+            worker.comm.push_to_buffer(STOP_TAG, MAN_SIGNAL_FINISH)
+        return np.array([10 + H["x"][0]], dtype=sim_specs["out"]), persis_info
+
+    worker = _make_worker(sim_f)
+    Work = {"tag": EVAL_SIM_TAG, "persis_info": {}, "libE_info": {"H_rows": np.array([4, 5, 6])}}
+    calc_in = np.array([(0,), (1,), (2,)], dtype=[("x", float)])
+    out, _, calc_status = worker._handle_batched_calc(Work, calc_in)
+    assert calc_status == MAN_SIGNAL_FINISH
+    assert np.array_equal(out["f"], [10, 11, 0]), f"Unexpected outputs {out['f']}"
+    assert worker.calc_iter[EVAL_SIM_TAG] == 2, "The last point should not have been evaluated"
+
+
+def test_read_shared_rows():
+    "Test rows read from a shared History are read-only, whether or not they are contiguous."
+
+    H_dtype = np.dtype([("x", float), ("f", float)])
+    H = SharedArray(6, H_dtype)
+    H.array["x"] = np.arange(6)
+    worker = _make_worker(None, {"H": H_dtype})
+    try:
+        for rows in [[1, 2, 3], [1, 3, 4]]:
+            Work = {"H_fields": ["x"], "libE_info": {"H_rows": np.array(rows), "H_shm": (H.name, 6)}}
+            calc_in = worker._read_shared_rows(Work)
+            assert np.array_equal(calc_in["x"], rows)
+            assert not calc_in.flags.writeable, f"Rows {rows} should be read-only"
+    finally:
+        calc_in = None
+        worker.shared_H.close()
+        H.close()
+        H.unlink()
+
+
+if __name__ == "__main__":
+    test_batched_calc_missing_output()
+    test_batched_calc_finish()
+    test_read_shared_rows()
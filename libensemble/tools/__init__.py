@@ -1,4 +1,5 @@
 from .forkable_pdb import ForkablePdb
+from .history_checkpoint import load_H_checkpoint, load_restart
 from .parse_args import parse_args
 from .tools import add_unique_random_streams, eprint, save_libE_output
 
@@ -6,6 +7,8 @@ __all__ = [
     "add_unique_random_streams",
     "eprint",
     "ForkablePdb",
+    "load_H_checkpoint",
+    "load_restart",
     "parse_args",
     "save_libE_output",
 ]
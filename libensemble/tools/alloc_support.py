@@ -1,4 +1,6 @@
 import logging
+import math
+import time
 
 import numpy as np
 
@@ -29,6 +31,12 @@ class AllocSupport:
 
     gen_counter = 0
 
+    # Default target ratio of manager turnaround to sim time for adaptively sized sim batches
+    sim_batch_overhead = 0.1
+
+    # Number of points whose runtimes are predicted at a time when backfilling
+    backfill_chunk_size = 64
+
     def __init__(
         self, W, manage_resources=False, persis_info={}, libE_info={}, user_resources=None, user_scheduler=None
     ):
@@ -49,14 +57,22 @@ class AllocSupport:
         """
         self.W = W
         self.persis_info = persis_info
+        self.libE_info = libE_info
         self.manage_resources = manage_resources
         self.resources = user_resources or Resources.resources
         self.sched = None
+        self.sims_given = 0
+        self.rows_given = set()  # Rows of sims given in this call (skipped by the priority queue)
+        self.sims_started = []  # (H_rows, rset_team) of sims given resources in this call
+        self.reservation = None
+        self.backfill_runtimes = {}  # Runtimes predicted for backfilling in this call, by row
         self.def_gen_num_procs = libE_info.get("gen_num_procs", 0)
         self.def_gen_num_gpus = libE_info.get("gen_num_gpus", 0)
         if self.resources is not None:
             wrk_resources = self.resources.resource_manager
             scheduler_opts = libE_info.get("scheduler_opts", {})
+            if user_scheduler is None and user_resources is None:
+                user_scheduler = libE_info.get("scheduler")  # Kept by the manager across calls
             self.sched = user_scheduler or ResourceScheduler(wrk_resources, scheduler_opts)
 
     def assign_resources(self, rsets_req, use_gpus=None, user_params=[]):
@@ -233,12 +249,21 @@ class AllocSupport:
         If ``rset_team`` is passed as an additional parameter, it will be honored, assuming that
         any resource checking has already been done.
 
+        If ``batched=True`` is passed, each row is evaluated by a separate call to the
+        ``sim_f`` on the worker (or all rows by one call, if ``sim_specs["vectorized"]``), so
+        that a batch of independent points can be sent in one work unit (see :meth:`sim_batch_size`).
+        Resources are those for the largest point.
+
         """
         # Parse out resource_sets
         self._update_rset_team(libE_info, wid, H=H, H_rows=H_rows)
 
         H_fields = AllocSupport._check_H_fields(H_fields)
         libE_info["H_rows"] = AllocSupport._check_H_rows(H_rows)
+        self.sims_given += len(libE_info["H_rows"])
+        self.rows_given.update(libE_info["H_rows"].tolist())
+        if libE_info.get("rset_team"):
+            self.sims_started.append((libE_info["H_rows"], libE_info["rset_team"]))
 
         work = {
             "H_fields": H_fields,
@@ -349,22 +374,264 @@ class AllocSupport:
         excluded_points = H["cancel_requested"] & ~H["sim_started"]
         return np.all(H["gen_informed"][pfilter & ~excluded_points])
 
-    def points_by_priority(self, H, points_avail, batch=False):
+    def unstarted_points(self, H):
+        """Returns indices of points that have not started their sim, excluding cancelled points.
+
+        Uses the rows tracked by the manager's History when available in ``libE_info``,
+        so the cost scales with the number of such points rather than the length of ``H``.
+
+        :returns: A sorted array of point indices.
+        """
+        rows = self.libE_info.get("unstarted_rows")
+        if rows is None:
+            return np.nonzero(~H["sim_started"] & ~H["cancel_requested"])[0]
+        return rows
+
+    def running_points(self, H):
+        """Returns indices of points that have started, but not ended, their sim.
+
+        :returns: A sorted array of point indices.
+        """
+        rows = self.libE_info.get("running_rows")
+        if rows is None:
+            return np.nonzero(H["sim_started"] & ~H["sim_ended"])[0]
+        return rows
+
+    def ended_not_informed_points(self, H, gen_worker=None):
+        """Returns indices of points that have ended their sim, but not been given back to a gen.
+
+        :param gen_worker: (Optional) Int. Only return points generated by this worker.
+        :returns: A sorted array of point indices.
+        """
+        rows = self.libE_info.get("ended_not_informed_rows")
+        if rows is None:
+            rows = np.nonzero(H["sim_ended"] & ~H["gen_informed"])[0]
+        if gen_worker is not None:
+            rows = rows[H["gen_worker"][rows] == gen_worker]
+        return rows
+
+    def all_sim_ended_by_gen(self, H, gen_worker):
+        """Returns ``True`` if all points generated by ``gen_worker`` have had their sim_end.
+
+        Equivalent to ``all_sim_ended(H, H["gen_worker"] == gen_worker)``, but only
+        inspects unstarted and running points.
+
+        :param gen_worker: Int. Worker that generated the points.
+        :returns: True if all expected points from this generator have had their sim_end.
+        """
+        for rows in (self.unstarted_points(H), self.running_points(H)):
+            if np.any(H["gen_worker"][rows] == gen_worker):
+                return False
+        return True
+
+    def points_by_priority(self, H, points_avail, batch=False, num_points=1):
         """Returns indices of points to give by priority.
 
-        :param points_avail: Indices of points that are available to give.
+        When the manager's priority queue is in ``libE_info``, the points are found
+        from it, so the cost does not grow with the number of points available.
+
+        :param points_avail: Boolean array of points available to give, or a sorted array of their indices
+            (e.g., from :meth:`unstarted_points`).
         :param batch: (Optional) Boolean. Should batches of points with the same priority be given simultaneously.
+        :param num_points: (Optional) Int. If greater than one (and not ``batch``), return up to
+            this many points, highest priority first.
         :returns: An array of point indices to give.
         """
+        points_avail = np.asarray(points_avail)
+        queue = self.libE_info.get("priority_queue")
+        if queue is not None and (points_avail.dtype != bool or len(points_avail) == len(H)):
+            # Use the priority queue maintained by the manager's History
+            rows = queue.top(points_avail, num_points, batch, self.rows_given)
+            return rows if batch or num_points > 1 else rows[0]
+        rows = np.nonzero(points_avail)[0] if points_avail.dtype == bool else points_avail
+        if num_points > 1 and not batch:
+            if "priority" in H.dtype.fields:
+                return rows[np.argsort(-H["priority"][rows], kind="stable")[:num_points]]
+            return rows[:num_points]
         if "priority" in H.dtype.fields:
-            priorities = H["priority"][points_avail]
+            priorities = H["priority"][rows]
             if batch:
                 q_inds = priorities == np.max(priorities)
             else:
                 q_inds = np.argmax(priorities)
         else:
             q_inds = 0
-        return np.nonzero(points_avail)[0][q_inds]
+        return rows[q_inds]
+
+    def sim_batch_size(self, num_points, num_workers=1, target_time=None, max_size=None, vectorized=False):
+        """Returns how many points to give in the next sim work unit, for adaptive batching.
+
+        The batch is sized so the work unit takes at least ``target_time`` seconds, based on the
+        observed time per sim point (``libE_info["sim_time_per_point"]``). By default, the target
+        is the observed manager turnaround divided by ``AllocSupport.sim_batch_overhead``.
+
+        Until there are observations, one point is given. Batches are also limited to share
+        ``num_points`` among ``num_workers`` and to not exceed ``sim_max``.
+
+        For a vectorized ``sim_f`` (``sim_specs["vectorized"]``), the points are shared among
+        ``num_workers`` regardless of sim times.
+
+        :param num_points: Int. Number of points available to give.
+        :param num_workers: (Optional) Int. Number of workers still to be given work in this call.
+        :param target_time: (Optional) Float. Target duration (seconds) for a sim work unit.
+        :param max_size: (Optional) Int. Maximum batch size.
+        :param vectorized: (Optional) Boolean. Whether the ``sim_f`` evaluates a batch in one call.
+        :returns: Int. Number of points for the next work unit.
+        """
+        size = 1
+        time_per_point = self.libE_info.get("sim_time_per_point")
+        if target_time is None and self.libE_info.get("manager_turnaround"):
+            target_time = self.libE_info["manager_turnaround"] / AllocSupport.sim_batch_overhead
+        if vectorized:
+            size = num_points
+        elif time_per_point and target_time:
+            size = math.ceil(target_time / time_per_point)
+
+        size = min(size, math.ceil(num_points / max(num_workers, 1)))
+        if max_size:
+            size = min(size, max_size)
+        if self.libE_info.get("sim_max_remaining") is not None:
+            size = min(size, self.libE_info["sim_max_remaining"] - self.sims_given)
+        return max(size, 1)
+
+    def predicted_runtimes(self, H, H_rows):
+        """Returns the predicted sim runtime (seconds) of each of the given points.
+
+        Uses the manager's runtime estimator (see ``libE_specs["runtime_estimator"]``) if there
+        is one, else the observed time per sim point. Predictions are NaN if unknown.
+
+        :param H: :ref:`History array<funcguides-history>`.
+        :param H_rows: Which rows of ``H`` to predict.
+        :returns: An array of predicted runtimes.
+        """
+        H_rows = AllocSupport._check_H_rows(H_rows)
+        estimator = self.libE_info.get("runtime_estimator")
+        if estimator is not None:
+            return estimator.predict(H, H_rows)
+        runtime = self.libE_info.get("sim_time_per_point")
+        return np.full(len(H_rows), np.nan if runtime is None else runtime, dtype=float)
+
+    def _sim_runtimes(self, H, H_rows, runtime=None):
+        """Estimated sim runtime (seconds) of each point in ``H_rows`` (NaN if unknown)"""
+        if isinstance(runtime, str):
+            return H[runtime][H_rows].astype(float)
+        if runtime is None:
+            return self.predicted_runtimes(H, H_rows)
+        return np.full(len(H_rows), runtime, dtype=float)
+
+    def reserve_resources(self, H, H_rows, runtime=None):
+        """Reserves resource sets for points whose resources are not free, for backfilling.
+
+        The reservation is for the earliest time that enough resource sets are expected to
+        be free, from the start times (``sim_started_time``) and estimated runtimes of the
+        running sims. Resource sets held by other work (e.g., persistent generators) are
+        not expected to be freed. Later calls to :meth:`backfill_work` only give points
+        that are not expected to delay the reservation.
+
+        :param H: :ref:`History array<funcguides-history>`.
+        :param H_rows: Which rows of ``H`` (e.g., the highest priority point) to reserve for.
+        :param runtime: (Optional) Float, or name of a field of ``H``. Estimated sim runtime
+            (seconds) of a point. Defaults to :meth:`predicted_runtimes`.
+        :returns: Boolean. True if a reservation was made (i.e., runtimes could be estimated).
+        """
+        if self.sched is None:
+            return False
+        H_rows = AllocSupport._check_H_rows(H_rows)
+        rsets_req, use_gpus = self._req_resources_sim({}, [], H, H_rows)
+        rsets = self.sched.resources.rsets
+        if use_gpus is None:
+            type_mask, num_free = np.ones(len(rsets), dtype=bool), self.sched.rsets_free
+        elif use_gpus:
+            type_mask, num_free = rsets["gpus"], self.sched.gpu_rsets_free
+        else:
+            type_mask, num_free = ~rsets["gpus"], self.sched.nongpu_rsets_free
+
+        # Expected end time and number of resource sets of each running sim
+        now = time.time()
+        ends, counts = [], []
+        running = self.running_points(H)
+        for wid in np.unique(H["sim_worker"][running]):
+            rows = running[H["sim_worker"][running] == wid]
+            ends.append(np.min(H["sim_started_time"][rows]) + np.sum(self._sim_runtimes(H, rows, runtime)))
+            counts.append(np.count_nonzero(type_mask & (rsets["assigned"] == wid)))
+        for rows, rset_team in self.sims_started:
+            ends.append(now + np.sum(self._sim_runtimes(H, rows, runtime)))
+            counts.append(np.count_nonzero(type_mask[rset_team]))
+
+        order = np.argsort(ends)
+        times = np.concatenate(([now], np.array(ends)[order]))
+        num_avail = num_free + np.concatenate(([0], np.cumsum(np.array(counts, dtype=int)[order])))
+        k = np.searchsorted(num_avail, rsets_req)
+        if k == len(num_avail) or np.isnan(times[k]):
+            return False
+
+        self.reservation = {
+            "H_rows": H_rows,
+            "time": max(times[k], now),
+            "spare": num_avail[k] - rsets_req,
+            "use_gpus": use_gpus,
+        }
+        logger.debug(f"Reserved {rsets_req} resource sets for sim_ids {H_rows} in {times[k] - now:.3f} seconds")
+        return True
+
+    def backfill_work(self, wid, H, H_fields, points_avail, persis_info, runtime=None, **libE_info):
+        """Returns sim work for a point, backfilling around a reservation for the highest priority point.
+
+        The highest priority point is given (as by :meth:`sim_work`) if its resources are free.
+        Otherwise, resource sets are reserved for it (see :meth:`reserve_resources`) and, on this
+        and later calls, the highest priority of the other points that can be given without
+        delaying the reservation is given instead. These are points expected to end before the
+        reservation, or that fit in the resource sets expected to be spare at that time.
+
+        Raises ``InsufficientFreeResources`` if no point can be given (or if there are no runtime
+        estimates for a reservation).
+
+        :param wid: Int. Worker ID.
+        :param H: :ref:`History array<funcguides-history>`.
+        :param H_fields: Which fields from :ref:`H<funcguides-history>` to send.
+        :param points_avail: Boolean array of points available to give, or an array of their indices.
+        :param persis_info: Worker specific :ref:`persis_info<datastruct-persis-info>` dictionary.
+        :param runtime: (Optional) Float, or name of a field of ``H``. Estimated sim runtime
+            (seconds) of a point. Defaults to :meth:`predicted_runtimes`.
+        :returns: a Work entry.
+        """
+        if self.reservation is None:
+            head = self.points_by_priority(H, points_avail)
+            try:
+                return self.sim_work(wid, H, H_fields, head, persis_info, **libE_info)
+            except InsufficientFreeResources:
+                if not self.reserve_resources(H, head, runtime):
+                    raise
+
+        points_avail = np.asarray(points_avail)
+        rows = np.nonzero(points_avail)[0] if points_avail.dtype == bool else points_avail
+        rows = rows[~np.isin(rows, self.reservation["H_rows"])]
+        if "priority" in H.dtype.fields:
+            rows = rows[np.argsort(-H["priority"][rows], kind="stable")]
+
+        now = time.time()
+        for i in range(0, len(rows), AllocSupport.backfill_chunk_size):
+            # Runtimes are predicted as needed, and kept for later calls
+            chunk = rows[i : i + AllocSupport.backfill_chunk_size]
+            new_rows = [row for row in chunk.tolist() if row not in self.backfill_runtimes]
+            if new_rows:
+                self.backfill_runtimes.update(zip(new_rows, self._sim_runtimes(H, new_rows, runtime).tolist()))
+            ends_before = now + np.array([self.backfill_runtimes[row] for row in chunk.tolist()])
+            for row, end_before in zip(chunk, ends_before <= self.reservation["time"]):
+                rsets_req, use_gpus = self._req_resources_sim({}, [], H, [row])
+                other_type = (
+                    None not in (use_gpus, self.reservation["use_gpus"]) and use_gpus != self.reservation["use_gpus"]
+                )
+                if not (end_before or other_type) and rsets_req > self.reservation["spare"]:
+                    continue
+                try:
+                    work = self.sim_work(wid, H, H_fields, row, persis_info, **libE_info)
+                except InsufficientFreeResources:
+                    continue
+                if not (end_before or other_type):
+                    self.reservation["spare"] -= rsets_req
+                return work
+        raise InsufficientFreeResources
 
     @staticmethod
     def _check_H_rows(H_rows):
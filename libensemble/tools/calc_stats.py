@@ -0,0 +1,181 @@
+"""
+Structured records of the timing of each calculation (user function call), and
+of the tasks each submitted, kept in place of the text lines of ``libE_stats.txt``
+when ``libE_specs["stats_columnar"]`` is set.
+
+Workers collect the records of their calculations and send them with each
+calculation result. The manager appends them to a directory (``libE_stats``)
+with a file per field, for calculations (``calcs/<field>.dat``) and for tasks
+(``tasks/<field>.dat``).
+"""
+
+import datetime
+import os
+
+import numpy as np
+import numpy.typing as npt
+
+from libensemble.message_numbers import EVAL_SIM_TAG, calc_type_strings
+
+__all__ = ["CALC_STATS_DTYPE", "TASK_STATS_DTYPE", "load_calc_stats", "write_stats_text"]
+
+CALC_STATS_DTYPE = np.dtype(
+    [
+        ("worker", np.int32),
+        ("calc_num", np.int64),  # Count of calculations on the worker
+        ("calc_type", np.int32),  # EVAL_SIM_TAG or EVAL_GEN_TAG
+        ("gen_num", np.int64),  # Gen number (gens only)
+        ("sim_id_min", np.int64),  # Smallest sim_id evaluated (sims only)
+        ("sim_id_max", np.int64),  # Largest sim_id evaluated (sims only)
+        ("num_sims", np.int64),  # Number of sim_ids evaluated (sims only)
+        ("start", np.float64),  # Seconds since the epoch
+        ("end", np.float64),  # Seconds since the epoch
+        ("status", "S32"),  # Calculation status (as in libE_stats.txt)
+    ]
+)
+
+TASK_STATS_DTYPE = np.dtype(
+    [
+        ("worker", np.int32),
+        ("calc_num", np.int64),  # Calculation (on the worker) that submitted the task
+        ("start", np.float64),
+        ("end", np.float64),  # NaN if the task was still running when the calculation returned
+    ]
+)
+
+
+def _append_columns(dirname: str, records: npt.NDArray) -> None:
+    """Appends the values of each field of records to <dirname>/<field>.dat"""
+    os.makedirs(dirname, exist_ok=True)
+    for field in records.dtype.names:
+        with open(os.path.join(dirname, field + ".dat"), "ab") as f:
+            f.write(np.ascontiguousarray(records[field]).tobytes())
+
+
+def _load_columns(dirname: str, dtype: np.dtype) -> npt.NDArray:
+    """Reads the records in <dirname>/<field>.dat files (up to the shortest field)"""
+    filenames = {field: os.path.join(dirname, field + ".dat") for field in dtype.names}
+    if not all(os.path.isfile(filename) for filename in filenames.values()):
+        return np.zeros(0, dtype=dtype)
+    columns = {field: np.fromfile(filename, dtype=dtype[field]) for field, filename in filenames.items()}
+    records = np.zeros(min(len(column) for column in columns.values()), dtype=dtype)
+    for field, column in columns.items():
+        records[field] = column[: len(records)]
+    return records
+
+
+class CalcStatsWriter:
+    """Appends calculation and task records to a stats directory, in batches
+
+    Records already in the directory (e.g., from a previous run) are removed.
+    """
+
+    def __init__(self, path: str, flush_size: int = 256) -> None:
+        self.path = path
+        self.flush_size = flush_size
+        self.calcs = []
+        self.tasks = []
+        self.num_pending = 0
+        for name in ["calcs", "tasks"]:
+            for field in (CALC_STATS_DTYPE if name == "calcs" else TASK_STATS_DTYPE).names:
+                filename = os.path.join(path, name, field + ".dat")
+                if os.path.isfile(filename):
+                    os.remove(filename)
+
+    def add(self, calcs: npt.NDArray, tasks: npt.NDArray = None) -> None:
+        """Adds the records sent by a worker, writing them once enough are pending"""
+        self.calcs.append(calcs)
+        if tasks is not None and len(tasks):
+            self.tasks.append(tasks)
+        self.num_pending += len(calcs)
+        if self.num_pending >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes any pending records"""
+        if self.calcs:
+            _append_columns(os.path.join(self.path, "calcs"), np.concatenate(self.calcs))
+        if self.tasks:
+            _append_columns(os.path.join(self.path, "tasks"), np.concatenate(self.tasks))
+        self.calcs, self.tasks, self.num_pending = [], [], 0
+
+
+def load_calc_stats(path: str = "libE_stats") -> (npt.NDArray, npt.NDArray):
+    """
+    Loads the calculation and task records from a stats directory written with
+    ``libE_specs["stats_columnar"]``.
+
+    .. code-block:: python
+
+        calcs, tasks = load_calc_stats("libE_stats")
+        sim_times = (calcs["end"] - calcs["start"])[calcs["calc_type"] == EVAL_SIM_TAG]
+
+    Parameters
+    ----------
+
+    path: :obj:`str`, Optional
+
+        The stats directory.
+
+    Returns
+    -------
+
+    calcs: `NumPy structured array`
+
+        A record for each calculation (dtype ``CALC_STATS_DTYPE``)
+
+    tasks: `NumPy structured array`
+
+        A record for each task submitted by a calculation (dtype ``TASK_STATS_DTYPE``)
+
+    """
+    return _load_columns(os.path.join(path, "calcs"), CALC_STATS_DTYPE), _load_columns(
+        os.path.join(path, "tasks"), TASK_STATS_DTYPE
+    )
+
+
+def _format_time(seconds: float) -> str:
+    """Formats a time as in libE_stats.txt"""
+    millisec = int(round(seconds * 1000))
+    date = datetime.datetime.fromtimestamp(millisec // 1000)
+    return date.strftime("%Y-%m-%d %H:%M:%S") + f".{millisec % 1000:03d}"
+
+
+def write_stats_text(path: str = "libE_stats", filename: str = "libE_stats.txt", task_datetime: bool = False) -> None:
+    """
+    Writes the records in a stats directory as the lines of a ``libE_stats.txt``
+    file (with task timings if ``task_datetime``), for example, for scripts
+    that read that format.
+
+    The sim_ids of a calculation are given as the range from the smallest to
+    the largest.
+    """
+    calcs, tasks = load_calc_stats(path)
+    calc_tasks = {}
+    for task in tasks[np.argsort(tasks["start"], kind="stable")]:
+        calc_tasks.setdefault((task["worker"], task["calc_num"]), []).append(task)
+
+    with open(filename, "w") as f:
+        for calc in calcs[np.argsort(calcs["end"], kind="stable")]:
+            if calc["calc_type"] == EVAL_SIM_TAG:
+                sim_ids = str(calc["sim_id_min"])
+                if calc["num_sims"] > 1:
+                    sim_ids += f"-{calc['sim_id_max']}"
+                desc = f"sim_id {sim_ids.rjust(5)}"
+            else:
+                desc = f"Gen no {str(calc['gen_num']).rjust(5)}"
+            line = (
+                f"Worker {str(calc['worker']).rjust(5)}: {desc}: {calc_type_strings[calc['calc_type']]} "
+                f"Time: {calc['end'] - calc['start']:.3f} "
+                f"Start: {_format_time(calc['start'])} End: {_format_time(calc['end'])}"
+            )
+            if task_datetime:
+                for i, task in enumerate(calc_tasks.get((calc["worker"], calc["calc_num"]), [])):
+                    if np.isnan(task["end"]):
+                        line += f" Task {i}: running Tstart: {_format_time(task['start'])}"
+                        continue
+                    line += (
+                        f" Task {i}: {task['end'] - task['start']:.3f}"
+                        f" Tstart: {_format_time(task['start'])} Tend: {_format_time(task['end'])}"
+                    )
+            f.write(f"{line} Status: {calc['status'].decode()}\n")
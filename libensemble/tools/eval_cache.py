@@ -0,0 +1,131 @@
+"""
+A persistent cache of sim evaluations, used to skip sims of points evaluated before.
+
+The manager keeps a cache when ``libE_specs["eval_cache"]`` is set. When a gen returns
+points whose inputs (the ``sim_specs["in"]`` fields) match an entry, the ``sim_specs["out"]``
+fields are filled from the cache and the points are marked as evaluated, without being
+given to a worker. Results of successful sims are added to the cache. The cache is kept
+in an SQLite database, so it is shared by later runs (and by runs of the same sim).
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+
+import numpy as np
+import numpy.typing as npt
+
+__all__ = ["EvalCache"]
+
+# SQLite limits the number of parameters in a statement (999 in older versions)
+_MAX_PARAMS = 900
+
+
+class EvalCache:
+    """Stores the sim outputs of points, keyed by a hash of their sim inputs
+
+    Floating-point inputs are rounded to the nearest multiple of ``tolerance`` (if given)
+    before hashing, so points that differ by less than about ``tolerance`` share an entry.
+    Otherwise inputs must match exactly. Keys also include the name of the sim function,
+    the types of the input and output fields, and ``namespace``, so runs with a different
+    sim or ``sim_specs["user"]`` parameters can share a file by giving different namespaces.
+
+    At most ``max_entries`` entries are kept, with the least recently used removed first
+    (``None`` for no limit). The entries are counted when the cache is opened, and the count
+    is then kept by this instance, so entries added by other runs meanwhile are not. The
+    numbers of ``hits``, ``misses`` and ``stored`` entries in this run are counted.
+    """
+
+    def __init__(
+        self,
+        sim_specs: dict,
+        path: str = "libE_eval_cache.db",
+        tolerance: float = None,
+        max_entries: int = 100000,
+        namespace: str = "",
+    ) -> None:
+        if tolerance is not None and tolerance <= 0:
+            raise ValueError(f"Evaluation cache tolerance must be positive, got {tolerance}")
+        self.in_fields = list(sim_specs["in"])
+        self.out_dtype = np.dtype(sim_specs["out"])
+        self.path = os.path.abspath(path)
+        self.tolerance = tolerance
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+
+        sim_f = sim_specs.get("sim_f")
+        sim_name = f"{getattr(sim_f, '__module__', '')}.{getattr(sim_f, '__qualname__', sim_f)}"
+        self.namespace = repr((namespace, sim_name, self.in_fields, self.out_dtype.descr, tolerance)).encode()
+
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS evals (key BLOB PRIMARY KEY, value BLOB, last_used REAL)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS evals_last_used ON evals (last_used)")
+        self.db.commit()
+        self.num_entries = self.db.execute("SELECT COUNT(*) FROM evals").fetchone()[0]
+
+    def keys(self, H: npt.NDArray, rows: npt.NDArray) -> list:
+        """Returns the cache key of each of the given rows of H"""
+        columns = []
+        for field in self.in_fields:
+            values = H[field][rows].reshape(len(rows), -1)
+            if self.tolerance is not None and np.issubdtype(values.dtype, np.floating):
+                values = np.round(values.astype(float) / self.tolerance) + 0.0  # + 0.0 makes -0.0 match 0.0
+            columns.append(np.ascontiguousarray(values).view(np.uint8).reshape(len(rows), -1))
+        data = np.hstack(columns) if columns else np.zeros((len(rows), 0), dtype=np.uint8)
+        return [hashlib.sha256(self.namespace + row.tobytes()).digest() for row in data]
+
+    def lookup(self, H: npt.NDArray, rows: npt.NDArray) -> (npt.NDArray, npt.NDArray):
+        """Returns the rows found in the cache, and their outputs (with the ``sim_specs["out"]`` dtype)"""
+        rows = np.atleast_1d(rows)
+        keys = self.keys(H, rows)
+        found = self._find(keys)
+        hit = np.array([key in found for key in keys], dtype=bool)
+        hit_keys = [key for key in keys if key in found]
+        out = np.frombuffer(b"".join(found[key] for key in hit_keys), dtype=self.out_dtype).copy()
+        if hit_keys:
+            now = time.time()
+            self.db.executemany("UPDATE evals SET last_used = ? WHERE key = ?", [(now, key) for key in hit_keys])
+            self.db.commit()
+        self.hits += len(hit_keys)
+        self.misses += len(keys) - len(hit_keys)
+        return rows[hit], out
+
+    def store(self, H: npt.NDArray, rows: npt.NDArray) -> None:
+        """Adds the outputs of evaluated rows of H, removing the least recently used entries if full"""
+        rows = np.atleast_1d(rows)
+        if not len(rows):
+            return
+        out = np.zeros(len(rows), dtype=self.out_dtype)
+        for field in self.out_dtype.names:
+            out[field] = H[field][rows]
+        now = time.time()
+        keys = self.keys(H, rows)
+        entries = [(key, out[i].tobytes(), now) for i, key in enumerate(keys)]
+        self.num_entries += len(set(keys).difference(self._find(keys)))
+        self.db.executemany("INSERT OR REPLACE INTO evals VALUES (?, ?, ?)", entries)
+        self.stored += len(entries)
+
+        if self.max_entries is not None and self.num_entries > self.max_entries:
+            cursor = self.db.execute(
+                "DELETE FROM evals WHERE key IN (SELECT key FROM evals ORDER BY last_used LIMIT ?)",
+                (self.num_entries - self.max_entries,),
+            )
+            self.num_entries -= cursor.rowcount
+        self.db.commit()
+
+    def _find(self, keys: list) -> dict:
+        """Returns the value of each of the given keys that is in the cache"""
+        found = {}
+        for i in range(0, len(keys), _MAX_PARAMS):
+            chunk = keys[i : i + _MAX_PARAMS]
+            query = f"SELECT key, value FROM evals WHERE key IN ({','.join('?' * len(chunk))})"
+            found.update(self.db.execute(query, chunk).fetchall())
+        return found
+
+    def close(self) -> None:
+        """Closes the database"""
+        self.db.close()
@@ -0,0 +1,212 @@
+"""
+Append-only, per-field (columnar) checkpoints of the history array.
+
+A checkpoint directory holds:
+
+- ``dtype.npy``: An empty array with the dtype of H
+- ``<field>.dat``: The raw values of each field for every row written, appended in order
+- ``ranges.dat``: The ranges of rows (start, stop) written, in the same order
+- ``journal.dat``: One entry per checkpoint, with the number of ranges, records and rows of H at that point
+- ``persis_info.pickle``: The latest ``persis_info`` (if given)
+- ``gen_state_<n>.pickle``: The state saved by the n-th persistent generator started (see
+  ``PersistentSupport.save_state``)
+
+Each checkpoint appends only the rows changed since the previous one. The
+journal entry is written last, so a checkpoint interrupted part-way is
+ignored when loading.
+"""
+
+import logging
+import os
+import pickle
+import time
+
+import numpy as np
+import numpy.typing as npt
+
+from libensemble.utils.misc import save_pickle
+
+__all__ = ["HistoryCheckpoint", "load_H_checkpoint", "load_restart"]
+
+logger = logging.getLogger(__name__)
+
+_RANGE_DTYPE = np.dtype([("start", np.int64), ("stop", np.int64)])
+_JOURNAL_DTYPE = np.dtype(
+    [
+        ("num_ranges", np.int64),
+        ("num_records", np.int64),
+        ("num_rows", np.int64),
+        ("time", np.float64),
+        ("sim_started_offset", np.int64),
+        ("sim_ended_offset", np.int64),
+        ("gen_informed_offset", np.int64),
+    ]
+)
+
+
+def _row_ranges(rows: npt.NDArray) -> npt.NDArray:
+    """Returns the (start, stop) ranges covering sorted, unique rows"""
+    ranges = np.zeros(0, dtype=_RANGE_DTYPE)
+    if len(rows):
+        breaks = np.nonzero(np.diff(rows) != 1)[0] + 1
+        ranges = np.zeros(len(breaks) + 1, dtype=_RANGE_DTYPE)
+        ranges["start"] = rows[np.concatenate(([0], breaks))]
+        ranges["stop"] = rows[np.concatenate((breaks - 1, [-1]))] + 1
+    return ranges
+
+
+def _read_complete(filename: str, dtype: np.dtype) -> npt.NDArray:
+    """Reads the whole records in a file (ignoring any partly written one at the end)"""
+    with open(filename, "rb") as f:
+        data = f.read()
+    return np.frombuffer(data[: len(data) - len(data) % dtype.itemsize], dtype=dtype)
+
+
+def gen_state_file(path: str, num: int) -> str:
+    """The file holding the state of the num-th persistent generator started"""
+    return os.path.join(path, f"gen_state_{num}.pickle")
+
+
+class HistoryCheckpoint:
+    """Writes checkpoints of a History to a columnar directory
+
+    The first checkpoint writes all rows of H. Later ones write the rows
+    History has recorded as changed (see ``History.changed_rows``).
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.fields = None
+        self.num_ranges = 0
+        self.num_records = 0
+        self.save_persis_info = True
+
+    def _start(self, dtype: np.dtype) -> None:
+        """Creates the directory, removing the files of any previous checkpoints there"""
+        os.makedirs(self.path, exist_ok=True)
+        for name in os.listdir(self.path):
+            if name.endswith(".dat") or name == "dtype.npy":
+                os.remove(os.path.join(self.path, name))
+        np.save(os.path.join(self.path, "dtype.npy"), np.zeros(0, dtype=dtype))
+        self.fields = dtype.names
+
+    def write(self, hist, all_rows: bool = False, persis_info: dict = None) -> None:
+        """Appends the rows of hist.H changed since the last checkpoint (or all rows), and saves persis_info"""
+        H = hist.trim_H()
+        changed = hist.changed_rows()
+        if self.fields is None:
+            self._start(H.dtype)
+            all_rows = True
+
+        rows = np.arange(len(H)) if all_rows else changed[changed < len(H)]
+        for field in self.fields:
+            with open(os.path.join(self.path, field + ".dat"), "ab") as f:
+                f.write(np.ascontiguousarray(H[field][rows]).tobytes())
+        ranges = _row_ranges(rows)
+        with open(os.path.join(self.path, "ranges.dat"), "ab") as f:
+            f.write(ranges.tobytes())
+
+        if persis_info is not None and self.save_persis_info:
+            try:
+                save_pickle(os.path.join(self.path, "persis_info.pickle"), persis_info)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                logger.warning(f"persis_info cannot be pickled, so is not checkpointed: {e}")
+                self.save_persis_info = False
+
+        self.num_ranges += len(ranges)
+        self.num_records += len(rows)
+        offsets = (hist.sim_started_offset, hist.sim_ended_offset, hist.gen_informed_offset)
+        entry = np.array([(self.num_ranges, self.num_records, len(H), time.time()) + offsets], dtype=_JOURNAL_DTYPE)
+        with open(os.path.join(self.path, "journal.dat"), "ab") as f:
+            f.write(entry.tobytes())
+
+
+def load_H_checkpoint(path: str) -> npt.NDArray:
+    """
+    Reconstructs the history array from the latest complete checkpoint in a
+    directory written with ``libE_specs["save_H_columnar"]``, for example to
+    restart a workflow with it as ``H0``.
+
+    .. code-block:: python
+
+        H0 = load_H_checkpoint("libE_history_checkpoint")
+
+    Parameters
+    ----------
+
+    path: :obj:`str`
+
+        The checkpoint directory.
+
+    """
+    dtype = np.load(os.path.join(path, "dtype.npy")).dtype
+    journal = _read_complete(os.path.join(path, "journal.dat"), _JOURNAL_DTYPE)
+    if not len(journal):
+        return np.zeros(0, dtype=dtype)
+
+    last = journal[-1]
+    ranges = _read_complete(os.path.join(path, "ranges.dat"), _RANGE_DTYPE)[: last["num_ranges"]]
+    H = np.zeros(last["num_rows"], dtype=dtype)
+    if not last["num_records"]:
+        return H
+
+    # The row of each record, and the last (newest) record of each row
+    lengths = ranges["stop"] - ranges["start"]
+    offsets = np.cumsum(lengths) - lengths
+    record_rows = np.repeat(ranges["start"] - offsets, lengths) + np.arange(last["num_records"])
+    rows, newest = np.unique(record_rows[::-1], return_index=True)
+    newest = last["num_records"] - 1 - newest
+
+    for field in dtype.names:
+        records = np.memmap(
+            os.path.join(path, field + ".dat"), dtype=dtype.fields[field][0], mode="r", shape=(last["num_records"],)
+        )
+        H[field][rows] = records[newest]
+    return H
+
+
+def load_checkpoint_offsets(path: str) -> dict:
+    """The History offsets (counts from before the checkpointed run started) at the latest checkpoint"""
+    journal = _read_complete(os.path.join(path, "journal.dat"), _JOURNAL_DTYPE)
+    names = ["sim_started_offset", "sim_ended_offset", "gen_informed_offset"]
+    return {name: int(journal[-1][name]) if len(journal) else 0 for name in names}
+
+
+def load_restart(path: str, persis_info: dict = {}) -> (npt.NDArray, dict):
+    """
+    Loads the history array and ``persis_info`` to resume a workflow from the
+    latest checkpoint in a directory, as done for ``libE_specs["restart_from"]``.
+
+    Points whose simulations were in progress are marked as not started, so
+    that they are given out again. The per-worker entries of ``persis_info``
+    (e.g., random streams) are restored. Other entries, which typically hold
+    the allocation function's record of the previous run, are taken from the
+    given ``persis_info``.
+
+    Parameters
+    ----------
+
+    path: :obj:`str`
+
+        The checkpoint directory.
+
+    persis_info: :obj:`dict`, Optional
+
+        ``persis_info`` given for the restarted workflow.
+
+    """
+    H0 = load_H_checkpoint(path)
+    in_flight = H0["sim_started"] & ~H0["sim_ended"] & ~H0["cancel_requested"]
+    H0["sim_started"][in_flight] = False
+    H0["sim_started_time"][in_flight] = np.inf
+    H0["sim_worker"][in_flight] = 0
+    H0["kill_sent"][in_flight] = False
+    logger.info(f"Restarting from {path} with {len(H0)} points, re-issuing {np.sum(in_flight)} in-progress sims")
+
+    persis_info = dict(persis_info)
+    filename = os.path.join(path, "persis_info.pickle")
+    if os.path.isfile(filename):
+        with open(filename, "rb") as f:
+            saved = pickle.load(f)
+        persis_info.update({i: saved[i] for i in saved if isinstance(i, int)})
+    return H0, persis_info
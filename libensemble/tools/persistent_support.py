@@ -1,10 +1,14 @@
 import logging
+import os
+import pickle
 from typing import Any, Dict, List
 
 import numpy as np
 import numpy.typing as npt
 
+from libensemble.comms.logs import flush_worker_logs
 from libensemble.message_numbers import EVAL_GEN_TAG, EVAL_SIM_TAG, PERSIS_STOP, STOP_TAG, UNSET_TAG, calc_type_strings
+from libensemble.utils.misc import save_pickle
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +62,7 @@ class PersistentSupport:
             "calc_type": self.calc_type,
         }
         logger.debug(f"Persistent {self.calc_str} function sending data message to manager")
+        flush_worker_logs()
         self.comm.send(self.calc_type, D)
 
     def recv(self, blocking: bool = True) -> (int, dict, npt.NDArray):
@@ -126,3 +131,29 @@ class PersistentSupport:
         H_o["sim_id"] = sim_ids
         H_o["cancel_requested"] = True
         self.send(H_o, keep_state=True)
+
+    def save_state(self, state: Any) -> None:
+        """Save the state of a persistent generator, to be restored on restart.
+
+        :param state: Any picklable object from which the generator can resume.
+
+        The state is saved only when ``libE_specs["save_H_columnar"]`` is set,
+        alongside the history checkpoints. As those are taken at other times,
+        the generator should tolerate points in the restarted history that the
+        state does not account for.
+        """
+        if self.libE_info.get("gen_state_file"):
+            save_pickle(self.libE_info["gen_state_file"], state)
+
+    def load_state(self) -> Any:
+        """Load the state saved by this generator's counterpart in the run being restarted.
+
+        :returns: The state passed to ``save_state``, or None if not restarting (or none was saved).
+
+        Call before ``save_state``, as the restarted run may save to the same file.
+        """
+        filename = self.libE_info.get("gen_restore_file")
+        if filename and os.path.isfile(filename):
+            with open(filename, "rb") as f:
+                return pickle.load(f)
+        return None
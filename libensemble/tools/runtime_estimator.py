@@ -0,0 +1,122 @@
+"""
+Online estimates of the runtime of sims, learned from the points evaluated so far.
+
+The manager keeps an estimator when ``libE_specs["runtime_estimator"]`` is set, and
+updates it as sims return. Allocation functions can read predicted runtimes from
+``libE_info["runtime_estimator"]``, or with ``AllocSupport.predicted_runtimes``.
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+__all__ = ["RuntimeEstimator"]
+
+# Fields of H describing the resources of a sim, used as features when present
+RESOURCE_FIELDS = ["resource_sets", "num_procs", "num_gpus"]
+
+
+class RuntimeEstimator:
+    """Predicts the runtime of points from the observed runtimes of evaluated points
+
+    Each observation is the features of an evaluated point (the values of ``fields``,
+    and of any resource fields in H) with its runtime (the time of its sim, shared
+    equally among the points of a work unit). The supported methods are:
+
+    ``"knn"``: The mean runtime of the ``k`` nearest observations, with each feature
+    scaled by its standard deviation. Up to ``max_observations`` recent observations
+    are kept.
+
+    ``"linear"``: A least-squares fit of the runtime to the features (with an intercept),
+    kept as normal equations so each update is independent of the number of observations.
+
+    Until there are enough observations for the method, the mean observed runtime is
+    predicted (NaN if there are none).
+    """
+
+    def __init__(self, fields: list = None, method: str = "knn", k: int = 5, max_observations: int = 10000) -> None:
+        if method not in ("knn", "linear"):
+            raise ValueError(f"Unknown runtime estimator method {method}. Use 'knn' or 'linear'")
+        self.fields = fields
+        self.method = method
+        self.k = k
+        self.max_observations = max_observations
+        self.num_observations = 0
+        self.runtime_sum = 0.0
+        self.X = None  # Observed features (knn) as a circular buffer
+        self.y = None
+        self.XtX = None  # Normal equations (linear)
+        self.Xty = None
+
+    def _features(self, H: npt.NDArray, rows: npt.NDArray) -> npt.NDArray:
+        """Returns the features of the given rows (a row of floats per point)"""
+        if self.fields is None:
+            self.fields = ["x"] if "x" in H.dtype.names else []
+            self.fields += [field for field in RESOURCE_FIELDS if field in H.dtype.names]
+        columns = [H[field][rows].reshape(len(rows), -1).astype(float) for field in self.fields]
+        return np.hstack(columns) if columns else np.zeros((len(rows), 0))
+
+    def update(self, H: npt.NDArray, rows: npt.NDArray, runtimes: npt.NDArray = None) -> None:
+        """Adds observations of evaluated points
+
+        By default, the rows are taken to be one work unit, and share its runtime
+        (from ``sim_started_time`` to ``sim_ended_time``).
+        """
+        rows = np.atleast_1d(rows)
+        if not len(rows):
+            return
+        if runtimes is None:
+            elapsed = np.max(H["sim_ended_time"][rows]) - np.min(H["sim_started_time"][rows])
+            runtimes = np.full(len(rows), elapsed / len(rows))
+        valid = np.isfinite(runtimes)
+        rows, runtimes = rows[valid], np.asarray(runtimes, dtype=float)[valid]
+        if not len(rows):
+            return
+
+        X = self._features(H, rows)
+        if self.method == "linear":
+            X1 = np.hstack([X, np.ones((len(rows), 1))])
+            if self.XtX is None:
+                self.XtX = np.zeros((X1.shape[1], X1.shape[1]))
+                self.Xty = np.zeros(X1.shape[1])
+            self.XtX += X1.T @ X1
+            self.Xty += X1.T @ runtimes
+        else:
+            if self.X is None:
+                self.X = np.zeros((self.max_observations, X.shape[1]))
+                self.y = np.zeros(self.max_observations)
+            slots = (self.num_observations + np.arange(len(rows))) % self.max_observations
+            self.X[slots] = X
+            self.y[slots] = runtimes
+        self.num_observations += len(rows)
+        self.runtime_sum += np.sum(runtimes)
+
+    def predict(self, H: npt.NDArray, rows: npt.NDArray) -> npt.NDArray:
+        """Returns the predicted runtime (seconds) of each of the given rows"""
+        rows = np.atleast_1d(rows)
+        if not self.num_observations:
+            return np.full(len(rows), np.nan)
+        mean = self.runtime_sum / self.num_observations
+        X = self._features(H, rows)
+
+        if self.method == "linear":
+            if self.num_observations <= X.shape[1]:
+                return np.full(len(rows), mean)
+            coeffs = np.linalg.lstsq(self.XtX, self.Xty, rcond=None)[0]
+            return np.maximum(X @ coeffs[:-1] + coeffs[-1], 0.0)
+
+        n = min(self.num_observations, self.max_observations)
+        obs_X, obs_y = self.X[:n], self.y[:n]
+        k = min(self.k, n)
+        if not X.shape[1] or k == n:
+            return np.full(len(rows), np.mean(obs_y))
+        scale = np.std(obs_X, axis=0)
+        scale[scale == 0] = 1.0
+        obs_X = obs_X / scale
+        predictions = np.empty(len(rows))
+        chunk = max(1, 1000000 // n)  # Bound the size of the distance matrix
+        for start in range(0, len(rows), chunk):
+            Xc = X[start : start + chunk] / scale
+            dists = np.sum(Xc**2, axis=1)[:, None] - 2 * Xc @ obs_X.T + np.sum(obs_X**2, axis=1)
+            nearest = np.argpartition(dists, k - 1, axis=1)[:, :k]
+            predictions[start : start + chunk] = np.mean(obs_y[nearest], axis=1)
+        return predictions
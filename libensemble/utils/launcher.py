@@ -4,13 +4,17 @@ libensemble helpers for launching subprocesses.
 """
 
 import os
+import select
 import shlex
 import signal
 import subprocess
-import time
+import threading
+import weakref
 from itertools import chain
 from typing import List, Optional, Union
 
+from libensemble.utils.spawn_server import SpawnedProcess, SpawnServer
+
 
 def form_command(cmd_template: List[str], specs: dict) -> List[str]:
     "Fill command parts with dict entries from specs; drop any missing."
@@ -26,9 +30,30 @@ def form_command(cmd_template: List[str], specs: dict) -> List[str]:
     return list(chain.from_iterable(filter(None, map(fill, cmd_template))))
 
 
-def launch(cmd_template: List[str], specs: dict = None, **kwargs) -> subprocess.Popen:
+# Helper process launching subprocesses for this process (if started)
+spawn_server = None
+
+
+def start_spawn_server() -> None:
+    "Launch subprocesses from a helper process from now on (see libensemble.utils.spawn_server)."
+    global spawn_server
+    if spawn_server is None:
+        spawn_server = SpawnServer()
+
+
+def stop_spawn_server() -> None:
+    "Stop any helper process, launching subprocesses directly from now on."
+    global spawn_server
+    if spawn_server is not None:
+        spawn_server.close()
+        spawn_server = None
+
+
+def launch(cmd_template: List[str], specs: dict = None, **kwargs) -> Union[subprocess.Popen, SpawnedProcess]:
     "Launch a new subprocess (with command templating and Python 3 help)."
     cmd = form_command(cmd_template, specs) if specs is not None else cmd_template
+    if spawn_server is not None:
+        return spawn_server.launch(cmd, **kwargs)
     return subprocess.Popen(cmd, **kwargs)
 
 
@@ -60,22 +85,64 @@ def terminatepg(process: subprocess.Popen) -> bool:
         return False
 
 
+# Events set by threads waiting on processes (where pidfds are not available)
+_exit_events = weakref.WeakKeyDictionary()
+
+
+def _exit_event(process: subprocess.Popen) -> threading.Event:
+    "Return an event set when the process exits (by a thread waiting on it)."
+    event = _exit_events.get(process)
+    if event is None:
+        event = threading.Event()
+
+        def waiter():
+            process.wait()
+            event.set()
+
+        threading.Thread(target=waiter, daemon=True).start()
+        _exit_events[process] = event
+    return event
+
+
+def _wait_pidfd(process: subprocess.Popen, timeout: Union[int, float]) -> bool:
+    "Wait for the process to exit using a pidfd (Linux); False if not supported."
+    try:
+        fd = os.pidfd_open(process.pid)
+    except (AttributeError, OSError):  # No pidfd_open (Python < 3.9, Linux < 5.3), or already reaped
+        return False
+    try:
+        select.select([fd], [], [], max(timeout, 0))
+    finally:
+        os.close(fd)
+    return True
+
+
+def wait_for_exit(process: subprocess.Popen, timeout: Optional[Union[int, float]] = None) -> bool:
+    """Wait until the process exits or timeout (wait forever if None); True if done.
+
+    Returns as soon as the process exits, waiting on a pidfd where available
+    (Linux), else on an event set by a thread waiting on the process.
+    """
+    if process.poll() is not None:
+        return True
+    if timeout is None:
+        process.wait()
+        return True
+    if process not in _exit_events and _wait_pidfd(process, timeout):
+        return process.poll() is not None
+    return _exit_event(process).wait(max(timeout, 0)) or process.poll() is not None
+
+
 def process_is_stopped(process, timeout):
     "Wait for timeout to see if process is finished; True if done."
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        time.sleep(0.01)
-        if process.poll() is not None:
-            return True
-    return process.poll() is not None
+    return wait_for_exit(process, timeout)
 
 
 def wait(process: subprocess.Popen, timeout: Optional[Union[int, float]] = None) -> Optional[int]:
     "Wait on a process with timeout (wait forever if None)."
-    try:
-        return process.wait(timeout=timeout)
-    except subprocess.TimeoutExpired:
-        return None
+    if wait_for_exit(process, timeout):
+        return process.wait()
+    return None
 
 
 def wait_and_kill(process: subprocess.Popen, timeout: Optional[Union[int, float]]) -> int:
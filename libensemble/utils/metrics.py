@@ -0,0 +1,122 @@
+"""
+Lightweight counters and timers for the manager loop, reported periodically
+to pluggable sinks (any callable taking a dictionary).
+"""
+
+import json
+import time
+from typing import Callable, List
+
+__all__ = ["JSONLinesSink", "ManagerMetrics"]
+
+
+class _Timer:
+    """Accumulates the number of calls, total and maximum time of a timed section"""
+
+    __slots__ = ("count", "total", "max", "start")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args) -> None:
+        elapsed = time.perf_counter() - self.start
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+
+class JSONLinesSink:
+    """Appends each metrics report to a file as a line of JSON"""
+
+    def __init__(self, filename: str) -> None:
+        self.filename = filename
+        self.file = None
+
+    def __call__(self, report: dict) -> None:
+        if self.file is None:
+            self.file = open(self.filename, "a")
+        self.file.write(json.dumps(report) + "\n")
+        self.file.flush()
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class ManagerMetrics:
+    """Counters, timers and gauges collected by the manager.
+
+    Timed sections are entered with ``with metrics.timer(name):``. Sections
+    with the same name must not nest. A report (see ``snapshot``) is passed to
+    each sink at most every ``interval`` seconds, and on ``close``.
+    """
+
+    def __init__(self, sinks: List[Callable[[dict], None]] = [], interval: float = 10.0) -> None:
+        self.sinks = list(sinks)
+        self.interval = interval
+        self.timers = {}
+        self.counters = {}
+        self.worker_counters = {}
+        self.gauges = {}
+        self.start_time = time.time()
+        self.last_report = time.perf_counter()
+
+    def timer(self, name: str) -> _Timer:
+        """Returns the timer for a section, used as a context manager"""
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = _Timer()
+        return timer
+
+    def count(self, name: str, value: int = 1, worker: int = None) -> None:
+        """Adds value to a counter, which is kept per worker if one is given"""
+        if worker is None:
+            self.counters[name] = self.counters.get(name, 0) + value
+        else:
+            counts = self.worker_counters.setdefault(worker, {})
+            counts[name] = counts.get(name, 0) + value
+
+    def gauge(self, name: str, value: float) -> None:
+        """Records the latest value of a gauge, and the largest seen"""
+        last_max = self.gauges.get(name, (value, value))[1]
+        self.gauges[name] = (value, max(value, last_max))
+
+    def snapshot(self) -> dict:
+        """Returns the metrics collected so far as a JSON-serializable dictionary"""
+        return {
+            "time": time.time(),
+            "elapsed": time.time() - self.start_time,
+            "timers": {
+                name: {"count": t.count, "total": t.total, "max": t.max} for name, t in self.timers.items()
+            },
+            "counters": dict(self.counters),
+            "workers": {str(w): dict(counts) for w, counts in sorted(self.worker_counters.items())},
+            "gauges": {name: {"last": last, "max": max_} for name, (last, max_) in self.gauges.items()},
+        }
+
+    def report(self, force: bool = False) -> None:
+        """Passes a snapshot to the sinks if the reporting interval has passed (or if forced)"""
+        if not self.sinks:
+            return
+        now = time.perf_counter()
+        if force or now - self.last_report >= self.interval:
+            self.last_report = now
+            snapshot = self.snapshot()
+            for sink in self.sinks:
+                sink(snapshot)
+
+    def close(self) -> None:
+        """Sends a final report and closes the sinks"""
+        self.report(force=True)
+        for sink in self.sinks:
+            if hasattr(sink, "close"):
+                sink.close()
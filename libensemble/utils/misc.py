@@ -2,6 +2,8 @@
 Misc internal functions
 """
 
+import os
+import pickle
 from itertools import groupby
 from operator import itemgetter
 
@@ -21,3 +23,10 @@ def extract_H_ranges(Work: dict) -> str:
             else:
                 ranges.append(str(group[0]))
         return "_".join(ranges)
+
+
+def save_pickle(filename: str, obj) -> None:
+    """Pickles obj to filename, replacing any previous file only once written"""
+    with open(filename + ".tmp", "wb") as f:
+        pickle.dump(obj, f)
+    os.replace(filename + ".tmp", filename)
@@ -0,0 +1,57 @@
+"""
+NumPy arrays backed by named shared memory blocks, so that processes on the
+same node can read and write the same array without copying it over a comm.
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+import numpy.typing as npt
+
+# Blocks that could not be closed yet because views of them were still held
+_still_mapped = []
+
+
+class SharedArray:
+    """A one-dimensional (structured) array in a named shared memory block
+
+    The process that creates the block owns it and must ``unlink`` it when
+    done. Other processes attach by name, and only ``close`` it.
+    """
+
+    def __init__(self, length: int, dtype: npt.DTypeLike, name: str = None) -> None:
+        """Creates a new (zero-filled) block, or attaches to block ``name`` if given"""
+        self.dtype = np.dtype(dtype)
+        self.length = length
+        nbytes = max(length * self.dtype.itemsize, 1)
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        # frombuffer holds an export of the buffer, so the block cannot be unmapped under a live view
+        self.array = np.frombuffer(self.shm.buf, dtype=self.dtype, count=length)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self) -> None:
+        """Releases this process's mapping (deferred while views of ``array`` are still held)"""
+        self.array = None
+        for shm in [self.shm, *_still_mapped]:
+            try:
+                shm.close()
+            except BufferError:
+                if shm not in _still_mapped:
+                    _still_mapped.append(shm)
+            else:
+                if shm in _still_mapped:
+                    _still_mapped.remove(shm)
+
+    def unlink(self) -> None:
+        """Closes and removes the block (owner only)"""
+        self.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,190 @@
+"""
+A small helper process that launches applications for a worker.
+
+Forking a process costs more the larger its memory, so a worker that has imported
+large packages pays a growing cost for each application it launches. A worker may
+instead start a ``SpawnServer`` (see ``libE_specs["use_spawn_server"]``) while it
+is small, which launches applications with ``posix_spawn`` on request over a pipe
+and reports their exit status. Launched applications are represented in the
+worker by ``SpawnedProcess`` objects, which support the parts of the
+``subprocess.Popen`` interface used by the executors.
+
+This module uses only the standard library, as the helper process runs it as a script.
+"""
+
+import os
+import pickle
+import select
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+
+def _spawn(argv, cwd, env, stdout, stderr, start_new_session):
+    """Launches a process, returning its pid (in the helper process)"""
+    file_actions = []
+    for fd, path in ((1, stdout), (2, stderr)):
+        if path is not None:
+            file_actions.append((os.POSIX_SPAWN_OPEN, fd, path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644))
+    prev_cwd = os.getcwd()
+    os.chdir(cwd)  # posix_spawn has no working directory option (before Python 3.13)
+    try:
+        path = shutil.which(argv[0], path=env.get("PATH", os.defpath)) or argv[0]
+        return os.posix_spawn(path, argv, env, file_actions=file_actions, setsid=start_new_session)
+    finally:
+        os.chdir(prev_cwd)
+
+
+def _returncode(pid, returncodes):
+    """Returns the exit code of a process if it has exited (in the helper process)"""
+    if pid not in returncodes:
+        try:
+            wpid, status = os.waitpid(pid, os.WNOHANG)
+        except ChildProcessError:
+            return None
+        if wpid == 0:
+            return None
+        returncodes[pid] = os.waitstatus_to_exitcode(status)
+    return returncodes[pid]
+
+
+def serve(request_fd: int, response_fd: int) -> None:
+    """Handles launch and poll requests until the request pipe is closed"""
+    os.set_inheritable(request_fd, False)
+    os.set_inheritable(response_fd, False)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Stopped by the worker closing the pipe
+    requests, responses = os.fdopen(request_fd, "rb"), os.fdopen(response_fd, "wb")
+    returncodes = {}
+    while True:
+        try:
+            request = pickle.load(requests)
+        except EOFError:
+            break
+        try:
+            if request[0] == "launch":
+                response = ("ok", _spawn(*request[1:]))
+            else:
+                response = ("ok", [_returncode(pid, returncodes) for pid in request[1]])
+        except Exception as e:
+            response = ("error", e)
+        pickle.dump(response, responses)
+        responses.flush()
+
+
+class SpawnServer:
+    """Starts a helper process and sends it requests to launch and poll applications"""
+
+    def __init__(self) -> None:
+        request_read, self.request_fd = os.pipe()
+        self.response_fd, response_write = os.pipe()
+        self.process = subprocess.Popen(
+            [sys.executable, "-I", "-S", os.path.abspath(__file__), str(request_read), str(response_write)],
+            pass_fds=(request_read, response_write),
+            start_new_session=True,  # Not sent signals for the worker (e.g., Ctrl-C)
+        )
+        os.close(request_read)
+        os.close(response_write)
+        self.requests = os.fdopen(self.request_fd, "wb")
+        self.responses = os.fdopen(self.response_fd, "rb")
+        self.lock = threading.Lock()
+
+    def _request(self, request: tuple):
+        """Sends a request and returns the response (or raises the error)"""
+        with self.lock:
+            pickle.dump(request, self.requests)
+            self.requests.flush()
+            status, result = pickle.load(self.responses)
+        if status == "error":
+            raise result
+        return result
+
+    def launch(self, cmd, cwd=None, env=None, stdout=None, stderr=None, start_new_session=False, **kwargs):
+        """Launches an application, as ``subprocess.Popen`` (for the supported arguments)
+
+        ``stdout`` and ``stderr`` may be file names or open files (opened by name to append).
+        """
+        unsupported = [key for key, value in kwargs.items() if value]
+        if unsupported:
+            raise ValueError(f"Launching with {unsupported} is not supported by the spawn server")
+        if isinstance(cmd, str):
+            cmd = [cmd]
+        outputs = [os.path.abspath(getattr(f, "name", f)) if f is not None else None for f in (stdout, stderr)]
+        cwd = os.path.abspath(cwd or os.getcwd())
+        env = dict(os.environ if env is None else env)
+        pid = self._request(("launch", [str(part) for part in cmd], cwd, env, *outputs, start_new_session))
+        return SpawnedProcess(self, pid, cmd)
+
+    def poll(self, pids: list) -> list:
+        """Returns the exit code of each process (None if still running)"""
+        return self._request(("poll", list(pids)))
+
+    def close(self) -> None:
+        """Stops the helper process (launched applications keep running)"""
+        self.requests.close()
+        self.responses.close()
+        self.process.wait()
+
+
+class SpawnedProcess:
+    """An application launched by a ``SpawnServer``, with the parts of the
+    ``subprocess.Popen`` interface used by the executors"""
+
+    def __init__(self, server: SpawnServer, pid: int, args: list) -> None:
+        self.server = server
+        self.pid = pid
+        self.args = args
+        self.returncode = None
+
+    def poll(self):
+        """Returns the exit code if the process has exited, else None"""
+        if self.returncode is None:
+            self.returncode = self.server.poll([self.pid])[0]
+        return self.returncode
+
+    def wait(self, timeout=None):
+        """Waits for the process to exit, returning its exit code
+
+        Raises ``subprocess.TimeoutExpired`` after timeout seconds (if given).
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        delay = 0.0005
+        while self.poll() is None:
+            remaining = None if end is None else end - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise subprocess.TimeoutExpired(self.args, timeout)
+            if not self._wait_pidfd(remaining):
+                time.sleep(delay if remaining is None else min(delay, remaining))
+                delay = min(2 * delay, 0.05)
+        return self.returncode
+
+    def _wait_pidfd(self, timeout) -> bool:
+        """Waits on a pidfd until the process exits (Linux); False if not supported"""
+        try:
+            fd = os.pidfd_open(self.pid)
+        except (AttributeError, OSError):
+            return False
+        try:
+            select.select([fd], [], [], timeout)
+        finally:
+            os.close(fd)
+        return True
+
+    def send_signal(self, sig: int) -> None:
+        """Sends a signal to the process, if it has not exited"""
+        if self.poll() is None:
+            os.kill(self.pid, sig)
+
+    def terminate(self) -> None:
+        """Sends SIGTERM to the process"""
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self) -> None:
+        """Sends SIGKILL to the process"""
+        self.send_signal(signal.SIGKILL)
+
+
+if __name__ == "__main__":
+    serve(int(sys.argv[1]), int(sys.argv[2]))
@@ -7,7 +7,12 @@ import logging
 
 import numpy as np
 
-from libensemble.tools.fields_keys import libE_fields
+from libensemble.tools.fields_keys import (
+    libE_fields,
+    libE_spec_calc_dir_misc,
+    libE_spec_gen_dir_keys,
+    libE_spec_sim_dir_keys,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -88,3 +93,19 @@ def _check_any_workers_and_disable_rm_if_tcp(values: dict) -> dict:
     if comms_type == "tcp":
         values["disable_resource_manager"] = True  # Resource management not supported with TCP
     return values
+
+
+def _check_workers_per_process(values: dict) -> dict:
+    if values.get("workers_per_process", 1) > 1:
+        assert values.get("comms") == "local", "workers_per_process is only supported with local comms"
+        dir_keys = libE_spec_sim_dir_keys + libE_spec_gen_dir_keys + libE_spec_calc_dir_misc
+        in_use = [key for key in dir_keys if values.get(key)]
+        assert not in_use, f"Calculation directories ({in_use}) are not supported with workers_per_process"
+        assert not values.get("profile"), "profile is not supported with workers_per_process"
+    return values
+
+
+def _check_use_shared_H(values: dict) -> dict:
+    if values.get("use_shared_H"):
+        assert values.get("comms") in ["local", "local_threading"], "use_shared_H is only supported with local comms"
+    return values
@@ -0,0 +1,60 @@
+"""
+Attributes that can hold a separate value for each thread.
+
+Several workers may run as threads of one process (see ``libE_specs["workers_per_process"]``),
+while sharing the process-wide executor and resources objects. The attributes of these
+objects that belong to a worker (e.g., its ID and resource sets) are declared as
+``ThreadLocalAttribute``, and ``use_thread_local`` is called on the object before
+the worker threads start.
+"""
+
+import threading
+
+
+class ThreadLocalAttribute:
+    """An attribute that holds a separate value in each thread, once ``use_thread_local``
+    has been called on the object. Until then, it is held as a normal attribute."""
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        values = obj.__dict__.get("_thread_values")
+        if values is not None:
+            return getattr(values, self.name)
+        try:
+            return obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, obj, value) -> None:
+        values = obj.__dict__.get("_thread_values")
+        if values is not None:
+            setattr(values, self.name, value)
+        else:
+            obj.__dict__[self.name] = value
+
+
+class _ThreadValues(threading.local):
+    """The values of the thread-local attributes of an object (initialized in each thread)"""
+
+    def __init__(self, values: dict, factories: dict) -> None:
+        self.__dict__.update(values)
+        self.__dict__.update({name: factory() for name, factory in factories.items()})
+
+
+def use_thread_local(obj, **factories) -> None:
+    """Holds the ``ThreadLocalAttribute`` attributes of obj separately for each thread from now on
+
+    In each thread, an attribute starts with the value returned by its factory (if given as a
+    keyword argument), and otherwise with its current value.
+    """
+    if "_thread_values" in obj.__dict__:
+        return
+    names = {
+        name for cls in type(obj).__mro__ for name, attr in vars(cls).items() if isinstance(attr, ThreadLocalAttribute)
+    }
+    values = {name: obj.__dict__[name] for name in names if name in obj.__dict__ and name not in factories}
+    obj.__dict__["_thread_values"] = _ThreadValues(values, factories)
@@ -3,20 +3,23 @@ libEnsemble worker class
 ====================================================
 """
 
+import copy
 import cProfile
 import logging
 import logging.handlers
 import socket
 from itertools import count
 from pathlib import Path
+from threading import Thread
 from traceback import format_exc
 from traceback import format_exception_only as format_exc_msg
 
 import numpy as np
 import numpy.typing as npt
 
-from libensemble.comms.logs import LogConfig, worker_logging_config
-from libensemble.executors.executor import Executor
+import libensemble.utils.launcher as launcher
+from libensemble.comms.logs import LogConfig, flush_worker_logs, worker_logging_config, worker_team_logging_config
+from libensemble.executors.executor import Executor, TaskRegistry
 from libensemble.message_numbers import (
     CALC_EXCEPTION,
     EVAL_GEN_TAG,
@@ -30,10 +33,14 @@ from libensemble.message_numbers import (
     calc_type_strings,
 )
 from libensemble.resources.resources import Resources
+from libensemble.tools.calc_stats import CALC_STATS_DTYPE, TASK_STATS_DTYPE
+from libensemble.tools.fields_keys import protected_libE_fields
 from libensemble.utils.loc_stack import LocationStack
 from libensemble.utils.misc import extract_H_ranges
 from libensemble.utils.output_directory import EnsembleDirectory
 from libensemble.utils.runners import Runners
+from libensemble.utils.shared_array import SharedArray
+from libensemble.utils.thread_local import use_thread_local
 from libensemble.utils.timer import Timer
 
 logger = logging.getLogger(__name__)
@@ -100,15 +107,26 @@ def worker_main(
 
     # Initialize logging on comms
     if log_comm:
-        worker_logging_config(comm, workerID)
+        worker_logging_config(
+            comm,
+            workerID,
+            libE_specs.get("worker_log_batch_size", 64),
+            libE_specs.get("worker_log_batch_interval", 1.0),
+        )
 
     LS = LocationStack()
     LS.register_loc("workflow", Path(libE_specs.get("workflow_dir_path")))
 
+    if libE_specs.get("use_spawn_server"):
+        launcher.start_spawn_server()
+
     # Set up and run worker
     worker = Worker(comm, dtypes, workerID, sim_specs, gen_specs, libE_specs)
-    with LS.loc("workflow"):
-        worker.run()
+    try:
+        with LS.loc("workflow"):
+            worker.run()
+    finally:
+        launcher.stop_spawn_server()
 
     if libE_specs.get("profile"):
         pr.disable()
@@ -116,6 +134,90 @@ def worker_main(
         pr.dump_stats(profile_state_fname)
 
 
+def worker_team_main(
+    comms: list,
+    sim_specs: dict,
+    gen_specs: dict,
+    libE_specs: dict,
+    workerIDs: list,
+    log_comm: bool = True,
+    resources: Resources = None,
+    executor: Executor = None,
+) -> list:
+    """Evaluates calculations given by the manager to several workers in this process.
+
+    Each worker runs in its own thread, with its own comm, worker ID and resource
+    sets, and so runs calculations concurrently with the other workers (e.g., sims
+    that submit applications through the executor and wait on them). The executor
+    and resources are shared, but hold their worker-specific state for each thread.
+
+    Parameters
+    ----------
+    comms: list
+        Comm objects for manager communications (one per worker)
+
+    workerIDs: list
+        Manager assigned worker IDs (one per comm)
+
+    Other parameters are as for ``worker_main``. Returns a result (None) for each worker.
+    """
+
+    if resources is not None:
+        Resources.resources = resources
+    if executor is not None:
+        Executor.executor = executor
+    if isinstance(Resources.resources, Resources):
+        use_thread_local(Resources.resources)
+    if isinstance(Executor.executor, Executor):
+        retention = Executor.executor.list_of_tasks.retention
+        use_thread_local(Executor.executor, list_of_tasks=lambda: TaskRegistry(retention))
+
+    # Receive dtypes (and workflow dir) from manager, sent to each worker
+    for comm in comms:
+        _, dtypes = comm.recv()
+        if libE_specs.get("use_workflow_dir"):
+            _, libE_specs["workflow_dir_path"] = comm.recv()
+
+    thread_names = [f"libE_worker{workerID}" for workerID in workerIDs]
+    if log_comm:
+        worker_team_logging_config(
+            comms,
+            workerIDs,
+            thread_names,
+            libE_specs.get("worker_log_batch_size", 64),
+            libE_specs.get("worker_log_batch_interval", 1.0),
+        )
+
+    errors = [None] * len(comms)
+
+    def run_worker(i):
+        try:
+            Worker(comms[i], dtypes, workerIDs[i], sim_specs, gen_specs, libE_specs).run()
+        except Exception as e:
+            errors[i] = e
+
+    LS = LocationStack()
+    LS.register_loc("workflow", Path(libE_specs.get("workflow_dir_path")))
+
+    if libE_specs.get("use_spawn_server"):
+        launcher.start_spawn_server()
+
+    threads = [Thread(target=run_worker, args=(i,), name=name) for i, name in enumerate(thread_names)]
+    try:
+        with LS.loc("workflow"):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+    finally:
+        launcher.stop_spawn_server()
+
+    for e in errors:
+        if e is not None:
+            raise e
+    return [None] * len(comms)
+
+
 ######################################################################
 # Worker Class
 ######################################################################
@@ -128,7 +230,6 @@ class WorkerErrMsg:
 
 
 class Worker:
-
     """The worker class provides methods for controlling sim and gen funcs
 
     **Object Attributes:**
@@ -149,6 +250,9 @@ class Worker:
 
     :ivar dict calc_iter:
         Dictionary containing counts for each type of calc (e.g. sim or gen)
+
+    :ivar SharedArray shared_H:
+        The shared History block this worker is attached to, if any
     """
 
     def __init__(
@@ -166,13 +270,19 @@ class Worker:
         self.workerID = workerID
         self.libE_specs = libE_specs
         self.stats_fmt = libE_specs.get("stats_fmt", {})
+        self.stats_columnar = libE_specs.get("stats_columnar", False)
+        self.calc_stats = []
+        self.task_stats = []
+        self.calc_num = 0
 
         self.calc_iter = {EVAL_SIM_TAG: 0, EVAL_GEN_TAG: 0}
+        self.sim_vectorized = sim_specs.get("vectorized", False)
         self.runners = Runners(sim_specs, gen_specs)
         self._run_calc = self.runners.make_runners()
         Worker._set_executor(self.workerID, self.comm)
         Worker._set_resources(self.workerID, self.comm)
         self.EnsembleDirectory = EnsembleDirectory(libE_specs=libE_specs)
+        self.shared_H = None
 
     @staticmethod
     def _set_gen_procs_gpus(libE_info, obj):
@@ -219,7 +329,7 @@ class Worker:
             logger.debug(f"No resources set on worker {workerID}")
             return False
 
-    def _handle_calc(self, Work: dict, calc_in: npt.NDArray) -> (npt.NDArray, dict, int):
+    def _handle_calc(self, Work: dict, calc_in: npt.NDArray, split_stats: bool = False) -> (npt.NDArray, dict, int):
         """Runs a calculation on this worker object.
 
         This routine calls the user calculations. Exceptions are caught,
@@ -234,6 +344,9 @@ class Worker:
         calc_in: ``numpy structured array``
             Rows from the :ref:`history array<funcguides-history>`
             for processing
+
+        split_stats: bool
+            Write a stats line for each row (for a vectorized sim)
         """
         calc_type = Work["tag"]
         self.calc_iter[calc_type] += 1
@@ -300,18 +413,61 @@ class Worker:
             calc_status = CALC_EXCEPTION
             raise
         finally:
-            ctype_str = calc_type_strings[calc_type]
             status = calc_status_strings.get(calc_status, calc_status)
-            calc_msg = self._get_calc_msg(enum_desc, calc_id, ctype_str, timer, status)
+            if self.stats_columnar:
+                self._add_calc_stats(Work, calc_type, calc_id, timer, status)
+            elif split_stats:
+                self._log_split_calc_stats(Work, timer, status)
+            else:
+                ctype_str = calc_type_strings[calc_type]
+                calc_msg = self._get_calc_msg(enum_desc, calc_id, ctype_str, timer, status)
 
-            logging.getLogger(LogConfig.config.stats_name).info(calc_msg)
+                logging.getLogger(LogConfig.config.stats_name).info(calc_msg)
 
-    def _get_calc_msg(self, enum_desc: str, calc_id: int, calc_type: int, timer: Timer, status: str) -> str:
-        """Construct line for libE_stats.txt file"""
-        calc_msg = f"{enum_desc} {calc_id}: {calc_type} {timer}"
+    def _handle_batched_calc(self, Work: dict, calc_in: npt.NDArray) -> (npt.NDArray, dict, int):
+        """Runs each row of a batched sim work unit as its own calculation.
 
-        if self.stats_fmt.get("task_timing", False) or self.stats_fmt.get("task_datetime", False):
-            calc_msg += Executor.executor.new_tasks_timing(datetime=self.stats_fmt.get("task_datetime", False))
+        Each sim is counted, timed and written to the stats file separately.
+        Outputs are gathered into an array with a row for each point (left as
+        zeros for points whose sim returned no output), and the last status is
+        returned. On a finish signal from the manager, the remaining points are
+        not evaluated, and their rows are also left as zeros.
+
+        A vectorized sim is instead called once for all rows, and its time is
+        shared among the rows in the stats file.
+        """
+        H_rows = Work["libE_info"]["H_rows"]
+        if self.sim_vectorized:
+            out, persis_info, calc_status = self._handle_calc(Work, calc_in, split_stats=True)
+            if out is not None and calc_status != MAN_SIGNAL_FINISH and len(out) != len(H_rows):
+                raise ValueError(f"Vectorized sim_f returned {len(out)} rows for {len(H_rows)} points")
+            return out, persis_info, calc_status
+
+        persis_info = Work["persis_info"]
+        calc_out = None
+        for i in range(len(H_rows)):
+            sim_Work = dict(Work, persis_info=persis_info, libE_info=dict(Work["libE_info"], H_rows=H_rows[i : i + 1]))
+            out, persis_info, calc_status = self._handle_calc(sim_Work, calc_in[i : i + 1])
+            if out is not None:
+                if len(out) != 1:
+                    raise ValueError(f"sim_f returned {len(out)} rows for sim_id {H_rows[i]}")
+                if calc_out is None:
+                    calc_out = np.zeros(len(H_rows), dtype=out.dtype)
+                for name in out.dtype.names:
+                    calc_out[name][i] = out[name][0]
+            if calc_status == MAN_SIGNAL_FINISH:
+                if i + 1 < len(H_rows):
+                    logger.info(f"Finish signal received: sim_ids {H_rows[i + 1 :].tolist()} were not evaluated")
+                break
+
+        return calc_out, persis_info, calc_status
+
+    def _get_calc_msg(
+        self, enum_desc: str, calc_id: int, calc_type: int, timer: Timer, status: str, tasks_msg: str = None
+    ) -> str:
+        """Construct line for libE_stats.txt file (with tasks_msg, if given, for the task timings)"""
+        calc_msg = f"{enum_desc} {calc_id}: {calc_type} {timer}"
+        calc_msg += self._get_tasks_msg() if tasks_msg is None else tasks_msg
 
         if self.stats_fmt.get("show_resource_sets", False):
             # Maybe just call option resource_sets if already in sub-dictionary
@@ -323,12 +479,67 @@ class Worker:
 
         return calc_msg
 
+    def _get_tasks_msg(self) -> str:
+        """Returns the timings of tasks submitted since last called, if included in libE_stats.txt"""
+        if self.stats_fmt.get("task_timing", False) or self.stats_fmt.get("task_datetime", False):
+            return Executor.executor.new_tasks_timing(datetime=self.stats_fmt.get("task_datetime", False))
+        if isinstance(Executor.executor, Executor):
+            Executor.executor.list_of_tasks.take_unreported()  # Done with for stats (so may be released)
+        return ""
+
+    def _log_split_calc_stats(self, Work: dict, timer: Timer, status: str) -> None:
+        """Writes a line to libE_stats.txt for each row of a vectorized sim, sharing its time
+
+        The tasks of the sim are not known to belong to any one row, so each line lists all of them.
+        """
+        H_rows = Work["libE_info"]["H_rows"]
+        row_timer = copy.copy(timer)
+        row_timer.tcum = timer.tcum / max(len(H_rows), 1)
+        ctype_str = calc_type_strings[EVAL_SIM_TAG]
+        tasks_msg = self._get_tasks_msg()
+        for row in H_rows:
+            calc_msg = self._get_calc_msg("sim_id", str(row).rjust(5, " "), ctype_str, row_timer, status, tasks_msg)
+            logging.getLogger(LogConfig.config.stats_name).info(calc_msg)
+
+    def _add_calc_stats(self, Work: dict, calc_type: int, calc_id: str, timer: Timer, status: str) -> None:
+        """Records a calc (and the tasks it submitted), to be sent with the next result"""
+        self.calc_num += 1
+        record = np.zeros(1, dtype=CALC_STATS_DTYPE)
+        record["worker"] = self.workerID
+        record["calc_num"] = self.calc_num
+        record["calc_type"] = calc_type
+        if calc_type == EVAL_SIM_TAG:
+            sim_ids = Work["libE_info"]["H_rows"]
+            if len(sim_ids):
+                record["sim_id_min"], record["sim_id_max"] = np.min(sim_ids), np.max(sim_ids)
+            record["num_sims"] = len(sim_ids)
+        else:
+            record["gen_num"] = int(calc_id)
+        record["start"] = timer.tstart / 1000
+        record["end"] = timer.tend / 1000
+        record["status"] = str(status).encode()[: CALC_STATS_DTYPE["status"].itemsize]
+        self.calc_stats.append(record)
+
+        if isinstance(Executor.executor, Executor):
+            for start, end in Executor.executor.new_tasks_times():
+                self.task_stats.append((self.workerID, self.calc_num, start, end))
+
+    def _take_calc_stats(self) -> (npt.NDArray, npt.NDArray):
+        """Returns the calc and task records collected since last called"""
+        calc_stats = np.concatenate(self.calc_stats) if self.calc_stats else np.zeros(0, dtype=CALC_STATS_DTYPE)
+        task_stats = np.array(self.task_stats, dtype=TASK_STATS_DTYPE)
+        self.calc_stats, self.task_stats = [], []
+        return calc_stats, task_stats
+
     def _recv_H_rows(self, Work: dict) -> (dict, int, npt.NDArray):
         """Unpacks Work request and receives any history rows"""
         libE_info = Work["libE_info"]
         calc_type = Work["tag"]
         if len(libE_info["H_rows"]) > 0:
-            _, calc_in = self.comm.recv()
+            if "H_shm" in libE_info:
+                calc_in = self._read_shared_rows(Work)
+            else:
+                _, calc_in = self.comm.recv()
         else:
             calc_in = np.zeros(0, dtype=self.dtypes[calc_type])
 
@@ -337,6 +548,58 @@ class Worker:
 
         return libE_info, calc_type, calc_in
 
+    def _attach_shared_H(self, name: str, length: int) -> npt.NDArray:
+        """Returns the shared History block of the given name, attaching if not already"""
+        if self.shared_H is None or self.shared_H.name != name:
+            if self.shared_H is not None:
+                self.shared_H.close()
+            self.shared_H = SharedArray(length, self.dtypes["H"], name=name)
+        return self.shared_H.array
+
+    def _read_shared_rows(self, Work: dict) -> npt.NDArray:
+        """Gets calc_in from the shared History
+
+        Contiguous rows are given as a view. Otherwise, the rows are gathered
+        into a packed array. Either way, calc_in is read-only, so a sim_f
+        cannot write to the shared History (or only sometimes, depending on
+        how the rows are laid out).
+        """
+        H = self._attach_shared_H(*Work["libE_info"]["H_shm"])
+        rows = Work["libE_info"]["H_rows"]
+        fields = list(Work["H_fields"])
+        if np.all(np.diff(rows) == 1):
+            calc_in = H[fields][rows[0] : rows[-1] + 1]
+        else:
+            calc_in = np.empty(len(rows), dtype=[(name, H.dtype.fields[name][0]) for name in fields])
+            for name in fields:
+                calc_in[name] = H[name][rows]
+        calc_in.flags.writeable = False
+        return calc_in
+
+    def _write_shared_rows(self, calc_out: npt.NDArray, libE_info: dict) -> npt.NDArray:
+        """Writes sim output into the shared History, returning None if done
+
+        Output that does not exactly match its History fields (e.g. partially
+        filled sub-arrays) is returned unchanged, to be sent to the manager.
+        """
+        rows = libE_info["H_rows"]
+        if not isinstance(calc_out, np.ndarray) or calc_out.dtype.names is None or len(calc_out) != len(rows):
+            return calc_out
+
+        H = self.shared_H.array
+        for name in calc_out.dtype.names:
+            if (
+                name in protected_libE_fields
+                or name not in H.dtype.names
+                or calc_out.dtype.fields[name][0] != H.dtype.fields[name][0]
+            ):
+                return calc_out
+
+        for name in calc_out.dtype.names:
+            H[name][rows] = calc_out[name]
+        libE_info["H_shm_fields"] = list(calc_out.dtype.names)
+        return None
+
     def _handle(self, Work: dict) -> dict:
         """Handles a work request from the manager"""
         # Check work request and receive second message (if needed)
@@ -349,7 +612,10 @@ class Worker:
         libE_info["executor"] = Executor.executor
         Worker._set_rset_team(libE_info)
 
-        calc_out, persis_info, calc_status = self._handle_calc(Work, calc_in)
+        if libE_info.get("batched") and calc_type == EVAL_SIM_TAG:
+            calc_out, persis_info, calc_status = self._handle_batched_calc(Work, calc_in)
+        else:
+            calc_out, persis_info, calc_status = self._handle_calc(Work, calc_in)
 
         if "libE_info" in Work:
             libE_info = Work["libE_info"]
@@ -360,19 +626,25 @@ class Worker:
         if "executor" in libE_info:
             del libE_info["executor"]
 
+        if "H_shm" in libE_info:
+            calc_out = self._write_shared_rows(calc_out, libE_info)
+
         # If there was a finish signal, bail
         if calc_status == MAN_SIGNAL_FINISH:
             return None
 
         # Otherwise, send a calc result back to manager
         logger.debug(f"Sending to Manager with status {calc_status}")
-        return {
+        D = {
             "calc_out": calc_out,
             "persis_info": persis_info,
             "libE_info": libE_info,
             "calc_status": calc_status,
             "calc_type": calc_type,
         }
+        if self.stats_columnar:
+            D["calc_stats"], D["task_stats"] = self._take_calc_stats()
+        return D
 
     def run(self) -> None:
         """Runs the main worker loop."""
@@ -406,12 +678,16 @@ class Worker:
                 response = self._handle(Work)
                 if response is None:
                     break
+                flush_worker_logs()
                 self.comm.send(0, response)
 
         except Exception as e:
+            flush_worker_logs()
             self.comm.send(0, WorkerErrMsg(" ".join(format_exc_msg(type(e), e)).strip(), format_exc()))
         else:
             self.comm.kill_pending()
         finally:
+            if self.shared_H is not None:
+                self.shared_H.close()
             self.runners.shutdown()
             self.EnsembleDirectory.copy_back()
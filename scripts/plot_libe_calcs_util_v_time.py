@@ -5,23 +5,30 @@
 Script to produce utilization plot based on how many workers are running user
 functions (sim or gens) at any given time. The plot is written to a file.
 
-This plot is produced from the libE_stats.txt file which uses timings created
-by the workers and so does not include manager/workers communications overhead.
+This plot is produced from the libE_stats directory (libE_specs["stats_columnar"])
+if present, or else the libE_stats.txt file. Both use timings created by the
+workers and so do not include manager/workers communications overhead.
 
 The range of time is determined by the earliest user function start and latest
 finish and so does not include any overhead before or after these times.
 
 """
 
+import datetime
+import os
+
 import matplotlib
 import pandas as pd
 
+from libensemble.tools.calc_stats import load_calc_stats
+
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
 # Basic options ---------------------------------------------------------------
 
 infile = "libE_stats.txt"
+stats_dir = "libE_stats"  # Read instead of infile if present
 
 sampling_freq = "1S"  # 1 second (default)
 # sampling_freq = '10L'  # 10 microseconds - for very short simulations
@@ -31,25 +38,32 @@ sampling_freq = "1S"  # 1 second (default)
 
 # Produce start and end times for each calculation (user function).
 run_stats = []
-with open(infile) as f:
-    # content = f.readlines()
-    for line in f:
-        lst = line.split()
-        foundstart = False
-        foundend = False
-        for i, val in enumerate(lst):
-            if val == "Start:":
-                startdate = lst[i + 1]
-                starttime = lst[i + 2]
-                foundstart = True
-            if val == "End:":
-                enddate = lst[i + 1]
-                endtime = lst[i + 2]
-                foundend = True
-            if foundstart and foundend:
-                run_datetime = {"start": startdate + " " + starttime, "end": enddate + " " + endtime}
-                run_stats.append(run_datetime)
-                break
+if os.path.isdir(stats_dir):
+    calcs, _ = load_calc_stats(stats_dir)
+    for start, end in zip(calcs["start"], calcs["end"]):
+        run_stats.append(
+            {"start": datetime.datetime.fromtimestamp(start), "end": datetime.datetime.fromtimestamp(end)}
+        )
+else:
+    with open(infile) as f:
+        # content = f.readlines()
+        for line in f:
+            lst = line.split()
+            foundstart = False
+            foundend = False
+            for i, val in enumerate(lst):
+                if val == "Start:":
+                    startdate = lst[i + 1]
+                    starttime = lst[i + 2]
+                    foundstart = True
+                if val == "End:":
+                    enddate = lst[i + 1]
+                    endtime = lst[i + 2]
+                    foundend = True
+                if foundstart and foundend:
+                    run_datetime = {"start": startdate + " " + starttime, "end": enddate + " " + endtime}
+                    run_stats.append(run_datetime)
+                    break
 
 df = pd.DataFrame(run_stats)
 
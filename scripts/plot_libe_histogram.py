@@ -6,24 +6,30 @@ Script to produce a histogram plot giving a count of user function (sim or
 gen) calls by run-time intervals. Color shows completed versus killed versus
 failed/exception.
 
-This plot is produced from the libE_stats.txt file. Status is taken from the
+This plot is produced from the libE_stats directory (libE_specs["stats_columnar"])
+if present, or else the libE_stats.txt file. Status is taken from the
 calc_status returned by user functions.
 
 The plot is written to a file.
 
 """
 
+import os
 import sys
 
 import matplotlib
 import numpy as np
 
+from libensemble.message_numbers import EVAL_SIM_TAG
+from libensemble.tools.calc_stats import load_calc_stats
+
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
 # Basic options ---------------------------------------------------------------
 
 infile = "libE_stats.txt"
+stats_dir = "libE_stats"  # Read instead of infile if present
 time_key = "Time:"
 status_key = "Status:"
 sim_only = True  # Ignore generator times
@@ -61,33 +67,55 @@ in_times_kill = []
 in_times_exception = []
 
 
-# Read straight from libEnsemble summary file.
-with open(infile) as f:
-    for line in f:
-        lst = line.split()
-        found_time = False
-        found_status = False
-        for i, val in enumerate(lst):
-            if val == time_key:
-                if sim_only and lst[i - 1] != "sim":
+def add_calc(time, status_words):
+    in_times.append(time)
+    if status_words[0] in ran_ok:
+        in_times_ran.append(time)
+    elif search_for_keyword(status_words, run_killed):
+        in_times_kill.append(time)
+    elif search_for_keyword(status_words, run_exception):
+        in_times_exception.append(time)
+    else:
+        print(f"Error: Unknown status - {' '.join(status_words)}")
+        sys.exit()
+
+
+if os.path.isdir(stats_dir):
+    # Read the records of each calc
+    calcs, _ = load_calc_stats(stats_dir)
+    if sim_only:
+        calcs = calcs[calcs["calc_type"] == EVAL_SIM_TAG]
+    for calc in calcs:
+        add_calc(calc["end"] - calc["start"], calc["status"].decode().split())
+        active_line_count += 1
+else:
+    # Read straight from libEnsemble summary file.
+    with open(infile) as f:
+        for line in f:
+            lst = line.split()
+            found_time = False
+            found_status = False
+            for i, val in enumerate(lst):
+                if val == time_key:
+                    if sim_only and lst[i - 1] != "sim":
+                        break
+                    in_times.append(lst[i + 1])
+                    found_time = True
+                if val == status_key:
+                    if lst[i + 1] in ran_ok:
+                        append_to_list(in_times_ran, in_times, found_time)  # Assumes Time comes first
+                    elif search_for_keyword(lst[i + 1 : len(lst)], run_killed):
+                        append_to_list(in_times_kill, in_times, found_time)  # Assumes Time comes first
+                    elif search_for_keyword(lst[i + 1 : len(lst)], run_exception):
+                        exceptions = True
+                        append_to_list(in_times_exception, in_times, found_time)  # Assumes Time comes first
+                    else:
+                        print(f"Error: Unknown status - rest of line: {lst[i + 1:len(lst)]}")
+                        sys.exit()
+                    found_status = True
+                if found_time and found_status:
+                    active_line_count += 1
                     break
-                in_times.append(lst[i + 1])
-                found_time = True
-            if val == status_key:
-                if lst[i + 1] in ran_ok:
-                    append_to_list(in_times_ran, in_times, found_time)  # Assumes Time comes first
-                elif search_for_keyword(lst[i + 1 : len(lst)], run_killed):
-                    append_to_list(in_times_kill, in_times, found_time)  # Assumes Time comes first
-                elif search_for_keyword(lst[i + 1 : len(lst)], run_exception):
-                    exceptions = True
-                    append_to_list(in_times_exception, in_times, found_time)  # Assumes Time comes first
-                else:
-                    print(f"Error: Unknown status - rest of line: {lst[i + 1:len(lst)]}")
-                    sys.exit()
-                found_status = True
-            if found_time and found_status:
-                active_line_count += 1
-                break
 
 print(f"Processed {active_line_count} calcs")
 
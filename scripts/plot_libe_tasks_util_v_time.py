@@ -6,7 +6,8 @@ Script to produce utilisation plot based on how many workers are running user
 tasks (submitted via a libEnsemble executor) at any given time. This does not
 account for resource used by each task. The plot is written to a file.
 
-This plot is produced from the libE_stats.txt file when the option
+This plot is produced from the libE_stats directory (libE_specs["stats_columnar"])
+if present, or else from the libE_stats.txt file when the option
 libE_stats['stats_fmt'] = {"task_datetime": True} is used.
 
 The range of time is determined by the earliest task start and latest task
@@ -14,15 +15,22 @@ finish and so does not include any overhead before or after these times.
 
 """
 
+import datetime
+import os
+
 import matplotlib
+import numpy as np
 import pandas as pd
 
+from libensemble.tools.calc_stats import load_calc_stats
+
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
 # Basic options ---------------------------------------------------------------
 
 infile = "libE_stats.txt"
+stats_dir = "libE_stats"  # Read instead of infile if present
 
 sampling_freq = "1S"  # 1 second (default)
 # sampling_freq = '10L'  # 10 microseconds - for very short simulations
@@ -36,39 +44,52 @@ eindex = 0
 run_stats = []
 first_starts = []
 last_ends = []
-with open(infile) as f:
-    for line in f:
-        tstarts = []
-        tends = []
-        lst = line.split()
-        sindex = 0
-        eindex = 0
-        done_index = 0
-        for i, val in enumerate(lst):
-            if val == "Tstart:":
-                startdate = lst[i + 1]
-                starttime = lst[i + 2]
-                sindex += 1
-            if val == "Tend:":
-                enddate = lst[i + 1]
-                endtime = lst[i + 2]
-                eindex += 1
-            if sindex > done_index and sindex == eindex:
-                # Convert to pandas datetime so can compare
-                start = pd.to_datetime(startdate + " " + starttime)
-                end = pd.to_datetime(enddate + " " + endtime)
-                tstarts.append(start)
-                tends.append(end)
-                done_index += 1
-
+if os.path.isdir(stats_dir):
+    calcs, tasks = load_calc_stats(stats_dir)
+    tasks = tasks[np.argsort(tasks["start"], kind="stable")]
+    for calc in calcs:
+        calc_tasks = tasks[(tasks["worker"] == calc["worker"]) & (tasks["calc_num"] == calc["calc_num"])]
+        tstarts = [pd.to_datetime(datetime.datetime.fromtimestamp(t)) for t in calc_tasks["start"]]
+        tends = [pd.to_datetime(datetime.datetime.fromtimestamp(t)) for t in calc_tasks["end"]]
         if tstarts:
             first_starts.append(tstarts[0])
-
         if tends:
             last_ends.append(tends[-1])
-
-        run_datetime = {"starts": tstarts, "ends": tends}
-        run_stats.append(run_datetime)
+        run_stats.append({"starts": tstarts, "ends": tends})
+else:
+    with open(infile) as f:
+        for line in f:
+            tstarts = []
+            tends = []
+            lst = line.split()
+            sindex = 0
+            eindex = 0
+            done_index = 0
+            for i, val in enumerate(lst):
+                if val == "Tstart:":
+                    startdate = lst[i + 1]
+                    starttime = lst[i + 2]
+                    sindex += 1
+                if val == "Tend:":
+                    enddate = lst[i + 1]
+                    endtime = lst[i + 2]
+                    eindex += 1
+                if sindex > done_index and sindex == eindex:
+                    # Convert to pandas datetime so can compare
+                    start = pd.to_datetime(startdate + " " + starttime)
+                    end = pd.to_datetime(enddate + " " + endtime)
+                    tstarts.append(start)
+                    tends.append(end)
+                    done_index += 1
+
+            if tstarts:
+                first_starts.append(tstarts[0])
+
+            if tends:
+                last_ends.append(tends[-1])
+
+            run_datetime = {"starts": tstarts, "ends": tends}
+            run_stats.append(run_datetime)
 
 
 # Find earliest task start and latest task end times to determine range.